@@ -0,0 +1,16 @@
+"""
+매출 집계 테이블 재생성 스크립트 (과거 주문 내역 기준)
+Usage: python backfill_sales_rollups.py [store_id]
+"""
+import asyncio
+import sys
+from src.core.database import AsyncSessionLocal
+from src.services.sales_rollup_service import SalesRollupService
+
+async def backfill(store_id: str = None):
+    async with AsyncSessionLocal() as session:
+        await SalesRollupService.rebuild(session, store_id)
+    print(f"✅ 매출 집계 재생성 완료: {store_id or '전체 매장'}")
+
+if __name__ == "__main__":
+    asyncio.run(backfill(sys.argv[1] if len(sys.argv) > 1 else None))
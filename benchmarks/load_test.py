@@ -0,0 +1,312 @@
+"""
+Customer ordering load test
+Usage: python -m benchmarks.load_test [--stores 5] [--tables 10] [--duration 30] [--ramp 5]
+                                      [--base-url URL] [--save-baseline NAME] [--compare NAME]
+
+Seeds N stores x M tables in DATABASE_URL and, unless --base-url points at a running server,
+starts the app in-process on one uvicorn worker. Every table logs in, browses the menu, places
+orders and polls its order list; every store has an admin listening on SSE, polling live orders
+and moving new orders to "preparing". Reports throughput, latency percentiles per endpoint and
+SSE delivery lag (order POST sent -> OrderCreated frame received).
+
+Baselines are saved to benchmarks/baselines/<name>.json; --compare prints the change against one
+and exits with status 1 when a p90 latency or the throughput regresses by more than 20%.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import time
+import uuid
+from collections import defaultdict
+import httpx
+import uvicorn
+from sqlalchemy import delete, select
+from src.core.database import engine, Base, AsyncSessionLocal
+from src.core.security import hash_password
+from src.models import Store, Table, TableSession, MenuCategory, Menu, Order, Admin, OutboxEvent, DailySales, DailyMenuSales
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+MENUS_PER_STORE = 30
+PASSWORD = "load-test"
+REGRESSION_THRESHOLD = 0.2
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.sse_lag = []
+        self._order_sent = {}
+        self._order_seen = {}
+    
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+    
+    def order_sent(self, order_id: int, sent_at: float):
+        seen_at = self._order_seen.pop(order_id, None)
+        if seen_at is None:
+            self._order_sent[order_id] = sent_at
+        else:
+            self.sse_lag.append(seen_at - sent_at)
+    
+    def order_seen(self, order_id: int):
+        now = time.perf_counter()
+        sent_at = self._order_sent.pop(order_id, None)
+        if sent_at is None:
+            # The frame can beat the POST response back to the client.
+            self._order_seen[order_id] = now
+        else:
+            self.sse_lag.append(now - sent_at)
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for name, values in sorted(recorder.latencies.items()):
+        endpoints[name] = {
+            "count": len(values),
+            "errors": recorder.errors[name],
+            "p50_ms": percentile(values, 0.5) * 1000,
+            "p90_ms": percentile(values, 0.9) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+            "max_ms": max(values) * 1000,
+        }
+    total = sum(len(values) for values in recorder.latencies.values())
+    return {
+        "requests": total,
+        "throughput_rps": total / elapsed,
+        "endpoints": endpoints,
+        "sse_lag": {
+            "count": len(recorder.sse_lag),
+            "p50_ms": percentile(recorder.sse_lag, 0.5) * 1000,
+            "p90_ms": percentile(recorder.sse_lag, 0.9) * 1000,
+            "p99_ms": percentile(recorder.sse_lag, 0.99) * 1000,
+        },
+    }
+
+async def seed(run_id: str, stores: int, tables: int):
+    password_hash = hash_password(PASSWORD)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    seeded = []
+    async with AsyncSessionLocal() as db:
+        for index in range(stores):
+            store = Store(name=f"load {run_id} {index}")
+            db.add(store)
+            await db.flush()
+            category = MenuCategory(store_id=store.id, name="load")
+            admin = Admin(username=f"load-{run_id}-{index}", password_hash=password_hash, role="store_admin",
+                          store_id=store.id)
+            store_tables = [Table(store_id=store.id, table_number=str(number), password_hash=password_hash)
+                            for number in range(1, tables + 1)]
+            db.add_all([category, admin] + store_tables)
+            await db.flush()
+            menus = [Menu(category_id=category.id, name=f"menu {i}", price=1000 + i * 100) for i in range(MENUS_PER_STORE)]
+            db.add_all(menus + [TableSession(table_id=table.id, is_active=True) for table in store_tables])
+            await db.flush()
+            seeded.append({
+                "store_id": store.id,
+                "admin": admin.username,
+                "tables": [table.table_number for table in store_tables],
+                "menu_ids": [menu.id for menu in menus],
+            })
+        await db.commit()
+    return seeded
+
+async def cleanup(run_id: str, seeded: list):
+    store_ids = [store["store_id"] for store in seeded]
+    async with engine.begin() as conn:
+        sessions = select(TableSession.id).join(Table).where(Table.store_id.in_(store_ids))
+        await conn.execute(delete(Order).where(Order.table_session_id.in_(sessions)))
+        await conn.execute(delete(OutboxEvent).where(OutboxEvent.payload["store_id"].as_string().in_(store_ids)))
+        await conn.execute(delete(DailySales).where(DailySales.store_id.in_(store_ids)))
+        await conn.execute(delete(DailyMenuSales).where(DailyMenuSales.store_id.in_(store_ids)))
+        await conn.execute(delete(Admin).where(Admin.username.like(f"load-{run_id}-%")))
+        await conn.execute(delete(Store).where(Store.id.in_(store_ids)))
+
+async def customer(client, recorder: Recorder, store: dict, table_number: str, deadline: float, think: float,
+                   ramp: float):
+    # Tablets don't all log in at the same instant; bcrypt would dominate the first seconds.
+    await asyncio.sleep(random.uniform(0, ramp))
+    response = await recorder.call(client, "POST /api/customer/auth/login", "POST", "/api/customer/auth/login", json={
+        "table_number": table_number, "password": PASSWORD, "store_id": store["store_id"]
+    })
+    if response is None or response.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['token']}"}
+    etag = None
+    while time.perf_counter() < deadline:
+        menu_headers = {**headers, "If-None-Match": etag} if etag else headers
+        response = await recorder.call(client, "GET /api/customer/menus", "GET", "/api/customer/menus",
+                                       params={"store_id": store["store_id"]}, headers=menu_headers)
+        if response is not None and response.status_code == 200:
+            etag = response.headers.get("etag")
+        await asyncio.sleep(random.uniform(0, think))
+        
+        items = [{"menu_id": menu_id, "quantity": random.randint(1, 3)}
+                 for menu_id in random.sample(store["menu_ids"], random.randint(1, 4))]
+        sent_at = time.perf_counter()
+        response = await recorder.call(client, "POST /api/customer/orders", "POST", "/api/customer/orders",
+                                       json={"items": items}, headers=headers)
+        if response is not None and response.status_code == 200:
+            recorder.order_sent(response.json()["id"], sent_at)
+        
+        for _ in range(3):
+            await asyncio.sleep(random.uniform(0, think))
+            await recorder.call(client, "GET /api/customer/orders", "GET", "/api/customer/orders", headers=headers)
+
+async def admin(client, recorder: Recorder, store: dict, deadline: float, think: float, ready: asyncio.Event):
+    response = await recorder.call(client, "POST /api/admin/auth/login", "POST", "/api/admin/auth/login", json={
+        "username": store["admin"], "password": PASSWORD, "store_id": store["store_id"]
+    })
+    if response is None or response.status_code != 200:
+        ready.set()
+        return
+    headers = {"Authorization": f"Bearer {response.json()['token']}"}
+    kitchen = []
+    
+    async def listen():
+        async with client.stream("GET", "/api/admin/sse", headers=headers, timeout=None) as stream:
+            ready.set()
+            async for line in stream.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                event = json.loads(line[len("data: "):])
+                if event.get("event_type") == "OrderCreated":
+                    recorder.order_seen(event["order_id"])
+                    kitchen.append(asyncio.create_task(recorder.call(
+                        client, "PATCH /api/admin/orders/{order_id}/status", "PATCH",
+                        f"/api/admin/orders/{event['order_id']}/status", json={"status": "preparing"}, headers=headers
+                    )))
+    
+    async def poll():
+        cursor = None
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(think * 4)
+            response = await recorder.call(client, "GET /api/admin/orders/live", "GET", "/api/admin/orders/live",
+                                           params={"since": cursor} if cursor else None, headers=headers)
+            if response is not None and response.status_code == 200:
+                cursor = response.json()["cursor"]
+    
+    listener = asyncio.create_task(listen())
+    try:
+        await poll()
+        # Let the last orders' events arrive before the stream is closed.
+        await asyncio.sleep(1)
+    finally:
+        listener.cancel()
+        await asyncio.gather(listener, *kitchen, return_exceptions=True)
+        ready.set()
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def report(summary: dict, baseline: dict = None) -> bool:
+    def change(current: float, previous: float) -> str:
+        return f"{(current - previous) / previous * 100:+.0f}%" if previous else ""
+    
+    regressed = False
+    previous = (baseline or {}).get("endpoints", {})
+    print(f"{'endpoint':<44} {'count':>6} {'err':>4} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, stats in summary["endpoints"].items():
+        line = (f"{name:<44} {stats['count']:>6} {stats['errors']:>4} {stats['p50_ms']:>8.1f} "
+                f"{stats['p90_ms']:>8.1f} {stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f}")
+        if name in previous:
+            line += f"  p90 {change(stats['p90_ms'], previous[name]['p90_ms'])}"
+            regressed |= stats["p90_ms"] > previous[name]["p90_ms"] * (1 + REGRESSION_THRESHOLD)
+        print(line)
+    lag = summary["sse_lag"]
+    print(f"\nSSE delivery lag: {lag['count']} events, p50 {lag['p50_ms']:.1f} ms, "
+          f"p90 {lag['p90_ms']:.1f} ms, p99 {lag['p99_ms']:.1f} ms")
+    line = f"Throughput: {summary['requests']} requests, {summary['throughput_rps']:.1f} req/s"
+    if baseline:
+        line += f" ({change(summary['throughput_rps'], baseline['throughput_rps'])} vs baseline)"
+        regressed |= summary["throughput_rps"] < baseline["throughput_rps"] * (1 - REGRESSION_THRESHOLD)
+    print(line)
+    return regressed
+
+async def main(args) -> int:
+    baseline = None
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json")) as file:
+            baseline = json.load(file)
+    
+    run_id = uuid.uuid4().hex[:8]
+    seeded = await seed(run_id, args.stores, args.tables)
+    server = server_task = None
+    base_url = args.base_url
+    if base_url is None:
+        from src.main import app
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning",
+                                               timeout_graceful_shutdown=5))
+        server_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+        base_url = f"http://127.0.0.1:{port}"
+    
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.stores * (args.tables + 2), max_keepalive_connections=None)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            started = time.perf_counter()
+            deadline = started + args.duration
+            admins_ready = [asyncio.Event() for _ in seeded]
+            admins = [asyncio.create_task(admin(client, recorder, store, deadline, args.think, ready))
+                      for store, ready in zip(seeded, admins_ready)]
+            await asyncio.gather(*[ready.wait() for ready in admins_ready])
+            await asyncio.gather(*[
+                customer(client, recorder, store, table_number, deadline, args.think, args.ramp)
+                for store in seeded for table_number in store["tables"]
+            ])
+            await asyncio.gather(*admins)
+            elapsed = time.perf_counter() - started
+    finally:
+        if server is not None:
+            server.should_exit = True
+            await server_task
+        await cleanup(run_id, seeded)
+        await engine.dispose()
+    
+    summary = summarize(recorder, elapsed)
+    summary["config"] = {"stores": args.stores, "tables": args.tables, "duration": args.duration,
+                         "think": args.think, "ramp": args.ramp}
+    print(f"{args.stores} stores x {args.tables} tables for {args.duration}s (think time up to {args.think}s)\n")
+    regressed = report(summary, baseline)
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(os.path.join(BASELINE_DIR, f"{args.save_baseline}.json"), "w") as file:
+            json.dump(summary, file, indent=2)
+    if regressed:
+        print(f"\nRegression: p90 latency or throughput is more than {REGRESSION_THRESHOLD:.0%} worse than the baseline")
+    return 1 if regressed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Customer ordering load test")
+    parser.add_argument("--stores", type=int, default=5)
+    parser.add_argument("--tables", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--think", type=float, default=0.5, help="maximum pause between a table's requests, seconds")
+    parser.add_argument("--ramp", type=float, default=5, help="spread table logins over this many seconds")
+    parser.add_argument("--base-url", help="target a running server instead of starting one in-process")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,63 @@
+"""
+Order placement round-trip benchmark
+Usage: python -m benchmarks.order_round_trips
+
+Seeds a throwaway store in DATABASE_URL, places orders of increasing size through
+CreateOrderService and reports SQL round trips and latency per order.
+"""
+import asyncio
+import time
+from sqlalchemy import delete, event
+from src.core.database import engine, Base, AsyncSessionLocal
+from src.models import Store, Table, TableSession, MenuCategory, Menu, Order, OutboxEvent
+from src.services.create_order_service import CreateOrderService
+
+ITEM_COUNTS = [1, 3, 12, 30]
+REPEAT = 20
+
+async def seed():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as db:
+        store = Store(name="benchmark")
+        db.add(store)
+        await db.flush()
+        category = MenuCategory(store_id=store.id, name="benchmark")
+        table = Table(store_id=store.id, table_number="bench", password_hash="-")
+        db.add_all([category, table])
+        await db.flush()
+        menus = [Menu(category_id=category.id, name=f"menu {i}", price=1000 + i) for i in range(max(ITEM_COUNTS))]
+        session = TableSession(table_id=table.id, is_active=True)
+        db.add_all(menus + [session])
+        await db.commit()
+        return store.id, session.id, [menu.id for menu in menus]
+
+async def main():
+    store_id, session_id, menu_ids = await seed()
+    statements = []
+    
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        print(f"{'items':>6} {'round trips':>12} {'avg ms':>8}")
+        for item_count in ITEM_COUNTS:
+            items = [{"menu_id": menu_id, "quantity": 2} for menu_id in menu_ids[:item_count]]
+            statements.clear()
+            started = time.perf_counter()
+            for _ in range(REPEAT):
+                async with AsyncSessionLocal() as db:
+                    await CreateOrderService.create_order(session_id, items, db)
+            elapsed = (time.perf_counter() - started) / REPEAT
+            print(f"{item_count:>6} {len(statements) / REPEAT:>12.1f} {elapsed * 1000:>8.2f}")
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+        async with engine.begin() as conn:
+            await conn.execute(delete(Order).where(Order.table_session_id == session_id))
+            await conn.execute(delete(OutboxEvent).where(OutboxEvent.payload["store_id"].as_string() == store_id))
+            await conn.execute(delete(Store).where(Store.id == store_id))
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
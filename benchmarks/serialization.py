@@ -0,0 +1,76 @@
+"""
+Response serialization benchmark
+Usage: python -m benchmarks.serialization
+
+Renders a 200-item menu list and a 50-order table (3 items each) the way FastAPI did
+before typed responses (jsonable_encoder over ORM objects + JSONResponse) and after
+(response model validation + ORJSONResponse), and reports time per response.
+No database is needed; the ORM objects are built in memory.
+"""
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.orm.attributes import set_committed_value
+from src.models import Menu, Order, OrderItem, OrderStatus
+from src.schemas import MenuResponse, OrderResponse
+
+MENU_COUNT = 200
+ORDER_COUNT = 50
+ITEMS_PER_ORDER = 3
+REPEAT = 200
+
+def build_menus():
+    now = datetime.utcnow()
+    return [
+        Menu(id=i, category_id=i % 10, name=f"menu {i}", description="house special " * 4, price=Decimal("12000.00"),
+             image_path=f"/uploads/menus/{i:064x}.jpg", is_available=True, display_order=i, created_at=now, updated_at=now)
+        for i in range(MENU_COUNT)
+    ]
+
+def build_orders():
+    now = datetime.utcnow()
+    orders = []
+    for i in range(ORDER_COUNT):
+        order = Order(id=i, table_session_id=1, status=OrderStatus.PREPARING, total_price=Decimal("36000.00"),
+                      created_at=now, updated_at=now)
+        # Loaded the way selectinload does it, without populating the item -> order backref.
+        set_committed_value(order, "order_items", [
+            OrderItem(id=i * ITEMS_PER_ORDER + j, order_id=i, menu_id=j, menu_name=f"menu {j}", quantity=3,
+                      unit_price=Decimal("4000.00"), subtotal=Decimal("12000.00"), created_at=now)
+            for j in range(ITEMS_PER_ORDER)
+        ])
+        orders.append(order)
+    return orders
+
+def before(objects):
+    return JSONResponse(jsonable_encoder(objects)).body
+
+def after(adapter: TypeAdapter):
+    def render(objects):
+        return ORJSONResponse(adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")).body
+    return render
+
+def measure(render, objects) -> float:
+    render(objects)
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        render(objects)
+    return (time.perf_counter() - started) / REPEAT
+
+def main():
+    cases = [
+        (f"{MENU_COUNT}-item menu", build_menus(), TypeAdapter(List[MenuResponse])),
+        (f"{ORDER_COUNT}-order table", build_orders(), TypeAdapter(List[OrderResponse])),
+    ]
+    print(f"{'payload':>16} {'before ms':>10} {'after ms':>9} {'speedup':>8}")
+    for name, objects, adapter in cases:
+        old = measure(before, objects)
+        new = measure(after(adapter), objects)
+        print(f"{name:>16} {old * 1000:>10.3f} {new * 1000:>9.3f} {old / new:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+SSE broadcast microbenchmark
+Usage: python -m benchmarks.sse_broadcast
+
+Connects LISTENERS_PER_STORE clients to an increasing number of stores and measures one
+store's broadcast. Cost should track that store's listeners, not the node's total.
+"""
+import asyncio
+import time
+from src.infrastructure.sse_publisher import SSEPublisher
+
+STORE_COUNTS = [1, 100, 1000]
+LISTENERS_PER_STORE = 5
+BROADCASTS = 2000
+
+async def run(store_count: int) -> float:
+    publisher = SSEPublisher(max_clients=store_count * LISTENERS_PER_STORE)
+    streams = [publisher.stream(f"store-{s}") for s in range(store_count) for _ in range(LISTENERS_PER_STORE)]
+    readers = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+    await asyncio.sleep(0)
+    
+    event = {"event_type": "OrderStatusChanged", "order_id": 1, "store_id": "store-0",
+             "old_status": "pending", "new_status": "preparing"}
+    started = time.perf_counter()
+    for event_id in range(1, BROADCASTS + 1):
+        await publisher.broadcast({**event, "event_id": event_id})
+    elapsed = (time.perf_counter() - started) / BROADCASTS
+    
+    for reader in readers:
+        reader.cancel()
+    await asyncio.gather(*readers, return_exceptions=True)
+    for stream in streams:
+        await stream.aclose()
+    return elapsed
+
+async def main():
+    print(f"{'stores':>7} {'clients':>8} {'us/broadcast':>13}")
+    for store_count in STORE_COUNTS:
+        elapsed = await run(store_count)
+        print(f"{store_count:>7} {store_count * LISTENERS_PER_STORE:>8} {elapsed * 1e6:>13.2f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+Menu image serving throughput per worker
+Usage: python -m benchmarks.upload_throughput
+
+Serves one content-hashed menu photo in-process and reports requests and megabytes per second for
+plain StaticFiles, UploadFiles streaming the body, a tablet revalidating with If-None-Match, and
+X-Accel-Redirect handing the body to the proxy.
+"""
+import asyncio
+import io
+import os
+import tempfile
+import time
+from fastapi import FastAPI, UploadFile
+from fastapi.staticfiles import StaticFiles
+from httpx import AsyncClient
+from PIL import Image
+from src.infrastructure.image_store import ImageStore
+from src.infrastructure.upload_files import UploadFiles
+
+REQUESTS = 500
+CONCURRENCY = 20
+
+async def run(app: FastAPI, image_path: str, headers: dict) -> tuple:
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        sent = 0
+        received = 0
+        
+        async def worker():
+            nonlocal sent, received
+            while sent < REQUESTS:
+                sent += 1
+                response = await client.get(image_path, headers=headers)
+                received += len(response.content)
+        
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(CONCURRENCY)])
+        elapsed = time.perf_counter() - started
+    return REQUESTS / elapsed, received / elapsed / 1e6
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        os.mkdir(os.path.join(directory, "menus"))
+        store = ImageStore(directory=os.path.join(directory, "menus"), thumbnail_sizes=[480])
+        buffer = io.BytesIO()
+        Image.frombytes("RGB", (600, 600), os.urandom(600 * 600 * 3)).save(buffer, format="JPEG", quality=90)
+        image_path = await store.save(UploadFile(file=io.BytesIO(buffer.getvalue()), filename="photo.jpg"))
+        
+        apps = {}
+        for name, files in [("StaticFiles", StaticFiles(directory=directory)),
+                            ("UploadFiles", UploadFiles(directory=directory)),
+                            ("X-Accel-Redirect", UploadFiles(directory=directory, accel_redirect_prefix="/internal"))]:
+            apps[name] = FastAPI()
+            apps[name].mount("/uploads", files)
+        etag = f'"{os.path.basename(image_path)}"'
+        
+        print(f"image: {len(buffer.getvalue()) / 1024:.0f} KiB, {REQUESTS} requests, concurrency {CONCURRENCY}")
+        print(f"{'mode':<28} {'req/s':>8} {'MB/s':>8}")
+        for label, app, headers in [
+            ("StaticFiles", apps["StaticFiles"], {}),
+            ("UploadFiles", apps["UploadFiles"], {}),
+            ("UploadFiles If-None-Match", apps["UploadFiles"], {"If-None-Match": etag}),
+            ("X-Accel-Redirect", apps["X-Accel-Redirect"], {}),
+        ]:
+            requests_per_second, megabytes_per_second = await run(app, image_path, headers)
+            print(f"{label:<28} {requests_per_second:>8.0f} {megabytes_per_second:>8.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,27 @@
+"""add unique menu name per category
+
+Revision ID: a6c2e9f4b318
+Revises: f3a9d2b71c85
+Create Date: 2026-10-19 11:40:05.816243
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a6c2e9f4b318'
+down_revision = 'f3a9d2b71c85'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Existing duplicates are renamed rather than deleted, since order items reference them.
+    op.execute(sa.text(
+        "UPDATE menus SET name = menus.name || ' (' || menus.id || ')' "
+        "FROM (SELECT id, row_number() OVER (PARTITION BY category_id, name ORDER BY id) AS n FROM menus) ranked "
+        "WHERE ranked.id = menus.id AND ranked.n > 1"
+    ))
+    op.create_unique_constraint('uq_menu_category_name', 'menus', ['category_id', 'name'])
+
+def downgrade() -> None:
+    op.drop_constraint('uq_menu_category_name', 'menus', type_='unique')
@@ -0,0 +1,57 @@
+"""add hot path indexes
+
+Revision ID: b7d3e41c9a52
+Revises: 36f10a5ea160
+Create Date: 2026-10-18 10:12:40.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b7d3e41c9a52'
+down_revision = '36f10a5ea160'
+branch_labels = None
+depends_on = None
+
+# menu_categories(store_id) is already served by uq_store_category_name (store_id, name).
+INDEXES = [
+    ('ix_table_sessions_table_id_is_active', 'table_sessions', ['table_id', 'is_active'], {}),
+    ('uq_table_sessions_active_table', 'table_sessions', ['table_id'],
+     {'unique': True, 'postgresql_where': sa.text('is_active')}),
+    ('ix_orders_table_session_id_created_at', 'orders', ['table_session_id', 'created_at'], {}),
+    ('ix_order_histories_table_session_id_archived_at', 'order_histories', ['table_session_id', 'archived_at'], {}),
+    ('ix_order_items_order_id', 'order_items', ['order_id'], {}),
+    ('ix_order_items_menu_id', 'order_items', ['menu_id'], {}),
+    ('ix_order_history_items_order_history_id', 'order_history_items', ['order_history_id'], {}),
+    ('ix_order_history_items_menu_id', 'order_history_items', ['menu_id'], {}),
+    ('ix_menus_category_id_display_order', 'menus', ['category_id', 'display_order'], {}),
+]
+
+def upgrade() -> None:
+    # Keep the newest active session per table so the unique partial index can be built.
+    op.execute(sa.text(
+        "UPDATE table_sessions SET is_active = false, "
+        "ended_at = GREATEST(timezone('UTC', now()), table_sessions.started_at), "
+        "updated_at = timezone('UTC', now()) "
+        "FROM (SELECT id, row_number() OVER (PARTITION BY table_id ORDER BY started_at DESC, id DESC) AS n "
+        "FROM table_sessions WHERE is_active) ranked "
+        "WHERE ranked.id = table_sessions.id AND ranked.n > 1"
+    ))
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for name, table, columns, kwargs in INDEXES:
+            # A failed concurrent build leaves an INVALID index that if_not_exists would silently keep.
+            invalid = bind.execute(sa.text(
+                "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+                "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+            ), {"name": name}).scalar()
+            if invalid:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kwargs)
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,27 @@
+"""add outbox events
+
+Revision ID: d41f8a2c6e13
+Revises: b7d3e41c9a52
+Create Date: 2026-10-18 14:03:11.529867
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd41f8a2c6e13'
+down_revision = 'b7d3e41c9a52'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('outbox_events',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('event_type', sa.String(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+def downgrade() -> None:
+    op.drop_table('outbox_events')
@@ -0,0 +1,40 @@
+"""add daily sales rollups
+
+Revision ID: e82c5b9d1f47
+Revises: d41f8a2c6e13
+Create Date: 2026-10-18 15:27:44.108312
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'e82c5b9d1f47'
+down_revision = 'd41f8a2c6e13'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table('daily_sales',
+    sa.Column('store_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['store_id'], ['stores.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('store_id', 'day')
+    )
+    op.create_table('daily_menu_sales',
+    sa.Column('store_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('menu_id', sa.Integer(), nullable=False),
+    sa.Column('menu_name', sa.String(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['store_id'], ['stores.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('store_id', 'day', 'menu_id')
+    )
+
+def downgrade() -> None:
+    op.drop_table('daily_menu_sales')
+    op.drop_table('daily_sales')
@@ -0,0 +1,21 @@
+"""add event delivery sequence
+
+Revision ID: f3a9d2b71c85
+Revises: e82c5b9d1f47
+Create Date: 2026-10-19 10:12:37.402815
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'f3a9d2b71c85'
+down_revision = 'e82c5b9d1f47'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(sa.Sequence('event_delivery_seq')))
+
+def downgrade() -> None:
+    op.execute(sa.schema.DropSequence(sa.Sequence('event_delivery_seq')))
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from src.core.database import get_db
 from src.services.authentication_service import AuthenticationService
+from src.schemas import AdminLoginResponse
 
 router = APIRouter(prefix="/api/admin/auth", tags=["admin-auth"])
 
@@ -11,7 +12,7 @@ class AdminLoginRequest(BaseModel):
     password: str
     store_id: str
 
-@router.post("/login")
+@router.post("/login", response_model=AdminLoginResponse)
 async def login(request: AdminLoginRequest, db: AsyncSession = Depends(get_db)):
     return await AuthenticationService.authenticate_admin(
         request.username, request.password, request.store_id, db
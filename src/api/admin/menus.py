@@ -1,17 +1,47 @@
 from fastapi import APIRouter, Depends, File, UploadFile, Form
+from typing import List, Literal
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.core.security import require_role
 from src.services.menu_service import MenuService
+from src.schemas import MenuImportResponse, MenuResponse, SuccessResponse
 
 router = APIRouter(prefix="/api/admin/menus", tags=["admin-menus"])
 
-@router.get("")
-async def get_menus(category_id: int = None, db: AsyncSession = Depends(get_db), 
+class MenuCreateItem(BaseModel):
+    category_id: int
+    name: str = Field(min_length=1)
+    price: float = Field(gt=0)
+    description: str = None
+    is_available: bool = True
+    display_order: int = 0
+
+class BatchCreateMenusRequest(BaseModel):
+    menus: List[MenuCreateItem] = Field(min_length=1, max_length=1000)
+
+class MenuUpdateItem(BaseModel):
+    id: int
+    category_id: int = None
+    name: str = Field(None, min_length=1)
+    price: float = Field(None, gt=0)
+    description: str = None
+    is_available: bool = None
+    display_order: int = None
+
+class BatchUpdateMenusRequest(BaseModel):
+    menus: List[MenuUpdateItem] = Field(min_length=1, max_length=1000)
+
+class ReorderRequest(BaseModel):
+    category_ids: List[int] = None
+    menu_ids: List[int] = None
+
+@router.get("", response_model=List[MenuResponse])
+async def get_menus(category_id: int = None, db: AsyncSession = Depends(get_read_db), 
                    user: dict = Depends(require_role("store_admin"))):
     return await MenuService.get_menus_by_category(category_id, user["store_id"], db)
 
-@router.post("")
+@router.post("", response_model=MenuResponse)
 async def create_menu(
     category_id: int = Form(...),
     name: str = Form(...),
@@ -23,7 +53,29 @@ async def create_menu(
 ):
     return await MenuService.create_menu(category_id, name, price, user["store_id"], db, description, image)
 
-@router.patch("/{menu_id}")
+@router.post("/batch", response_model=List[MenuResponse])
+async def create_menus(request: BatchCreateMenusRequest, db: AsyncSession = Depends(get_db),
+                       user: dict = Depends(require_role("store_admin"))):
+    return await MenuService.create_menus([menu.model_dump() for menu in request.menus], user["store_id"], db)
+
+@router.patch("/batch", response_model=List[MenuResponse])
+async def update_menus(request: BatchUpdateMenusRequest, db: AsyncSession = Depends(get_db),
+                       user: dict = Depends(require_role("store_admin"))):
+    updates = [menu.model_dump(exclude_unset=True) for menu in request.menus]
+    return await MenuService.update_menus(updates, user["store_id"], db)
+
+@router.put("/order", response_model=SuccessResponse)
+async def reorder(request: ReorderRequest, db: AsyncSession = Depends(get_db),
+                  user: dict = Depends(require_role("store_admin"))):
+    await MenuService.reorder(user["store_id"], db, request.category_ids, request.menu_ids)
+    return {"success": True}
+
+@router.post("/import", response_model=MenuImportResponse)
+async def import_menus(file: UploadFile = File(...), format: Literal["csv", "ndjson"] = "csv",
+                       db: AsyncSession = Depends(get_db), user: dict = Depends(require_role("store_admin"))):
+    return await MenuService.import_menus(file, format, user["store_id"], db)
+
+@router.patch("/{menu_id}", response_model=MenuResponse)
 async def update_menu(
     menu_id: int,
     name: str = Form(None),
@@ -34,10 +86,10 @@ async def update_menu(
     db: AsyncSession = Depends(get_db),
     user: dict = Depends(require_role("store_admin"))
 ):
-    return await MenuService.update_menu(menu_id, user["store_id"], db, name=name, price=price, 
+    return await MenuService.update_menu(menu_id, user["store_id"], db, image, name=name, price=price, 
                                         description=description, is_available=is_available)
 
-@router.delete("/{menu_id}")
+@router.delete("/{menu_id}", response_model=SuccessResponse)
 async def delete_menu(menu_id: int, db: AsyncSession = Depends(get_db), 
                      user: dict = Depends(require_role("store_admin"))):
     await MenuService.delete_menu(menu_id, user["store_id"], db)
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from datetime import date
+from typing import Literal
+from src.core.database import read_session_factory
+from src.core.security import require_role
+from src.services.order_history_query_service import OrderHistoryQueryService
+
+router = APIRouter(prefix="/api/admin/order-history", tags=["admin-order-history"])
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+@router.get("/export")
+async def export_order_history(format: Literal["ndjson", "csv"] = "ndjson", from_date: date = None, to_date: date = None,
+                               session_factory=Depends(read_session_factory),
+                               user: dict = Depends(require_role("store_admin"))):
+    return StreamingResponse(
+        OrderHistoryQueryService.export_order_history(user["store_id"], format, from_date, to_date, session_factory),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="order-history.{format}"'}
+    )
@@ -1,28 +1,48 @@
 from fastapi import APIRouter, Depends
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.core.security import require_role
 from src.services.order_query_service import OrderQueryService
 from src.services.update_order_status_service import UpdateOrderStatusService
 from src.services.delete_order_service import DeleteOrderService
+from src.schemas import BulkStatusUpdateResponse, LiveOrdersResponse, OrderResponse, OrderSummaryResponse, SuccessResponse
 
 router = APIRouter(prefix="/api/admin/orders", tags=["admin-orders"])
 
 class UpdateStatusRequest(BaseModel):
     status: str
 
-@router.get("")
-async def get_orders(table_id: int, db: AsyncSession = Depends(get_db), 
+class BulkUpdateStatusRequest(BaseModel):
+    status: str
+    order_ids: Optional[List[int]] = None
+    table_id: Optional[int] = None
+    from_status: Optional[str] = None
+
+@router.get("", response_model=List[OrderResponse])
+async def get_orders(table_id: int, db: AsyncSession = Depends(get_read_db), 
                     user: dict = Depends(require_role("store_admin"))):
     return await OrderQueryService.get_orders_by_table(table_id, user["store_id"], db)
 
-@router.patch("/{order_id}/status")
+@router.get("/live", response_model=LiveOrdersResponse)
+async def get_live_orders(since: Optional[str] = None, db: AsyncSession = Depends(get_read_db),
+                          user: dict = Depends(require_role("store_admin"))):
+    return await OrderQueryService.get_live_orders(user["store_id"], db, since)
+
+@router.patch("/status", response_model=BulkStatusUpdateResponse)
+async def bulk_update_status(request: BulkUpdateStatusRequest, db: AsyncSession = Depends(get_db),
+                             user: dict = Depends(require_role("store_admin"))):
+    return await UpdateOrderStatusService.bulk_update_status(
+        request.status, user["store_id"], db, request.order_ids, request.table_id, request.from_status
+    )
+
+@router.patch("/{order_id}/status", response_model=OrderSummaryResponse)
 async def update_status(order_id: int, request: UpdateStatusRequest, db: AsyncSession = Depends(get_db), 
                        user: dict = Depends(require_role("store_admin"))):
     return await UpdateOrderStatusService.update_order_status(order_id, request.status, user["store_id"], db)
 
-@router.delete("/{order_id}")
+@router.delete("/{order_id}", response_model=SuccessResponse)
 async def delete_order(order_id: int, db: AsyncSession = Depends(get_db), 
                       user: dict = Depends(require_role("store_admin"))):
     await DeleteOrderService.delete_order(order_id, user["store_id"], db)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import List
+from src.core.database import get_read_db
+from src.core.security import require_role
+from src.services.sales_rollup_service import SalesRollupService
+from src.schemas import DailySalesResponse, MenuSalesResponse
+
+router = APIRouter(prefix="/api/admin/reports", tags=["admin-reports"])
+
+@router.get("/daily-sales", response_model=List[DailySalesResponse])
+async def get_daily_sales(from_date: date = None, to_date: date = None, db: AsyncSession = Depends(get_read_db),
+                          user: dict = Depends(require_role("store_admin"))):
+    return await SalesRollupService.get_daily_sales(user["store_id"], db, from_date, to_date)
+
+@router.get("/menu-sales", response_model=List[MenuSalesResponse])
+async def get_menu_sales(from_date: date = None, to_date: date = None, db: AsyncSession = Depends(get_read_db),
+                         user: dict = Depends(require_role("store_admin"))):
+    return await SalesRollupService.get_menu_sales(user["store_id"], db, from_date, to_date)
@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from fastapi.responses import StreamingResponse
 from src.core.security import require_role
-from src.infrastructure.sse_publisher import sse_publisher
+from src.infrastructure.sse_publisher import sse_publisher, SSECapacityError
 
 router = APIRouter(prefix="/api/admin/sse", tags=["admin-sse"])
 
 @router.get("")
-async def sse_stream(user: dict = Depends(require_role("store_admin"))):
+async def sse_stream(last_event_id: str = Header(None), user: dict = Depends(require_role("store_admin"))):
+    try:
+        stream = sse_publisher.stream(user["store_id"], last_event_id)
+    except SSECapacityError:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SSE_CAPACITY_EXCEEDED",
+                            headers={"Retry-After": "5"})
     return StreamingResponse(
-        sse_publisher.stream(user["store_id"]),
+        stream,
         media_type="text/event-stream"
     )
@@ -1,20 +1,28 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
-from src.core.database import get_db
+from typing import Optional
+from src.core.database import get_db, get_read_db
 from src.core.security import require_role
 from src.services.complete_table_session_service import CompleteTableSessionService
 from src.services.order_history_query_service import OrderHistoryQueryService
+from src.schemas import CompleteSessionResponse, OrderHistoryPageResponse
 
 router = APIRouter(prefix="/api/admin/tables", tags=["admin-tables"])
 
-@router.post("/{table_id}/complete-session")
+@router.post("/{table_id}/complete-session", response_model=CompleteSessionResponse)
 async def complete_session(table_id: int, db: AsyncSession = Depends(get_db), 
                           user: dict = Depends(require_role("store_admin"))):
     return await CompleteTableSessionService.complete_session(table_id, user["store_id"], db)
 
-@router.get("/{table_id}/order-history")
-async def get_order_history(table_id: int, from_date: date = None, to_date: date = None,
-                           db: AsyncSession = Depends(get_db), 
+@router.get("/{table_id}/order-history", response_model=OrderHistoryPageResponse)
+async def get_order_history(table_id: int, response: Response, from_date: date = None, to_date: date = None,
+                           limit: int = Query(50, ge=1, le=500), cursor: Optional[str] = None,
+                           db: AsyncSession = Depends(get_read_db), 
                            user: dict = Depends(require_role("store_admin"))):
-    return await OrderHistoryQueryService.get_order_history(table_id, user["store_id"], db, from_date, to_date)
+    histories, next_cursor = await OrderHistoryQueryService.get_order_history(
+        table_id, user["store_id"], db, from_date, to_date, limit, cursor
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return {"items": histories, "next_cursor": next_cursor}
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from src.core.database import get_db
 from src.services.authentication_service import AuthenticationService
+from src.schemas import TableLoginResponse
 
 router = APIRouter(prefix="/api/customer/auth", tags=["customer-auth"])
 
@@ -11,7 +12,7 @@ class TableLoginRequest(BaseModel):
     password: str
     store_id: str
 
-@router.post("/login")
+@router.post("/login", response_model=TableLoginResponse)
 async def login(request: TableLoginRequest, db: AsyncSession = Depends(get_db)):
     return await AuthenticationService.authenticate_table(
         request.table_number, request.password, request.store_id, db
@@ -1,17 +1,24 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response, status
+from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.core.security import get_current_user
 from src.services.menu_service import MenuService
+from src.schemas import MenuResponse
 
 router = APIRouter(prefix="/api/customer/menus", tags=["customer-menus"])
 
-@router.get("")
-async def get_menus(store_id: str, category_id: int = None, db: AsyncSession = Depends(get_db), 
-                   user: dict = Depends(get_current_user)):
-    return await MenuService.get_menus_by_category(category_id, store_id, db)
+# The catalog is cached until the next menu change, so it is always loaded from the primary.
+@router.get("", response_model=List[MenuResponse])
+async def get_menus(store_id: str, category_id: int = None, if_none_match: str = Header(None),
+                   db: AsyncSession = Depends(get_db), user: dict = Depends(get_current_user)):
+    entry = await MenuService.get_menu_catalog(category_id, store_id, db)
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if entry.matches(if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
 
-@router.get("/{menu_id}")
-async def get_menu(menu_id: int, store_id: str, db: AsyncSession = Depends(get_db), 
+@router.get("/{menu_id}", response_model=MenuResponse)
+async def get_menu(menu_id: int, store_id: str, db: AsyncSession = Depends(get_read_db), 
                   user: dict = Depends(get_current_user)):
     return await MenuService.get_menu_by_id(menu_id, store_id, db)
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends
+from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.core.security import get_current_user
 from src.services.create_order_service import CreateOrderService
 from src.services.order_query_service import OrderQueryService
+from src.schemas import OrderResponse, OrderSummaryResponse
 
 router = APIRouter(prefix="/api/customer/orders", tags=["customer-orders"])
 
@@ -15,12 +17,12 @@ class OrderItemRequest(BaseModel):
 class CreateOrderRequest(BaseModel):
     items: list[OrderItemRequest]
 
-@router.post("")
+@router.post("", response_model=OrderSummaryResponse)
 async def create_order(request: CreateOrderRequest, db: AsyncSession = Depends(get_db), 
                       user: dict = Depends(get_current_user)):
     items = [{"menu_id": item.menu_id, "quantity": item.quantity} for item in request.items]
     return await CreateOrderService.create_order(user["session_id"], items, db)
 
-@router.get("")
-async def get_orders(db: AsyncSession = Depends(get_db), user: dict = Depends(get_current_user)):
+@router.get("", response_model=List[OrderResponse])
+async def get_orders(db: AsyncSession = Depends(get_read_db), user: dict = Depends(get_current_user)):
     return await OrderQueryService.get_orders_by_session(user["session_id"], db)
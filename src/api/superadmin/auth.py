@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from src.core.database import get_db
 from src.services.authentication_service import AuthenticationService
+from src.schemas import AdminLoginResponse
 
 router = APIRouter(prefix="/api/superadmin/auth", tags=["superadmin-auth"])
 
@@ -10,6 +11,6 @@ class SuperAdminLoginRequest(BaseModel):
     username: str
     password: str
 
-@router.post("/login")
+@router.post("/login", response_model=AdminLoginResponse)
 async def login(request: SuperAdminLoginRequest, db: AsyncSession = Depends(get_db)):
     return await AuthenticationService.authenticate_super_admin(request.username, request.password, db)
@@ -1,10 +1,45 @@
+from typing import List, Literal, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PGBOUNCER: bool = False
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_CHECK_SECONDS: float = 2.0
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_HOURS: int = 16
+    PASSWORD_HASH_WORKERS: int = 4
+    TOKEN_CACHE_SIZE: int = 10000
+    SSE_CLIENT_BUFFER_SIZE: int = 100
+    SSE_SLOW_CONSUMER_POLICY: Literal["drop_oldest", "coalesce", "disconnect"] = "drop_oldest"
+    SSE_REPLAY_BUFFER_SIZE: int = 256
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    SSE_IDLE_TIMEOUT_SECONDS: float = 60.0
+    SSE_MAX_CLIENTS_PER_STORE: int = 50
+    SSE_MAX_CLIENTS: int = 2000
+    EVENT_BUS_QUEUE_SIZE: int = 1000
+    EVENT_BUS_WORKERS: int = 2
+    EVENT_BUS_BATCH_SIZE: int = 50
+    EVENT_TRANSPORT: Literal["local", "postgres"] = "local"
+    EVENT_CHANNEL: str = "tableorder_events"
+    EVENT_LISTEN_DATABASE_URL: Optional[str] = None
+    STORE_TIMEZONE: str = "Asia/Seoul"
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_SECONDS: float = 1.0
+    MENU_IMAGE_MAX_BYTES: int = 5 * 1024 * 1024
+    MENU_IMAGE_THUMBNAIL_SIZES: List[int] = [160, 480]
+    IMAGE_WORKERS: int = 2
+    MENU_IMPORT_CHUNK_SIZE: int = 500
+    UPLOADS_ACCEL_REDIRECT_PREFIX: Optional[str] = None
     
     class Config:
         env_file = ".env"
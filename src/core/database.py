@@ -1,11 +1,243 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+from fastapi import Depends, Request, Response
+from sqlalchemy import event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from src.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+logger = logging.getLogger(__name__)
+
+# Carries the time of a client's last commit so any worker can keep its reads off replicas that lack it.
+READ_AFTER_HEADER = "X-Read-After"
+PRIMARY_LSN_QUERY = text("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), '0/0')")
+# NULL on a server that is not a standby, so a promoted or misconfigured replica is never read from.
+REPLAY_LSN_QUERY = text(
+    "SELECT CASE WHEN pg_is_in_recovery() THEN pg_wal_lsn_diff(pg_last_wal_replay_lsn(), '0/0') END"
+)
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+    
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            # Includes waiting for a free slot, opening overflow connections and pre-ping.
+            waited = time.perf_counter() - started
+            self.metrics.checkouts += 1
+            self.metrics.wait_seconds_total += waited
+            self.metrics.wait_seconds_max = max(self.metrics.wait_seconds_max, waited)
+    
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+def engine_options(pgbouncer: bool = settings.DB_PGBOUNCER) -> dict:
+    options = {
+        "echo": settings.DB_ECHO,
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    }
+    if pgbouncer:
+        # Transaction pooling hands each transaction a different server connection,
+        # so prepared statements must be neither cached nor reused by name.
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4().hex}__",
+        }
+    return options
+
+def create_engine(database_url: str, **overrides) -> AsyncEngine:
+    new_engine = create_async_engine(database_url, **{**engine_options(), **overrides})
+    pool = new_engine.sync_engine.pool
+    if isinstance(pool, InstrumentedPool):
+        metrics = pool.metrics
+        
+        def count_connect(dbapi_connection, connection_record):
+            metrics.connects += 1
+        
+        def count_invalidate(dbapi_connection, connection_record, exception):
+            metrics.invalidations += 1
+        
+        # Pool listeners survive dispose(), which recreates the pool.
+        event.listen(pool, "connect", count_connect)
+        event.listen(pool, "invalidate", count_invalidate)
+    return new_engine
+
+def pool_stats(target: AsyncEngine) -> dict:
+    pool = target.sync_engine.pool
+    stats = {"size": pool.size(), "checked_out": pool.checkedout(), "overflow": max(pool.overflow(), 0)}
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(vars(metrics))
+    return stats
+
+engine = create_engine(settings.DATABASE_URL)
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
-async def get_db():
+class ReplicaRouter:
+    def __init__(self, replica_urls: List[str] = settings.DATABASE_REPLICA_URLS,
+                 max_lag: float = settings.REPLICA_MAX_LAG_SECONDS,
+                 check_interval: float = settings.REPLICA_CHECK_SECONDS, engines: Optional[List[AsyncEngine]] = None,
+                 primary: Optional[AsyncEngine] = None):
+        self.engines = engines if engines is not None else [create_engine(url) for url in replica_urls]
+        self.primary = primary or engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._session_factories = [
+            async_sessionmaker(replica, class_=AsyncSession, expire_on_commit=False) for replica in self.engines
+        ]
+        # Primary WAL positions with the time they were read; a replica that has replayed past one
+        # has every commit made before that time, whether or not its WAL receiver is still connected.
+        self._samples: Deque[Tuple[float, int]] = deque()
+        # Unknown until the first check, so reads stay on the primary until then.
+        self.caught_up_at: List[Optional[float]] = [None] * len(self.engines)
+        self._next = 0
+        self._task: Optional[asyncio.Task] = None
+        self.replica_reads = 0
+        self.sticky_reads = 0
+        self.fallback_reads = 0
+    
+    def session_factory(self, read_after: Optional[float] = None) -> async_sessionmaker:
+        if not self.engines:
+            return AsyncSessionLocal
+        now = time.time()
+        current = [
+            i for i, caught_up_at in enumerate(self.caught_up_at)
+            if caught_up_at is not None and now - caught_up_at <= self.max_lag
+        ]
+        if not current:
+            self.fallback_reads += 1
+            return AsyncSessionLocal
+        if read_after is not None:
+            current = [i for i in current if self.caught_up_at[i] >= read_after]
+            if not current:
+                self.sticky_reads += 1
+                return AsyncSessionLocal
+        index = current[self._next % len(current)]
+        self._next += 1
+        self.replica_reads += 1
+        return self._session_factories[index]
+    
+    def lag(self, now: Optional[float] = None) -> List[Optional[float]]:
+        now = time.time() if now is None else now
+        return [None if caught_up_at is None else max(now - caught_up_at, 0.0) for caught_up_at in self.caught_up_at]
+    
+    def record(self, sampled_at: float, primary_lsn: int, replay_lsns: List[Optional[int]]):
+        self._samples.append((sampled_at, primary_lsn))
+        while len(self._samples) > 1 and self._samples[0][0] < sampled_at - self.max_lag - 2 * self.check_interval:
+            self._samples.popleft()
+        for index, replay_lsn in enumerate(replay_lsns):
+            if replay_lsn is None:
+                self.caught_up_at[index] = None
+                continue
+            for sample_time, sample_lsn in reversed(self._samples):
+                if sample_lsn <= replay_lsn:
+                    self.caught_up_at[index] = max(self.caught_up_at[index] or 0.0, sample_time)
+                    break
+    
+    async def check_lag(self):
+        # Read before the primary's position so every commit finished by then is included in it.
+        sampled_at = time.time()
+        try:
+            async with self.primary.connect() as conn:
+                primary_lsn = int(await conn.scalar(PRIMARY_LSN_QUERY))
+        except Exception:
+            logger.exception("Primary WAL position check failed")
+            self.caught_up_at = [None] * len(self.engines)
+            return
+        replay_lsns = []
+        for replica in self.engines:
+            try:
+                async with replica.connect() as conn:
+                    replay_lsn = await conn.scalar(REPLAY_LSN_QUERY)
+                replay_lsns.append(None if replay_lsn is None else int(replay_lsn))
+            except Exception:
+                logger.exception("Replica lag check failed")
+                replay_lsns.append(None)
+        self.record(sampled_at, primary_lsn, replay_lsns)
+    
+    async def _run(self):
+        while True:
+            await self.check_lag()
+            await asyncio.sleep(self.check_interval)
+    
+    def start(self):
+        if self.engines and self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+    
+    def stats(self) -> dict:
+        return {
+            "replicas": len(self.engines),
+            "replica_lag_seconds": self.lag(),
+            "replica_reads": self.replica_reads,
+            "sticky_reads": self.sticky_reads,
+            "fallback_reads": self.fallback_reads,
+        }
+
+replica_router = ReplicaRouter()
+
+def _read_after(request: Request) -> Optional[float]:
+    try:
+        return float(request.headers[READ_AFTER_HEADER])
+    except (KeyError, ValueError):
+        return None
+
+@event.listens_for(Session, "after_commit")
+def _mark_write(session: Session):
+    response = session.info.get("response")
+    if response is not None and replica_router.engines:
+        response.headers[READ_AFTER_HEADER] = f"{time.time():.6f}"
+
+async def get_db(response: Response):
     async with AsyncSessionLocal() as session:
+        # Clients echo the commit time back so their next reads wait for a replica that has it.
+        session.info["response"] = response
+        yield session
+
+def read_session_factory(request: Request) -> async_sessionmaker:
+    return replica_router.session_factory(_read_after(request))
+
+async def get_read_db(session_factory: async_sessionmaker = Depends(read_session_factory)):
+    async with session_factory() as session:
         yield session
@@ -1,9 +1,13 @@
 import jwt
 import bcrypt
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from src.core.config import settings
+from src.core.token_cache import token_cache
 
 security = HTTPBearer()
 
@@ -13,9 +17,53 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
+# bcrypt releases the GIL, so a small thread pool keeps logins off the event loop.
+class PasswordHasher:
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self.in_flight = 0
+        self.calls = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+    
+    async def _run(self, func, *args):
+        def timed():
+            return time.perf_counter(), func(*args)
+        
+        submitted = time.perf_counter()
+        self.in_flight += 1
+        try:
+            started, result = await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self.in_flight -= 1
+        queue_time = started - submitted
+        self.calls += 1
+        self.queue_time_total += queue_time
+        self.queue_time_max = max(self.queue_time_max, queue_time)
+        return result
+    
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+    
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "queue_time_total_seconds": self.queue_time_total,
+            "queue_time_max_seconds": self.queue_time_max,
+        }
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS)
+
 def create_jwt_token(payload: dict) -> str:
     exp = datetime.utcnow() + timedelta(hours=settings.JWT_EXPIRATION_HOURS)
     payload["exp"] = exp
+    payload["iat"] = time.time()
     return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
 def decode_jwt_token(token: str) -> dict:
@@ -27,7 +75,15 @@ def decode_jwt_token(token: str) -> dict:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="INVALID_TOKEN")
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
-    return decode_jwt_token(credentials.credentials)
+    token = credentials.credentials
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = decode_jwt_token(token)
+        token_cache.put(token, claims)
+    if token_cache.is_revoked(claims):
+        token_cache.discard(token)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="TOKEN_REVOKED")
+    return claims
 
 def require_role(required_role: str):
     async def role_checker(user: dict = Depends(get_current_user)) -> dict:
@@ -0,0 +1,78 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from src.core.config import settings
+
+REVOCABLE_SUBJECTS = ("admin_id", "session_id")
+
+class VerifiedTokenCache:
+    def __init__(self, max_size: int, revocation_ttl: float):
+        self.max_size = max_size
+        self._revocation_ttl = revocation_ttl
+        self._entries: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+        self._revoked: Dict[Tuple[str, object], float] = {}
+        self._last_purge = time.time()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+    
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+    
+    def put(self, token: str, claims: dict):
+        if "exp" not in claims:
+            return
+        key = self._key(token)
+        self._entries[key] = (claims, float(claims["exp"]))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def discard(self, token: str):
+        self._entries.pop(self._key(token), None)
+    
+    def revoke(self, subject: str, subject_id, revoked_at: Optional[float] = None):
+        # Tokens issued for the subject up to now are rejected; later logins are not affected.
+        now = time.time()
+        key = (subject, subject_id)
+        self._revoked[key] = max(revoked_at or now, self._revoked.get(key, 0))
+        if now - self._last_purge > 60:
+            cutoff = now - self._revocation_ttl
+            self._revoked = {key: revoked_at for key, revoked_at in self._revoked.items() if revoked_at > cutoff}
+            self._last_purge = now
+    
+    def is_revoked(self, claims: dict) -> bool:
+        issued_at = claims.get("iat", 0)
+        for subject in REVOCABLE_SUBJECTS:
+            if subject in claims:
+                revoked_at = self._revoked.get((subject, claims[subject]))
+                if revoked_at is not None and issued_at <= revoked_at:
+                    return True
+        return False
+    
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "revoked_subjects": len(self._revoked),
+        }
+
+token_cache = VerifiedTokenCache(settings.TOKEN_CACHE_SIZE, settings.JWT_EXPIRATION_HOURS * 3600)
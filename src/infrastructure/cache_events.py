@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.core.token_cache import token_cache
+from src.infrastructure.event_bus import event_bus
+from src.infrastructure.event_transport import EVENTS_MISSED
+from src.infrastructure.menu_catalog import menu_catalog
+from src.models import Admin, TableSession
+
+def _timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+async def load_revocations(session_factory=AsyncSessionLocal):
+    # Revocations otherwise only arrive by NOTIFY, which a new worker or a reconnecting listener misses.
+    # Completed sessions and deactivated admins are the durable record; older tokens have expired anyway.
+    cutoff = datetime.utcnow() - timedelta(hours=settings.JWT_EXPIRATION_HOURS)
+    async with session_factory() as db:
+        sessions = await db.execute(
+            select(TableSession.id, TableSession.ended_at).where(TableSession.ended_at >= cutoff)
+        )
+        admins = await db.execute(
+            select(Admin.id, Admin.updated_at).where(Admin.is_active == False, Admin.updated_at >= cutoff)
+        )
+    for session_id, ended_at in sessions:
+        token_cache.revoke("session_id", session_id, _timestamp(ended_at))
+    for admin_id, updated_at in admins:
+        token_cache.revoke("admin_id", admin_id, _timestamp(updated_at))
+
+async def setup_cache_events():
+    async def handle_menu_catalog_changed(payload: dict):
+        menu_catalog.invalidate(payload["store_id"])
+    
+    async def handle_token_revoked(payload: dict):
+        token_cache.revoke(payload["subject"], payload["subject_id"])
+    
+    async def handle_events_missed(payload: dict):
+        await load_revocations()
+    
+    event_bus.subscribe("MenuCatalogChanged", handle_menu_catalog_changed)
+    event_bus.subscribe("TokenRevoked", handle_token_revoked)
+    event_bus.subscribe(EVENTS_MISSED, handle_events_missed)
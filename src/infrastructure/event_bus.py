@@ -1,18 +1,128 @@
 import asyncio
+import logging
+import time
 from typing import Dict, List, Callable
 from collections import defaultdict
+from src.core.config import settings
+from src.infrastructure.event_transport import create_transport
+
+logger = logging.getLogger(__name__)
 
 class EventBus:
-    def __init__(self):
+    def __init__(self, queue_size: int = settings.EVENT_BUS_QUEUE_SIZE, workers: int = settings.EVENT_BUS_WORKERS,
+                 batch_size: int = settings.EVENT_BUS_BATCH_SIZE, transport=None):
         self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
-        self._queue: asyncio.Queue = asyncio.Queue()
+        self._batch_subscribers: Dict[str, List[Callable]] = defaultdict(list)
+        self.queue_size = queue_size
+        self.worker_count = workers
+        self.batch_size = batch_size
+        self.transport = transport or create_transport()
+        self._queues: List[asyncio.Queue] = []
+        self._workers: List[asyncio.Task] = []
+        self.in_flight = 0
+        self.published = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dispatch_latency_total = 0.0
+        self.dispatch_latency_max = 0.0
     
-    def subscribe(self, event_type: str, callback: Callable):
-        self._subscribers[event_type].append(callback)
+    def subscribe(self, event_type: str, callback: Callable, batch: bool = False):
+        if batch:
+            self._batch_subscribers[event_type].append(callback)
+        else:
+            self._subscribers[event_type].append(callback)
     
     async def publish(self, event_type: str, payload: dict):
-        await self._queue.put({"event_type": event_type, "payload": payload})
-        for callback in self._subscribers[event_type]:
-            asyncio.create_task(callback(payload))
+        self.published += 1
+        if not self._workers:
+            await self._dispatch([(event_type, payload, time.perf_counter())])
+            return
+        await self.transport.send(event_type, payload)
+    
+    async def publish_many(self, events: list):
+        self.published += len(events)
+        if not self._workers:
+            now = time.perf_counter()
+            await self._dispatch([(event_type, payload, now) for event_type, payload in events])
+            return
+        await self.transport.send_many(events)
+    
+    async def _enqueue(self, event_type: str, payload: dict):
+        # Each store always lands on the same consumer, so its events stay in order.
+        queue = self._queues[hash(payload.get("store_id")) % len(self._queues)]
+        await queue.put((event_type, payload, time.perf_counter()))
+    
+    def start(self):
+        if self._workers:
+            return
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(self.worker_count)]
+        self._workers = [asyncio.create_task(self._consume(queue)) for queue in self._queues]
+        self.transport.start(self._enqueue)
+    
+    async def stop(self):
+        if not self._workers:
+            return
+        await self.transport.stop()
+        for queue in self._queues:
+            await queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queues = []
+    
+    async def _consume(self, queue: asyncio.Queue):
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            self.in_flight += len(batch)
+            try:
+                await self._dispatch(batch)
+            finally:
+                self.in_flight -= len(batch)
+                for _ in batch:
+                    queue.task_done()
+    
+    async def _dispatch(self, batch: list):
+        by_type = defaultdict(list)
+        for event_type, payload, _ in batch:
+            by_type[event_type].append(payload)
+        for event_type, payloads in by_type.items():
+            for callback in self._batch_subscribers[event_type]:
+                await self._deliver(callback, payloads)
+            for callback in self._subscribers[event_type]:
+                for payload in payloads:
+                    await self._deliver(callback, payload)
+        now = time.perf_counter()
+        for _, _, enqueued_at in batch:
+            latency = now - enqueued_at
+            self.dispatch_latency_total += latency
+            self.dispatch_latency_max = max(self.dispatch_latency_max, latency)
+    
+    async def _deliver(self, callback: Callable, arg):
+        try:
+            await callback(arg)
+            self.delivered += 1
+        except Exception:
+            self.failed += 1
+            logger.exception("Event subscriber %r failed", callback)
+    
+    def queue_depth(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+    
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "queue_depth": self.queue_depth(),
+            "queue_capacity": self.queue_size * len(self._queues),
+            "in_flight": self.in_flight,
+            "published": self.published,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dispatch_latency_total_seconds": self.dispatch_latency_total,
+            "dispatch_latency_max_seconds": self.dispatch_latency_max,
+            **self.transport.stats(),
+        }
 
 event_bus = EventBus()
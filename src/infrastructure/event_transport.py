@@ -0,0 +1,170 @@
+import asyncio
+import json
+import logging
+from typing import Awaitable, Callable, List, Optional, Tuple
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from src.core.config import settings
+from src.core.database import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, dict], Awaitable[None]]
+Events = List[Tuple[str, dict]]
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+NOTIFY_PAYLOAD_LIMIT = 7999
+# Delivered locally whenever notifications may have been lost, so subscribers can resync from the database.
+EVENTS_MISSED = "EventsMissed"
+
+class LocalTransport:
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+    
+    def start(self, deliver: Deliver):
+        self._deliver = deliver
+    
+    async def stop(self):
+        pass
+    
+    async def wait_listening(self):
+        pass
+    
+    async def send(self, event_type: str, payload: dict):
+        await self._deliver(event_type, payload)
+    
+    async def send_many(self, events: Events):
+        for event_type, payload in events:
+            await self._deliver(event_type, payload)
+    
+    def stats(self) -> dict:
+        return {"transport": "local"}
+
+class PostgresTransport:
+    def __init__(self, database_url: str, channel: str, engine=None, reconnect_delay: float = 1.0,
+                 inbox_size: int = settings.EVENT_BUS_QUEUE_SIZE):
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.engine = engine or default_engine
+        self._deliver: Optional[Deliver] = None
+        self._inbox: asyncio.Queue = asyncio.Queue(maxsize=inbox_size)
+        self._tasks = []
+        self._connection: Optional[asyncpg.Connection] = None
+        self._listening = asyncio.Event()
+        self.sent = 0
+        self.received = 0
+        self.oversized = 0
+        self.dropped = 0
+        self._missed = False
+        self.reconnects = 0
+    
+    def start(self, deliver: Deliver):
+        if self._tasks:
+            return
+        self._deliver = deliver
+        self._tasks = [asyncio.create_task(self._listen()), asyncio.create_task(self._forward())]
+    
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+        self._listening.clear()
+    
+    async def wait_listening(self):
+        await self._listening.wait()
+    
+    async def send(self, event_type: str, payload: dict):
+        await self.send_many([(event_type, payload)])
+    
+    async def send_many(self, events: Events):
+        messages = []
+        for event_type, payload in events:
+            message = json.dumps({"event_type": event_type, "payload": payload}, default=str)
+            if len(message.encode()) > NOTIFY_PAYLOAD_LIMIT:
+                # Too large to fan out; at least this worker's subscribers get it.
+                self.oversized += 1
+                logger.warning("Event %s is too large for NOTIFY, delivering locally only", event_type)
+                await self._deliver(event_type, payload)
+                continue
+            messages.append(message)
+        if not messages:
+            return
+        # One transaction per batch; Postgres delivers its notifications in order once it commits, but collapses
+        # identical payloads within it, which relayed events never are since each carries its delivery id.
+        async with self.engine.begin() as conn:
+            await conn.execute(text("SELECT pg_notify(:channel, message) FROM unnest(CAST(:messages AS text[])) AS message"),
+                               {"channel": self.channel, "messages": messages})
+        self.sent += len(messages)
+    
+    def _on_notify(self, connection, pid, channel, message):
+        try:
+            self._inbox.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self._missed = True
+            logger.warning("Event inbox is full, dropping notification")
+    
+    async def _listen(self):
+        while True:
+            try:
+                closed = asyncio.Event()
+                self._connection = await asyncpg.connect(self.dsn)
+                self._connection.add_termination_listener(lambda connection: closed.set())
+                await self._connection.add_listener(self.channel, self._on_notify)
+                self._listening.set()
+                # Anything sent before LISTEN took effect was missed, on the first connect as on a reconnect.
+                await self._deliver(EVENTS_MISSED, {})
+                await closed.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event listener connection failed")
+            # Notifications sent while we are disconnected are not replayed.
+            self._listening.clear()
+            if self._connection is not None and not self._connection.is_closed():
+                self._connection.terminate()
+            self._connection = None
+            self.reconnects += 1
+            await asyncio.sleep(self.reconnect_delay)
+    
+    async def _forward(self):
+        while True:
+            message = await self._inbox.get()
+            self.received += 1
+            try:
+                event = json.loads(message)
+                await self._deliver(event["event_type"], event["payload"])
+            except Exception:
+                logger.exception("Dropping malformed event notification")
+            if self._missed and self._inbox.empty():
+                self._missed = False
+                await self._deliver(EVENTS_MISSED, {})
+    
+    def stats(self) -> dict:
+        return {
+            "transport": "postgres",
+            "listening": self._listening.is_set(),
+            "sent": self.sent,
+            "received": self.received,
+            "oversized": self.oversized,
+            "dropped": self.dropped,
+            "reconnects": self.reconnects,
+            "inbox_depth": self._inbox.qsize(),
+        }
+
+def create_transport():
+    if settings.EVENT_TRANSPORT != "postgres":
+        return LocalTransport()
+    listen_url = settings.EVENT_LISTEN_DATABASE_URL
+    if not listen_url:
+        # LISTEN is session state; a transaction-pooled connection would silently receive nothing.
+        if settings.DB_PGBOUNCER:
+            raise RuntimeError("EVENT_LISTEN_DATABASE_URL must point directly at Postgres when DB_PGBOUNCER is set")
+        listen_url = settings.DATABASE_URL
+    return PostgresTransport(listen_url, settings.EVENT_CHANNEL)
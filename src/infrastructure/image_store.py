@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional
+from fastapi import HTTPException, UploadFile, status
+from PIL import Image, UnidentifiedImageError
+from src.core.config import settings
+
+CHUNK_SIZE = 256 * 1024
+IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "webp", "gif"}
+# Pillow reports many camera JPEGs as MPO.
+IMAGE_FORMATS = {"JPEG", "MPO", "PNG", "WEBP", "GIF"}
+# Formats that also get a WebP copy; GIF is left alone so animations survive.
+WEBP_SOURCE_FORMATS = {"JPEG", "PNG"}
+HASHED_NAME = re.compile(r"^[0-9a-f]{64}$")
+# Content-addressed originals, thumbnails and their WebP copies never change once written.
+IMMUTABLE_NAME = re.compile(r"^[0-9a-f]{64}(_\d+)?\.(jpg|jpeg|png|webp|gif)$")
+
+def _verify_image(path: str):
+    with Image.open(path) as image:
+        if image.format not in IMAGE_FORMATS:
+            raise UnidentifiedImageError(path)
+        image.verify()
+
+def _write_image(image: Image.Image, target: str, image_format: str):
+    if os.path.exists(target):
+        return
+    partial = f"{target}.{uuid.uuid4().hex}.partial"
+    image.save(partial, format=image_format)
+    os.replace(partial, target)
+
+def _make_variants(source: str, sizes: List[int]):
+    with Image.open(source) as image:
+        image.load()
+        image_format = "JPEG" if image.format == "MPO" else image.format
+        variants = [(source, image)]
+        for size in sizes:
+            thumbnail = image.copy()
+            thumbnail.thumbnail((size, size))
+            _write_image(thumbnail, _thumbnail_file(source, size), image_format)
+            variants.append((_thumbnail_file(source, size), thumbnail))
+        if image_format in WEBP_SOURCE_FORMATS:
+            for path, variant in variants:
+                _write_image(variant, _webp_file(path), "WEBP")
+
+def _webp_file(path: str) -> str:
+    return f"{os.path.splitext(path)[0]}.webp"
+
+def _thumbnail_file(path: str, size: int) -> str:
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_{size}{ext}"
+
+def _remove(paths: List[str]):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+class ImageStore:
+    def __init__(self, directory: str = "uploads/menus", url_prefix: str = "/uploads/menus",
+                 max_bytes: int = settings.MENU_IMAGE_MAX_BYTES,
+                 thumbnail_sizes: List[int] = settings.MENU_IMAGE_THUMBNAIL_SIZES,
+                 max_workers: int = settings.IMAGE_WORKERS):
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self.max_bytes = max_bytes
+        self.thumbnail_sizes = thumbnail_sizes
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image")
+        self.stored = 0
+        self.deduplicated = 0
+    
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    
+    async def save(self, upload: UploadFile, before_store: Optional[Callable[[str], Awaitable[None]]] = None) -> str:
+        ext = os.path.splitext(upload.filename or "")[1].lstrip(".").lower()
+        if ext not in IMAGE_EXTENSIONS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_IMAGE_TYPE")
+        
+        fd, partial = await self._run(tempfile.mkstemp, ".partial", "upload-", self.directory)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as file:
+                while chunk := await upload.read(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="IMAGE_TOO_LARGE")
+                    digest.update(chunk)
+                    await self._run(file.write, chunk)
+            
+            # Identical uploads map to the same name, so the file is stored once.
+            filename = f"{digest.hexdigest()}.{ext}"
+            target = os.path.join(self.directory, filename)
+            if before_store is not None:
+                await before_store(f"{self.url_prefix}/{filename}")
+            stored = False
+            if await self._run(os.path.exists, target):
+                self.deduplicated += 1
+            else:
+                try:
+                    await self._run(_verify_image, partial)
+                except (UnidentifiedImageError, OSError):
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_IMAGE")
+                await self._run(os.replace, partial, target)
+                stored = True
+            try:
+                await self._run(_make_variants, target, self.thumbnail_sizes)
+            except (UnidentifiedImageError, OSError):
+                # A truncated file can pass verification and only fail once decoded.
+                if stored:
+                    await self.delete(f"{self.url_prefix}/{filename}")
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_IMAGE")
+            self.stored += stored
+        finally:
+            await self._run(_remove, [partial])
+        return f"{self.url_prefix}/{filename}"
+    
+    def _local_path(self, image_path: str) -> Optional[str]:
+        if not image_path.startswith(f"{self.url_prefix}/"):
+            return None
+        return os.path.join(self.directory, os.path.basename(image_path))
+    
+    def thumbnail_paths(self, image_path: Optional[str]) -> Dict[str, str]:
+        if not image_path:
+            return {}
+        stem, ext = os.path.splitext(os.path.basename(image_path))
+        # Images uploaded before content hashing have no thumbnails.
+        if not HASHED_NAME.match(stem):
+            return {}
+        return {str(size): f"{self.url_prefix}/{stem}_{size}{ext}" for size in self.thumbnail_sizes}
+    
+    async def delete(self, image_path: Optional[str]):
+        path = self._local_path(image_path or "")
+        if path is None:
+            return
+        paths = [path] + [_thumbnail_file(path, size) for size in self.thumbnail_sizes]
+        await self._run(_remove, paths + [_webp_file(path) for path in paths if not path.endswith(".webp")])
+    
+    def stats(self) -> dict:
+        return {"stored": self.stored, "deduplicated": self.deduplicated}
+
+image_store = ImageStore()
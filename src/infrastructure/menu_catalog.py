@@ -0,0 +1,70 @@
+import asyncio
+import hashlib
+import orjson
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Optional
+
+def _encode(menus: list) -> bytes:
+    return orjson.dumps(menus)
+
+class CatalogEntry:
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        return self.etag in (tag.strip() for tag in if_none_match.split(","))
+
+class CatalogSnapshot:
+    def __init__(self, version: int, menus: list):
+        self.version = version
+        grouped = defaultdict(list)
+        for menu in menus:
+            grouped[menu["category_id"]].append(menu)
+        self._entries = {None: CatalogEntry(_encode(menus))}
+        for category_id, items in grouped.items():
+            self._entries[category_id] = CatalogEntry(_encode(items))
+        self._empty = CatalogEntry(_encode([]))
+    
+    def get(self, category_id: Optional[int]) -> CatalogEntry:
+        return self._entries.get(category_id, self._empty)
+
+class MenuCatalogCache:
+    def __init__(self):
+        self._versions: Dict[str, int] = defaultdict(int)
+        self._snapshots: Dict[str, CatalogSnapshot] = {}
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.hits = 0
+        self.misses = 0
+    
+    def version(self, store_id: str) -> int:
+        return self._versions[store_id]
+    
+    def invalidate(self, store_id: str):
+        self._versions[store_id] += 1
+        self._snapshots.pop(store_id, None)
+    
+    async def get(self, store_id: str, loader: Callable[[], Awaitable[list]]) -> CatalogSnapshot:
+        snapshot = self._snapshots.get(store_id)
+        if snapshot is None:
+            async with self._locks[store_id]:
+                snapshot = self._snapshots.get(store_id)
+                if snapshot is None:
+                    self.misses += 1
+                    version = self._versions[store_id]
+                    snapshot = CatalogSnapshot(version, await loader())
+                    # A mutation committed while we were loading; serve this one but don't keep it.
+                    if self._versions[store_id] == version:
+                        self._snapshots[store_id] = snapshot
+                    return snapshot
+        self.hits += 1
+        return snapshot
+    
+    def stats(self) -> dict:
+        return {"stores": len(self._snapshots), "hits": self.hits, "misses": self.misses}
+
+menu_catalog = MenuCatalogCache()
@@ -0,0 +1,222 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.core.database import engine, pool_stats, replica_router
+from src.core.security import password_hasher
+from src.core.token_cache import token_cache
+from src.infrastructure.event_bus import event_bus
+from src.infrastructure.image_store import image_store
+from src.infrastructure.menu_catalog import menu_catalog
+from src.infrastructure.outbox_relay import outbox_relay
+from src.infrastructure.sse_publisher import sse_publisher
+
+PREFIX = "tableorder"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Paths that matched no route are grouped so scanners can't create a series per URL.
+UNMATCHED_ROUTE = "unmatched"
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class RequestStats:
+    def __init__(self):
+        self.sql_statements = 0
+        self.sql_seconds = 0.0
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["metrics_started"] = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("metrics_started", None)
+    # SQLAlchemy runs the driver in a greenlet that shares the request's context.
+    request_stats = _request_stats.get()
+    if started is None or request_stats is None:
+        return
+    request_stats.sql_statements += 1
+    request_stats.sql_seconds += time.perf_counter() - started
+
+def _label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_label_value(value)}"' for key, value in labels.items()) + "}"
+
+def _metric_name(key: str) -> str:
+    return "".join(char if char.isalnum() else "_" for char in key)
+
+def _number(value) -> str:
+    if isinstance(value, float):
+        return "+Inf" if value == float("inf") else repr(value)
+    return str(int(value))
+
+def _is_number(value) -> bool:
+    return isinstance(value, (bool, int, float))
+
+def _gauge_samples(stats: dict):
+    for key, value in stats.items():
+        if _is_number(value):
+            yield _metric_name(key), {}, value
+        elif isinstance(value, dict):
+            for label, item in value.items():
+                if _is_number(item):
+                    yield _metric_name(key), {"key": label}, item
+        elif isinstance(value, (list, tuple)):
+            for index, item in enumerate(value):
+                if _is_number(item):
+                    yield _metric_name(key), {"index": index}, item
+
+class Metrics:
+    def __init__(self, prefix: str = PREFIX):
+        self.prefix = prefix
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.sql_statements: Dict[Tuple[str, str], Histogram] = {}
+        self.sql_seconds: Dict[Tuple[str, str], Histogram] = {}
+        self.responses: Dict[Tuple[str, str, int], int] = {}
+        self.in_progress = 0
+        self._collectors: Dict[str, Callable[[], dict]] = {}
+        self._engines: List[AsyncEngine] = []
+    
+    def register(self, name: str, collect: Callable[[], dict]):
+        self._collectors[name] = collect
+    
+    def instrument_engine(self, target: AsyncEngine):
+        if any(instrumented is target for instrumented in self._engines):
+            return
+        event.listen(target.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target.sync_engine, "after_cursor_execute", _after_cursor_execute)
+        self._engines.append(target)
+    
+    def observe_request(self, method: str, route: str, status_code: int, seconds: float,
+                        request_stats: RequestStats):
+        key = (method, route)
+        if key not in self.latency:
+            self.latency[key] = Histogram(LATENCY_BUCKETS)
+            self.sql_statements[key] = Histogram(SQL_STATEMENT_BUCKETS)
+            self.sql_seconds[key] = Histogram(LATENCY_BUCKETS)
+        self.latency[key].observe(seconds)
+        self.sql_statements[key].observe(request_stats.sql_statements)
+        self.sql_seconds[key].observe(request_stats.sql_seconds)
+        response_key = (method, route, status_code)
+        self.responses[response_key] = self.responses.get(response_key, 0) + 1
+    
+    def _histogram_lines(self, name: str, help_text: str, histograms: Dict[Tuple[str, str], Histogram]) -> List[str]:
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (method, route), histogram in sorted(histograms.items()):
+            labels = {"method": method, "route": route}
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels({**labels, 'le': _number(float(bound))})} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return lines
+    
+    def render(self) -> str:
+        lines = self._histogram_lines(
+            f"{self.prefix}_http_request_duration_seconds", "Request latency by route template.", self.latency
+        )
+        lines += self._histogram_lines(
+            f"{self.prefix}_http_request_sql_statements", "SQL statements executed per request.", self.sql_statements
+        )
+        lines += self._histogram_lines(
+            f"{self.prefix}_http_request_sql_duration_seconds", "Time spent in SQL per request.", self.sql_seconds
+        )
+        
+        name = f"{self.prefix}_http_responses_total"
+        lines += [f"# HELP {name} Responses by route template and status.", f"# TYPE {name} counter"]
+        for (method, route, status_code), count in sorted(self.responses.items()):
+            lines.append(f"{name}{_labels({'method': method, 'route': route, 'status': status_code})} {count}")
+        name = f"{self.prefix}_http_requests_in_progress"
+        lines += [f"# TYPE {name} gauge", f"{name} {self.in_progress}"]
+        
+        for component, collect in self._collectors.items():
+            typed = set()
+            for key, labels, value in _gauge_samples(collect()):
+                name = f"{self.prefix}_{component}_{key}"
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+    
+    def stats(self) -> dict:
+        return {
+            "routes": len(self.latency),
+            "requests": sum(histogram.count for histogram in self.latency.values()),
+            "in_progress": self.in_progress,
+        }
+
+metrics = Metrics()
+
+def _route_template(scope: Scope, root_path: str) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Mounted apps such as /uploads only extend root_path.
+    return scope.get("root_path", "")[len(root_path):] or UNMATCHED_ROUTE
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, registry: Optional[Metrics] = None):
+        self.app = app
+        self.registry = registry or metrics
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        root_path = scope.get("root_path", "")
+        status_code = 500
+        
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        request_stats = RequestStats()
+        token = _request_stats.set(request_stats)
+        started = time.perf_counter()
+        self.registry.in_progress += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.registry.in_progress -= 1
+            _request_stats.reset(token)
+            self.registry.observe_request(
+                scope["method"], _route_template(scope, root_path), status_code,
+                time.perf_counter() - started, request_stats
+            )
+
+def setup_metrics():
+    metrics.instrument_engine(engine)
+    for replica in replica_router.engines:
+        metrics.instrument_engine(replica)
+    metrics.register("db_pool", lambda: pool_stats(engine))
+    metrics.register("db_replicas", replica_router.stats)
+    metrics.register("event_bus", event_bus.stats)
+    metrics.register("sse", sse_publisher.stats)
+    metrics.register("outbox", outbox_relay.stats)
+    metrics.register("menu_catalog", menu_catalog.stats)
+    metrics.register("token_cache", token_cache.stats)
+    metrics.register("password_hasher", password_hasher.stats)
+    metrics.register("image_store", image_store.stats)
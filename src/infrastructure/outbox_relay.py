@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from sqlalchemy import select, delete, func
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.infrastructure.event_bus import event_bus
+from src.models import OutboxEvent, event_delivery_seq
+
+logger = logging.getLogger(__name__)
+
+# Only one worker relays at a time so events leave the outbox in id order.
+OUTBOX_LOCK_KEY = 7_011_013
+
+class OutboxRelay:
+    def __init__(self, batch_size: int = settings.OUTBOX_BATCH_SIZE, poll_interval: float = settings.OUTBOX_POLL_SECONDS,
+                 session_factory=AsyncSessionLocal, bus=event_bus):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.session_factory = session_factory
+        self.bus = bus
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self.relayed = 0
+        self.failures = 0
+    
+    def notify(self):
+        self._wakeup.set()
+    
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+    
+    async def relay_once(self) -> int:
+        async with self.session_factory() as db:
+            if not await db.scalar(select(func.pg_try_advisory_xact_lock(OUTBOX_LOCK_KEY))):
+                return 0
+            result = await db.execute(select(OutboxEvent).order_by(OutboxEvent.id).limit(self.batch_size))
+            events = result.scalars().all()
+            if not events:
+                await db.commit()
+                return 0
+            result = await db.execute(select(event_delivery_seq.next_value()).select_from(func.generate_series(1, len(events))))
+            event_ids = sorted(result.scalars().all())
+            # Rows are deleted only after publishing, so a crash in between re-sends rather than loses them.
+            await self.bus.publish_many([
+                (event.event_type, {**event.payload, "event_id": event_id}) for event, event_id in zip(events, event_ids)
+            ])
+            await db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_([event.id for event in events])))
+            await db.commit()
+        self.relayed += len(events)
+        return len(events)
+    
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                relayed = await self.relay_once()
+            except Exception:
+                self.failures += 1
+                logger.exception("Outbox relay failed")
+                relayed = 0
+            if relayed == self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+    
+    def stats(self) -> dict:
+        return {"relayed": self.relayed, "failures": self.failures}
+
+outbox_relay = OutboxRelay()
@@ -1,29 +1,245 @@
 import asyncio
 import json
-from typing import AsyncGenerator
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional, Set, Tuple
+from sqlalchemy import text
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
 from src.infrastructure.event_bus import event_bus
 
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_FRAME = ": ping\n\n"
+EVENT_HORIZON_QUERY = text("SELECT CASE WHEN is_called THEN last_value ELSE last_value - 1 END FROM event_delivery_seq")
+
+class SSECapacityError(Exception):
+    pass
+
+class SSEClient:
+    def __init__(self, store_id: str, buffer_size: int, policy: str):
+        self.store_id = store_id
+        self.buffer_size = buffer_size
+        self.policy = policy
+        self.closed = False
+        self.dropped = 0
+        # Events up to the reconnect's Last-Event-ID may reach this worker after the client saw them elsewhere.
+        self.seen_through = 0
+        self.last_seen = time.monotonic()
+        self._frames: deque = deque()
+        self._ready = asyncio.Event()
+    
+    def offer(self, frame: str, coalesce_key=None, event_id: int = 0):
+        if self.closed or event_id and event_id <= self.seen_through:
+            return
+        if len(self._frames) >= self.buffer_size:
+            if self.policy == "disconnect":
+                self.close()
+                return
+            self.dropped += 1
+            if self.policy == "coalesce" and coalesce_key is not None:
+                for index, (key, _) in enumerate(self._frames):
+                    if key == coalesce_key:
+                        self._frames[index] = (key, frame)
+                        return
+            self._frames.popleft()
+        self._frames.append((coalesce_key, frame))
+        self._ready.set()
+    
+    async def next_frame(self, heartbeat: Optional[float] = None) -> Optional[str]:
+        # Called again only once the previous frame was written, so a stale last_seen means a stuck socket.
+        self.last_seen = time.monotonic()
+        while not self._frames:
+            if self.closed:
+                return None
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                return HEARTBEAT_FRAME
+        return self._frames.popleft()[1]
+    
+    def close(self):
+        self.closed = True
+        self._frames.clear()
+        self._ready.set()
+
+class SSEStream:
+    # An async iterator rather than a generator: closing or dropping a generator that never started skips
+    # its finally, and StreamingResponse never closes its iterator, so the slot is released here instead.
+    def __init__(self, publisher: "SSEPublisher", client: SSEClient, backlog: list):
+        self.publisher = publisher
+        self.client = client
+        self._backlog = deque(backlog)
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> str:
+        if self._backlog:
+            return self._backlog.popleft()
+        try:
+            frame = await self.client.next_frame(self.publisher.heartbeat)
+        except BaseException:
+            self.release()
+            raise
+        if frame is None:
+            self.release()
+            raise StopAsyncIteration
+        return frame
+    
+    async def aclose(self):
+        self.release()
+    
+    def release(self):
+        self.client.close()
+        self.publisher._remove(self.client)
+    
+    def __del__(self):
+        self.release()
+
 class SSEPublisher:
-    def __init__(self):
-        self._clients: dict = {}
+    def __init__(self, buffer_size: int = settings.SSE_CLIENT_BUFFER_SIZE,
+                 policy: str = settings.SSE_SLOW_CONSUMER_POLICY,
+                 replay_size: int = settings.SSE_REPLAY_BUFFER_SIZE,
+                 heartbeat: float = settings.SSE_HEARTBEAT_SECONDS,
+                 idle_timeout: float = settings.SSE_IDLE_TIMEOUT_SECONDS,
+                 max_clients_per_store: int = settings.SSE_MAX_CLIENTS_PER_STORE,
+                 max_clients: int = settings.SSE_MAX_CLIENTS):
+        self.buffer_size = buffer_size
+        self.policy = policy
+        self.replay_size = replay_size
+        self.heartbeat = heartbeat
+        self.idle_timeout = idle_timeout
+        self.max_clients_per_store = max_clients_per_store
+        self.max_clients = max_clients
+        # Frame ids are the relay's delivery ids, shared by every worker. This worker has received every
+        # event after horizon, and the replay buffer of a store still holds every event after its evicted id.
+        self.horizon: Optional[int] = None
+        self.latest_id: Optional[int] = None
+        self._clients: Dict[str, Set[SSEClient]] = defaultdict(set)
+        self._replay: Dict[str, Deque[Tuple[int, str]]] = {}
+        self._evicted: Dict[str, int] = {}
+        self.open_streams = 0
+        self.rejected_clients = 0
+        self.reaped_clients = 0
+        self.replayed_events = 0
+        self.resyncs = 0
+        self.dropped_events = 0
+        self.disconnected_clients = 0
     
-    async def stream(self, store_id: str) -> AsyncGenerator[str, None]:
-        queue = asyncio.Queue()
-        client_id = id(queue)
-        self._clients[client_id] = {"store_id": store_id, "queue": queue}
-        
+    def stream(self, store_id: str, last_event_id: Optional[str] = None) -> "SSEStream":
+        if self.client_count(store_id) >= self.max_clients_per_store:
+            self._reap(store_id)
+        if self.open_streams >= self.max_clients:
+            for other_store_id in list(self._clients):
+                self._reap(other_store_id)
+        if self.client_count(store_id) >= self.max_clients_per_store or self.open_streams >= self.max_clients:
+            self.rejected_clients += 1
+            raise SSECapacityError(store_id)
+        # The slot is taken in the same step as the check, so concurrent connects can't all pass it.
+        # Replay is computed here too, so no event slips between it and registration.
+        client = SSEClient(store_id, self.buffer_size, self.policy)
+        self._clients[store_id].add(client)
+        self.open_streams += 1
+        backlog = self._backlog(client, last_event_id) if last_event_id else []
+        return SSEStream(self, client, backlog)
+    
+    def _remove(self, client: SSEClient):
+        clients = self._clients.get(client.store_id)
+        if clients is None or client not in clients:
+            return
+        clients.discard(client)
+        self.open_streams -= 1
+        if not clients:
+            del self._clients[client.store_id]
+    
+    def _reap(self, store_id: str):
+        deadline = time.monotonic() - self.idle_timeout
+        for client in list(self._clients.get(store_id, ())):
+            if client.closed or client.last_seen < deadline:
+                client.close()
+                self._remove(client)
+                self.reaped_clients += 1
+    
+    def _backlog(self, client: SSEClient, last_event_id: str) -> list:
+        store_id = client.store_id
+        if last_event_id.isdigit() and self.horizon is not None:
+            last = int(last_event_id)
+            if last >= self.horizon and last >= self._evicted.get(store_id, 0):
+                client.seen_through = last
+                frames = [frame for event_id, frame in sorted(self._replay.get(store_id, ())) if event_id > last]
+                self.replayed_events += len(frames)
+                return frames
+        self.resyncs += 1
+        if self.latest_id is None:
+            return ["event: resync\ndata: {}\n\n"]
+        client.seen_through = self.latest_id
+        return [f"id: {self.latest_id}\nevent: resync\ndata: {{}}\n\n"]
+    
+    async def load_horizon(self, transport=None, session_factory=AsyncSessionLocal):
+        # Read only once the transport listens, so every event numbered after it reaches this worker.
         try:
-            while True:
-                event = await queue.get()
-                yield f"data: {json.dumps(event)}\n\n"
-        finally:
-            del self._clients[client_id]
+            await asyncio.wait_for((transport or event_bus.transport).wait_listening(), 10)
+            async with session_factory() as db:
+                horizon = await db.scalar(EVENT_HORIZON_QUERY)
+        except Exception:
+            logger.exception("Could not read the event delivery sequence")
+            return
+        self.horizon = horizon if self.horizon is None else min(self.horizon, horizon)
+        self.latest_id = max(self.latest_id or 0, horizon)
     
     async def broadcast(self, event: dict):
         store_id = event.get("store_id")
-        for client in self._clients.values():
-            if client["store_id"] == store_id:
-                await client["queue"].put(event)
+        event_id = event["event_id"]
+        if self.horizon is None:
+            self.horizon = event_id - 1
+        self.latest_id = max(self.latest_id or 0, event_id)
+        frame = f"id: {event_id}\ndata: {json.dumps(event)}\n\n"
+        replay = self._replay.get(store_id)
+        if replay is None:
+            replay = self._replay[store_id] = deque(maxlen=self.replay_size)
+        if len(replay) == replay.maxlen:
+            self._evicted[store_id] = max(self._evicted.get(store_id, 0), replay[0][0])
+        replay.append((event_id, frame))
+        
+        clients = self._clients.get(store_id)
+        if not clients:
+            return
+        coalesce_key = None
+        if event.get("event_type") == "OrderStatusChanged":
+            coalesce_key = event.get("order_id")
+        deadline = time.monotonic() - self.idle_timeout
+        stale = False
+        for client in clients:
+            if client.closed:
+                continue
+            if client.last_seen < deadline:
+                stale = True
+                continue
+            dropped = client.dropped
+            client.offer(frame, coalesce_key, event_id)
+            self.dropped_events += client.dropped - dropped
+            if client.closed:
+                self.disconnected_clients += 1
+        if stale:
+            self._reap(store_id)
+    
+    def client_count(self, store_id: str) -> int:
+        return len(self._clients.get(store_id, ()))
+    
+    def stats(self) -> dict:
+        return {
+            "open_streams": self.open_streams,
+            "open_streams_by_store": {store_id: len(clients) for store_id, clients in self._clients.items()},
+            "rejected_clients": self.rejected_clients,
+            "reaped_clients": self.reaped_clients,
+            "disconnected_clients": self.disconnected_clients,
+            "dropped_events": self.dropped_events,
+            "replayed_events": self.replayed_events,
+            "resyncs": self.resyncs,
+        }
 
 sse_publisher = SSEPublisher()
 
@@ -33,3 +249,4 @@ async def setup_sse():
     
     event_bus.subscribe("OrderCreated", handle_event)
     event_bus.subscribe("OrderStatusChanged", handle_event)
+    event_bus.subscribe("OrderStatusesChanged", handle_event)
@@ -0,0 +1,43 @@
+import os
+from typing import Optional
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+from src.core.config import settings
+from src.infrastructure.image_store import IMMUTABLE_NAME
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+class UploadFiles(StaticFiles):
+    def __init__(self, *args, accel_redirect_prefix: Optional[str] = settings.UPLOADS_ACCEL_REDIRECT_PREFIX, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.accel_redirect_prefix = accel_redirect_prefix
+    
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        name = os.path.basename(path)
+        if IMMUTABLE_NAME.match(name) and not name.endswith(".webp") and "image/webp" in Headers(scope=scope).get("accept", ""):
+            try:
+                return await super().get_response(f"{os.path.splitext(path)[0]}.webp", scope)
+            except HTTPException:
+                pass
+        return await super().get_response(path, scope)
+    
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        name = os.path.basename(full_path)
+        if not IMMUTABLE_NAME.match(name):
+            return super().file_response(full_path, stat_result, scope, status_code)
+        
+        # The name is the content hash, so it doubles as a strong validator.
+        headers = {"cache-control": IMMUTABLE_CACHE_CONTROL, "etag": f'"{name}"'}
+        if not name.endswith(".gif"):
+            headers["vary"] = "Accept"
+        if self.is_not_modified(Headers(headers), Headers(scope=scope)):
+            return NotModifiedResponse(Headers(headers))
+        if self.accel_redirect_prefix:
+            # Let the reverse proxy sendfile() the bytes instead of streaming them through the worker.
+            relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+            headers["x-accel-redirect"] = f"{self.accel_redirect_prefix.rstrip('/')}/{relative}"
+            return Response(status_code=status_code, headers=headers, media_type=None)
+        return FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
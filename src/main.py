@@ -1,12 +1,18 @@
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from src.api.customer import auth as customer_auth, menus as customer_menus, orders as customer_orders
-from src.api.admin import auth as admin_auth, orders as admin_orders, sse as admin_sse, menus as admin_menus, tables as admin_tables
+from src.api.admin import auth as admin_auth, orders as admin_orders, sse as admin_sse, menus as admin_menus, tables as admin_tables, order_history as admin_order_history, reports as admin_reports
 from src.api.superadmin import auth as superadmin_auth, admins as superadmin_admins
-from src.infrastructure.sse_publisher import setup_sse
+from src.infrastructure.event_bus import event_bus
+from src.infrastructure.sse_publisher import setup_sse, sse_publisher
+from src.infrastructure.cache_events import load_revocations, setup_cache_events
+from src.infrastructure.outbox_relay import outbox_relay
+from src.infrastructure.upload_files import UploadFiles
+from src.infrastructure.metrics import CONTENT_TYPE, MetricsMiddleware, metrics, setup_metrics
+from src.core.database import READ_AFTER_HEADER, replica_router
 
-app = FastAPI(title="TableOrder API", version="1.0.0")
+app = FastAPI(title="TableOrder API", version="1.0.0", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,7 +20,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", READ_AFTER_HEADER],
 )
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(customer_auth.router)
 app.include_router(customer_menus.router)
@@ -24,19 +32,38 @@ app.include_router(admin_orders.router)
 app.include_router(admin_sse.router)
 app.include_router(admin_menus.router)
 app.include_router(admin_tables.router)
+app.include_router(admin_order_history.router)
+app.include_router(admin_reports.router)
 app.include_router(superadmin_auth.router)
 app.include_router(superadmin_admins.router)
 
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", UploadFiles(directory="uploads"), name="uploads")
 
 @app.on_event("startup")
 async def startup():
     await setup_sse()
+    await setup_cache_events()
+    setup_metrics()
+    event_bus.start()
+    await load_revocations()
+    await sse_publisher.load_horizon()
+    outbox_relay.start()
+    replica_router.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await replica_router.stop()
+    await outbox_relay.stop()
+    await event_bus.stop()
 
 @app.get("/")
 async def root():
     return {"message": "TableOrder API is running"}
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -8,6 +8,9 @@ from src.models.order import Order, OrderStatus
 from src.models.order_item import OrderItem
 from src.models.order_history import OrderHistory
 from src.models.order_history_item import OrderHistoryItem
+from src.models.outbox_event import OutboxEvent, event_delivery_seq
+from src.models.daily_sales import DailySales
+from src.models.daily_menu_sales import DailyMenuSales
 
 __all__ = [
     "Store",
@@ -22,4 +25,8 @@ __all__ = [
     "OrderItem",
     "OrderHistory",
     "OrderHistoryItem",
+    "OutboxEvent",
+    "event_delivery_seq",
+    "DailySales",
+    "DailyMenuSales",
 ]
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Numeric
+from src.core.database import Base
+
+class DailyMenuSales(Base):
+    __tablename__ = "daily_menu_sales"
+    
+    store_id = Column(String, ForeignKey("stores.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    # No FK: the rollup outlives the menu it counts.
+    menu_id = Column(Integer, primary_key=True)
+    menu_name = Column(String, nullable=False)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(12, 2), nullable=False, default=0)
+    order_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Numeric
+from src.core.database import Base
+
+class DailySales(Base):
+    __tablename__ = "daily_sales"
+    
+    store_id = Column(String, ForeignKey("stores.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(12, 2), nullable=False, default=0)
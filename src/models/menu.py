@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, CheckConstraint, Numeric
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, CheckConstraint, Numeric, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.core.database import Base
@@ -22,4 +22,6 @@ class Menu(Base):
     
     __table_args__ = (
         CheckConstraint("price > 0", name="menu_price_positive"),
+        UniqueConstraint("category_id", "name", name="uq_menu_category_name"),
+        Index("ix_menus_category_id_display_order", "category_id", "display_order"),
     )
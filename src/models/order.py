@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, CheckConstraint, Numeric, Enum
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, CheckConstraint, Numeric, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -26,4 +26,5 @@ class Order(Base):
     
     __table_args__ = (
         CheckConstraint("total_price >= 0", name="order_total_price_non_negative"),
+        Index("ix_orders_table_session_id_created_at", "table_session_id", "created_at"),
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, CheckConstraint, Numeric, Enum
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, CheckConstraint, Numeric, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.models.order import OrderStatus
@@ -20,4 +20,5 @@ class OrderHistory(Base):
     
     __table_args__ = (
         CheckConstraint("total_price >= 0", name="order_history_total_price_non_negative"),
+        Index("ix_order_histories_table_session_id_archived_at", "table_session_id", "archived_at"),
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, CheckConstraint, Numeric
+from sqlalchemy import Column, Integer, String, ForeignKey, CheckConstraint, Numeric, Index
 from sqlalchemy.orm import relationship
 from src.core.database import Base
 
@@ -18,4 +18,6 @@ class OrderHistoryItem(Base):
     __table_args__ = (
         CheckConstraint("quantity > 0", name="order_history_item_quantity_positive"),
         CheckConstraint("unit_price >= 0", name="order_history_item_unit_price_non_negative"),
+        Index("ix_order_history_items_order_history_id", "order_history_id"),
+        Index("ix_order_history_items_menu_id", "menu_id"),
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, CheckConstraint, Numeric
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, CheckConstraint, Numeric, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.core.database import Base
@@ -21,4 +21,6 @@ class OrderItem(Base):
     __table_args__ = (
         CheckConstraint("quantity > 0", name="order_item_quantity_positive"),
         CheckConstraint("unit_price >= 0", name="order_item_unit_price_non_negative"),
+        Index("ix_order_items_order_id", "order_id"),
+        Index("ix_order_items_menu_id", "menu_id"),
     )
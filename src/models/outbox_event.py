@@ -0,0 +1,14 @@
+from sqlalchemy import Column, BigInteger, String, DateTime, JSON, Sequence
+from datetime import datetime
+from src.core.database import Base
+
+# Numbered when relayed rather than when written, so ids follow publish order across all workers.
+event_delivery_seq = Sequence("event_delivery_seq", metadata=Base.metadata)
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    event_type = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
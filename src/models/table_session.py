@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Boolean, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, Boolean, DateTime, ForeignKey, CheckConstraint, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.core.database import Base
@@ -21,4 +21,6 @@ class TableSession(Base):
     __table_args__ = (
         CheckConstraint("ended_at IS NULL OR ended_at >= started_at", name="session_end_after_start"),
         CheckConstraint("is_active = false OR ended_at IS NULL", name="inactive_session_has_end"),
+        Index("ix_table_sessions_table_id_is_active", "table_id", "is_active"),
+        Index("uq_table_sessions_active_table", "table_id", unique=True, postgresql_where=text("is_active")),
     )
@@ -0,0 +1,33 @@
+from src.schemas.common import SuccessResponse
+from src.schemas.auth import TableLoginResponse, AdminLoginResponse
+from src.schemas.admin import AdminResponse
+from src.schemas.menu import MenuResponse, MenuImportError, MenuImportResponse
+from src.schemas.order import (
+    OrderItemResponse, OrderSummaryResponse, OrderResponse, BulkStatusUpdateResponse, LiveOrderResponse, LiveOrdersResponse
+)
+from src.schemas.order_history import OrderHistoryItemResponse, OrderHistoryResponse, OrderHistoryPageResponse
+from src.schemas.table_session import TableSessionResponse, CompleteSessionResponse
+from src.schemas.report import DailySalesResponse, MenuSalesResponse
+
+__all__ = [
+    "SuccessResponse",
+    "TableLoginResponse",
+    "AdminLoginResponse",
+    "AdminResponse",
+    "MenuResponse",
+    "MenuImportError",
+    "MenuImportResponse",
+    "OrderItemResponse",
+    "OrderSummaryResponse",
+    "OrderResponse",
+    "BulkStatusUpdateResponse",
+    "LiveOrderResponse",
+    "LiveOrdersResponse",
+    "OrderHistoryItemResponse",
+    "OrderHistoryResponse",
+    "OrderHistoryPageResponse",
+    "TableSessionResponse",
+    "CompleteSessionResponse",
+    "DailySalesResponse",
+    "MenuSalesResponse",
+]
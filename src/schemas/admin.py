@@ -0,0 +1,14 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional
+
+class AdminResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    store_id: Optional[str]
+    username: str
+    role: str
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+class TableLoginResponse(BaseModel):
+    token: str
+    session_id: int
+    table_id: int
+
+class AdminLoginResponse(BaseModel):
+    token: str
+    admin_id: int
+    role: str
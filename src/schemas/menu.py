@@ -0,0 +1,32 @@
+from pydantic import BaseModel, ConfigDict, computed_field
+from datetime import datetime
+from typing import Dict, List, Optional
+from src.infrastructure.image_store import image_store
+
+class MenuResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    category_id: int
+    name: str
+    description: Optional[str]
+    price: float
+    image_path: Optional[str]
+    is_available: bool
+    display_order: int
+    created_at: datetime
+    updated_at: datetime
+    
+    @computed_field
+    @property
+    def thumbnail_paths(self) -> Dict[str, str]:
+        return image_store.thumbnail_paths(self.image_path)
+
+class MenuImportError(BaseModel):
+    row: int
+    detail: str
+
+class MenuImportResponse(BaseModel):
+    created: int
+    updated: int
+    errors: List[MenuImportError]
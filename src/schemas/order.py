@@ -0,0 +1,39 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import List, Optional
+from src.models import OrderStatus
+
+class OrderItemResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    menu_id: int
+    menu_name: str
+    quantity: int
+    unit_price: float
+    subtotal: float
+
+class OrderSummaryResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    table_session_id: int
+    status: OrderStatus
+    total_price: float
+    created_at: datetime
+    updated_at: datetime
+
+class OrderResponse(OrderSummaryResponse):
+    order_items: List[OrderItemResponse]
+
+class BulkStatusUpdateResponse(BaseModel):
+    orders: List[OrderSummaryResponse]
+    skipped_order_ids: List[int]
+
+class LiveOrderResponse(OrderResponse):
+    table_id: int
+
+class LiveOrdersResponse(BaseModel):
+    cursor: Optional[str]
+    order_ids: List[int]
+    orders: List[LiveOrderResponse]
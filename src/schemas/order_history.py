@@ -0,0 +1,30 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import List, Optional
+from src.models import OrderStatus
+
+class OrderHistoryItemResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    menu_id: Optional[int]
+    menu_name: str
+    quantity: int
+    unit_price: float
+    subtotal: float
+
+class OrderHistoryResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    table_session_id: int
+    original_order_id: int
+    status: OrderStatus
+    total_price: float
+    order_created_at: datetime
+    archived_at: datetime
+    order_history_items: List[OrderHistoryItemResponse]
+
+class OrderHistoryPageResponse(BaseModel):
+    items: List[OrderHistoryResponse]
+    next_cursor: Optional[str] = None
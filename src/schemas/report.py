@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from datetime import date
+
+class DailySalesResponse(BaseModel):
+    day: date
+    order_count: int
+    revenue: float
+
+class MenuSalesResponse(BaseModel):
+    menu_id: int
+    menu_name: str
+    quantity: int
+    revenue: float
+    order_count: int
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional
+
+class TableSessionResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    table_id: int
+    started_at: datetime
+    ended_at: Optional[datetime]
+    is_active: bool
+
+class CompleteSessionResponse(BaseModel):
+    session: TableSessionResponse
+    archived_orders_count: int
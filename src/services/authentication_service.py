@@ -1,8 +1,9 @@
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from src.models import Table, TableSession, Admin
-from src.core.security import verify_password, create_jwt_token
+from src.core.security import password_hasher, create_jwt_token
 from fastapi import HTTPException, status
 
 class AuthenticationService:
@@ -12,22 +13,30 @@ class AuthenticationService:
             select(Table).where(Table.store_id == store_id, Table.table_number == table_number)
         )
         table = result.scalar_one_or_none()
-        if not table or not verify_password(password, table.password_hash):
+        if not table or not await password_hasher.verify(password, table.password_hash):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="INVALID_CREDENTIALS")
         
-        result = await db.execute(
-            select(TableSession).where(TableSession.table_id == table.id, TableSession.is_active == True)
-        )
+        table_id = table.id
+        active_session = select(TableSession).where(TableSession.table_id == table_id, TableSession.is_active == True)
+        result = await db.execute(active_session)
         session = result.scalar_one_or_none()
         
         if not session:
-            session = TableSession(table_id=table.id, started_at=datetime.utcnow(), is_active=True)
+            session = TableSession(table_id=table_id, started_at=datetime.utcnow(), is_active=True)
             db.add(session)
-            await db.commit()
-            await db.refresh(session)
+            try:
+                await db.commit()
+                await db.refresh(session)
+            except IntegrityError as e:
+                await db.rollback()
+                if "uq_table_sessions_active_table" not in str(e.orig):
+                    raise
+                # A concurrent login opened the session first.
+                result = await db.execute(active_session)
+                session = result.scalar_one()
         
-        token = create_jwt_token({"table_id": table.id, "session_id": session.id, "role": "table", "store_id": str(store_id)})
-        return {"token": token, "session_id": session.id, "table_id": table.id}
+        token = create_jwt_token({"table_id": table_id, "session_id": session.id, "role": "table", "store_id": str(store_id)})
+        return {"token": token, "session_id": session.id, "table_id": table_id}
     
     @staticmethod
     async def authenticate_admin(username: str, password: str, store_id: str, db: AsyncSession):
@@ -35,7 +44,7 @@ class AuthenticationService:
             select(Admin).where(Admin.username == username, Admin.store_id == store_id, Admin.role == "store_admin")
         )
         admin = result.scalar_one_or_none()
-        if not admin or not admin.is_active or not verify_password(password, admin.password_hash):
+        if not admin or not admin.is_active or not await password_hasher.verify(password, admin.password_hash):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="INVALID_CREDENTIALS")
         
         token = create_jwt_token({"admin_id": admin.id, "store_id": str(store_id), "role": "store_admin"})
@@ -47,7 +56,7 @@ class AuthenticationService:
             select(Admin).where(Admin.username == username, Admin.role == "super_admin")
         )
         admin = result.scalar_one_or_none()
-        if not admin or not admin.is_active or not verify_password(password, admin.password_hash):
+        if not admin or not admin.is_active or not await password_hasher.verify(password, admin.password_hash):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="INVALID_CREDENTIALS")
         
         token = create_jwt_token({"admin_id": admin.id, "role": "super_admin"})
@@ -1,7 +1,9 @@
-from sqlalchemy import select
+from sqlalchemy import select, insert, delete, literal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from src.models import TableSession, Order, OrderHistory, OrderHistoryItem
+from src.models import TableSession, Order, OrderItem, OrderHistory, OrderHistoryItem
+from src.core.token_cache import token_cache
+from src.infrastructure.event_bus import event_bus
+from src.services.sales_rollup_service import SalesRollupService
 from fastapi import HTTPException, status
 from datetime import datetime
 
@@ -10,44 +12,44 @@ class CompleteTableSessionService:
     async def complete_session(table_id: int, store_id: str, db: AsyncSession):
         result = await db.execute(
             select(TableSession).where(TableSession.table_id == table_id, TableSession.is_active == True)
+            .with_for_update()
         )
         session = result.scalar_one_or_none()
         if not session:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="SESSION_NOT_FOUND")
         
+        now = datetime.utcnow()
         result = await db.execute(
-            select(Order).where(Order.table_session_id == session.id).options(selectinload(Order.order_items))
+            insert(OrderHistory).from_select(
+                ["table_session_id", "original_order_id", "status", "total_price", "order_created_at", "archived_at"],
+                select(Order.table_session_id, Order.id, Order.status, Order.total_price, Order.created_at, literal(now))
+                .where(Order.table_session_id == session.id)
+            ).returning(OrderHistory.id)
         )
-        orders = result.scalars().all()
+        archived_orders_count = len(result.all())
         
-        for order in orders:
-            history = OrderHistory(
-                table_session_id=session.id,
-                original_order_id=order.id,
-                status=order.status,
-                total_price=order.total_price,
-                order_created_at=order.created_at,
-                archived_at=datetime.utcnow()
+        await db.execute(
+            insert(OrderHistoryItem).from_select(
+                ["order_history_id", "menu_id", "menu_name", "quantity", "unit_price", "subtotal"],
+                select(OrderHistory.id, OrderItem.menu_id, OrderItem.menu_name, OrderItem.quantity,
+                       OrderItem.unit_price, OrderItem.subtotal)
+                .join(OrderHistory, OrderHistory.original_order_id == OrderItem.order_id)
+                .where(OrderHistory.table_session_id == session.id)
+                .order_by(OrderItem.id)
             )
-            db.add(history)
-            await db.flush()
-            
-            for item in order.order_items:
-                history_item = OrderHistoryItem(
-                    order_history_id=history.id,
-                    menu_id=item.menu_id,
-                    menu_name=item.menu_name,
-                    quantity=item.quantity,
-                    unit_price=item.unit_price,
-                    subtotal=item.subtotal
-                )
-                db.add(history_item)
-            
-            await db.delete(order)
+        )
+        await SalesRollupService.apply_session(session.id, db)
+        
+        # order_items go with their orders through ON DELETE CASCADE.
+        await db.execute(
+            delete(Order).where(Order.table_session_id == session.id)
+            .execution_options(synchronize_session=False)
+        )
         
         session.is_active = False
-        session.ended_at = datetime.utcnow()
+        session.ended_at = now
         await db.commit()
-        await db.refresh(session)
+        token_cache.revoke("session_id", session.id)
+        await event_bus.publish("TokenRevoked", {"subject": "session_id", "subject_id": session.id})
         
-        return {"session": session, "archived_orders_count": len(orders)}
+        return {"session": session, "archived_orders_count": archived_orders_count}
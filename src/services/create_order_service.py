@@ -1,56 +1,65 @@
-from sqlalchemy import select
+from sqlalchemy import select, insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.models import Order, OrderItem, TableSession, Menu
-from src.infrastructure.event_bus import event_bus
+from src.models import Order, OrderItem, TableSession, Table, Menu, MenuCategory, OutboxEvent
+from src.infrastructure.outbox_relay import outbox_relay
 from fastapi import HTTPException, status
 from datetime import datetime
 
 class CreateOrderService:
     @staticmethod
     async def create_order(session_id: int, items: list, db: AsyncSession):
-        result = await db.execute(select(TableSession).where(TableSession.id == session_id, TableSession.is_active == True))
-        session = result.scalar_one_or_none()
-        if not session:
+        result = await db.execute(
+            select(TableSession, Table.store_id).join(Table)
+            .where(TableSession.id == session_id, TableSession.is_active == True)
+        )
+        row = result.one_or_none()
+        if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="SESSION_NOT_FOUND")
+        session, store_id = row
         
         if not items:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="EMPTY_ORDER")
         
-        order = Order(table_session_id=session_id, status="pending", total_price=0)
-        db.add(order)
-        await db.flush()
+        menu_ids = {item["menu_id"] for item in items}
+        result = await db.execute(
+            select(Menu).join(MenuCategory)
+            .where(Menu.id.in_(menu_ids), Menu.is_available == True, MenuCategory.store_id == store_id)
+        )
+        menus = {menu.id: menu for menu in result.scalars()}
+        if len(menus) != len(menu_ids):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="MENU_NOT_AVAILABLE")
         
         total = 0
+        order_items = []
         for item in items:
-            result = await db.execute(select(Menu).where(Menu.id == item["menu_id"], Menu.is_available == True))
-            menu = result.scalar_one_or_none()
-            if not menu:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="MENU_NOT_AVAILABLE")
-            
+            menu = menus[item["menu_id"]]
             subtotal = menu.price * item["quantity"]
-            order_item = OrderItem(
-                order_id=order.id,
-                menu_id=menu.id,
-                menu_name=menu.name,
-                quantity=item["quantity"],
-                unit_price=menu.price,
-                subtotal=subtotal
-            )
-            db.add(order_item)
+            order_items.append({
+                "menu_id": menu.id,
+                "menu_name": menu.name,
+                "quantity": item["quantity"],
+                "unit_price": menu.price,
+                "subtotal": subtotal
+            })
             total += subtotal
         
-        order.total_price = total
-        await db.commit()
-        await db.refresh(order)
+        order = Order(table_session_id=session_id, status="pending", total_price=total)
+        db.add(order)
+        await db.flush()
         
-        await event_bus.publish("OrderCreated", {
+        for order_item in order_items:
+            order_item["order_id"] = order.id
+        await db.execute(insert(OrderItem), order_items)
+        db.add(OutboxEvent(event_type="OrderCreated", payload={
             "event_type": "OrderCreated",
             "order_id": order.id,
             "table_id": session.table_id,
-            "store_id": str(session.table.store_id),
+            "store_id": str(store_id),
             "total_price": float(order.total_price),
             "status": order.status,
             "created_at": order.created_at.isoformat()
-        })
+        }))
+        await db.commit()
+        outbox_relay.notify()
         
         return order
@@ -1,7 +1,9 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.models import Admin, Store
-from src.core.security import hash_password
+from src.core.security import password_hasher
+from src.core.token_cache import token_cache
+from src.infrastructure.event_bus import event_bus
 from fastapi import HTTPException, status
 
 class ManageAdminService:
@@ -16,7 +18,7 @@ class ManageAdminService:
         
         admin = Admin(
             username=username,
-            password_hash=hash_password(password),
+            password_hash=await password_hasher.hash(password),
             role=role,
             store_id=store_id,
             is_active=True
@@ -51,4 +53,6 @@ class ManageAdminService:
         admin.is_active = False
         await db.commit()
         await db.refresh(admin)
+        token_cache.revoke("admin_id", admin.id)
+        await event_bus.publish("TokenRevoked", {"subject": "admin_id", "subject_id": admin.id})
         return admin
@@ -1,10 +1,67 @@
-from sqlalchemy import select
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from contextlib import asynccontextmanager
+from itertools import islice
+from typing import Iterator, List, Optional
+from pydantic import BaseModel, Field, ValidationError, model_validator
+from sqlalchemy import select, func, insert, update, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from starlette.concurrency import run_in_threadpool
+from src.core.config import settings
 from src.models import Menu, MenuCategory
+from src.infrastructure.menu_catalog import menu_catalog, CatalogEntry
+from src.infrastructure.event_bus import event_bus
+from src.infrastructure.image_store import image_store
+from src.schemas import MenuResponse
 from fastapi import HTTPException, status
-import uuid
-import os
+
+MAX_IMPORT_ERRORS = 100
+IMAGE_LOCK_CLASS = 7_011_017
+
+class MenuImportRow(BaseModel):
+    category_id: Optional[int] = None
+    category: Optional[str] = Field(None, min_length=1)
+    name: str = Field(min_length=1)
+    price: Decimal = Field(gt=0, max_digits=10, decimal_places=2)
+    description: Optional[str] = None
+    is_available: bool = True
+    display_order: int = 0
+    
+    @model_validator(mode="after")
+    def check_category(self):
+        if self.category_id is None and self.category is None:
+            raise ValueError("category_id or category is required")
+        return self
+
+def _import_rows(upload, fmt: str) -> Iterator[dict]:
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for row in csv.DictReader(text):
+            # Empty cells mean "not given", so model defaults apply.
+            yield {key: value for key, value in row.items() if key and value not in ("", None)}
+    else:
+        for line in text:
+            if line.strip():
+                yield json.loads(line)
+
+@asynccontextmanager
+async def _unique_menu_names(db: AsyncSession):
+    try:
+        yield
+    except IntegrityError as e:
+        await db.rollback()
+        if "uq_menu_category_name" in str(e.orig):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="MENU_ALREADY_EXISTS")
+        raise
+
+def _serialize_menu(menu: Menu) -> dict:
+    return MenuResponse.model_validate(menu).model_dump(mode="json")
 
 class MenuService:
     @staticmethod
@@ -16,6 +73,15 @@ class MenuService:
         result = await db.execute(query)
         return result.scalars().all()
     
+    @staticmethod
+    async def get_menu_catalog(category_id: int | None, store_id: str, db: AsyncSession) -> CatalogEntry:
+        async def load():
+            menus = await MenuService.get_menus_by_category(None, store_id, db)
+            return [_serialize_menu(menu) for menu in menus]
+        
+        snapshot = await menu_catalog.get(store_id, load)
+        return snapshot.get(category_id or None)
+    
     @staticmethod
     async def get_menu_by_id(menu_id: int, store_id: str, db: AsyncSession):
         result = await db.execute(
@@ -35,33 +101,209 @@ class MenuService:
         
         image_path = None
         if image_file:
-            ext = image_file.filename.split('.')[-1]
-            filename = f"{uuid.uuid4()}.{ext}"
-            image_path = f"/uploads/menus/{filename}"
-            with open(f"uploads/menus/{filename}", "wb") as f:
-                f.write(await image_file.read())
+            image_path = await image_store.save(image_file, lambda path: MenuService._lock_image(path, db))
         
         menu = Menu(category_id=category_id, name=name, description=description, price=price, image_path=image_path)
         db.add(menu)
-        await db.commit()
+        await MenuService._commit_menu(image_path, db)
         await db.refresh(menu)
+        await MenuService._catalog_changed(store_id)
         return menu
     
     @staticmethod
-    async def update_menu(menu_id: int, store_id: str, db: AsyncSession, **kwargs):
+    async def update_menu(menu_id: int, store_id: str, db: AsyncSession, image_file = None, **kwargs):
         menu = await MenuService.get_menu_by_id(menu_id, store_id, db)
         for key, value in kwargs.items():
             if value is not None and hasattr(menu, key):
                 setattr(menu, key, value)
-        await db.commit()
+        old_image_path = new_image_path = menu.image_path
+        if image_file:
+            new_image_path = menu.image_path = await image_store.save(image_file, lambda path: MenuService._lock_image(path, db))
+        await MenuService._commit_menu(new_image_path if new_image_path != old_image_path else None, db)
         await db.refresh(menu)
+        if old_image_path != menu.image_path:
+            await MenuService._release_image(old_image_path, db)
+        await MenuService._catalog_changed(store_id)
         return menu
     
     @staticmethod
     async def delete_menu(menu_id: int, store_id: str, db: AsyncSession):
         menu = await MenuService.get_menu_by_id(menu_id, store_id, db)
-        if menu.image_path and os.path.exists(f".{menu.image_path}"):
-            os.remove(f".{menu.image_path}")
         await db.delete(menu)
         await db.commit()
+        await MenuService._release_image(menu.image_path, db)
+        await MenuService._catalog_changed(store_id)
+        return True
+    
+    @staticmethod
+    async def _commit_menu(new_image_path: str | None, db: AsyncSession):
+        # The image is stored before the commit; if the menu never lands, nothing may point at it.
+        try:
+            async with _unique_menu_names(db):
+                await db.commit()
+        except Exception:
+            await db.rollback()
+            await MenuService._release_image(new_image_path, db)
+            raise
+    
+    @staticmethod
+    async def _lock_image(image_path: str, db: AsyncSession):
+        # Held until the transaction ends, so a file being reused can't be removed before its menu commits.
+        await db.execute(select(func.pg_advisory_xact_lock(IMAGE_LOCK_CLASS, func.hashtext(image_path))))
+    
+    @staticmethod
+    async def _release_image(image_path: str | None, db: AsyncSession):
+        # Images are shared by content hash; only the last menu using one removes the file.
+        if not image_path:
+            return
+        await MenuService._lock_image(image_path, db)
+        in_use = await db.scalar(select(func.count()).select_from(Menu).where(Menu.image_path == image_path))
+        if not in_use:
+            await image_store.delete(image_path)
+        await db.commit()
+    
+    @staticmethod
+    async def _catalog_changed(store_id: str):
+        menu_catalog.invalidate(store_id)
+        await event_bus.publish("MenuCatalogChanged", {"store_id": store_id})
+    
+    @staticmethod
+    async def _check_categories(category_ids: set, store_id: str, db: AsyncSession):
+        if not category_ids:
+            return
+        found = await db.scalars(
+            select(MenuCategory.id).where(MenuCategory.id.in_(category_ids), MenuCategory.store_id == store_id)
+        )
+        if set(found) != category_ids:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CATEGORY_NOT_FOUND")
+    
+    @staticmethod
+    async def _check_menus(menu_ids: set, store_id: str, db: AsyncSession):
+        found = await db.scalars(
+            select(Menu.id).join(MenuCategory).where(Menu.id.in_(menu_ids), MenuCategory.store_id == store_id)
+        )
+        if set(found) != menu_ids:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="MENU_NOT_FOUND")
+    
+    @staticmethod
+    async def create_menus(menus: List[dict], store_id: str, db: AsyncSession):
+        await MenuService._check_categories({menu["category_id"] for menu in menus}, store_id, db)
+        async with _unique_menu_names(db):
+            result = await db.scalars(insert(Menu).returning(Menu, sort_by_parameter_order=True), menus)
+            created = result.all()
+            await db.commit()
+        await MenuService._catalog_changed(store_id)
+        return created
+    
+    @staticmethod
+    async def update_menus(updates: List[dict], store_id: str, db: AsyncSession):
+        menu_ids = {menu["id"] for menu in updates}
+        await MenuService._check_menus(menu_ids, store_id, db)
+        await MenuService._check_categories(
+            {menu["category_id"] for menu in updates if menu.get("category_id") is not None}, store_id, db
+        )
+        now = datetime.utcnow()
+        async with _unique_menu_names(db):
+            await db.execute(update(Menu), [{**menu, "updated_at": now} for menu in updates])
+            await db.commit()
+        result = await db.scalars(select(Menu).where(Menu.id.in_(menu_ids)).order_by(Menu.id))
+        await MenuService._catalog_changed(store_id)
+        return result.all()
+    
+    @staticmethod
+    async def reorder(store_id: str, db: AsyncSession, category_ids: List[int] = None, menu_ids: List[int] = None):
+        if category_ids:
+            await MenuService._check_categories(set(category_ids), store_id, db)
+            await db.execute(update(MenuCategory), [
+                {"id": category_id, "display_order": index} for index, category_id in enumerate(category_ids)
+            ])
+        if menu_ids:
+            await MenuService._check_menus(set(menu_ids), store_id, db)
+            await db.execute(update(Menu), [
+                {"id": menu_id, "display_order": index} for index, menu_id in enumerate(menu_ids)
+            ])
+        await db.commit()
+        await MenuService._catalog_changed(store_id)
         return True
+    
+    @staticmethod
+    async def import_menus(upload, fmt: str, store_id: str, db: AsyncSession,
+                           chunk_size: int = settings.MENU_IMPORT_CHUNK_SIZE):
+        rows = _import_rows(upload, fmt)
+        summary = {"created": 0, "updated": 0, "errors": []}
+        line = 0
+        try:
+            while True:
+                # Parsing reads the spooled upload file, so it stays off the event loop.
+                chunk = await run_in_threadpool(lambda: list(islice(rows, chunk_size)))
+                if not chunk:
+                    break
+                valid = []
+                for raw in chunk:
+                    line += 1
+                    try:
+                        valid.append((line, MenuImportRow.model_validate(raw)))
+                    except ValidationError as e:
+                        if len(summary["errors"]) < MAX_IMPORT_ERRORS:
+                            summary["errors"].append({"row": line, "detail": e.errors()[0]["msg"]})
+                created, updated = await MenuService._import_chunk(valid, store_id, db, summary["errors"])
+                await db.commit()
+                summary["created"] += created
+                summary["updated"] += updated
+        except (UnicodeDecodeError, json.JSONDecodeError, csv.Error):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_IMPORT_FILE")
+        finally:
+            # Chunks already committed stay imported, so the catalog is refreshed even if a later one fails.
+            if summary["created"] or summary["updated"]:
+                await MenuService._catalog_changed(store_id)
+        return summary
+    
+    @staticmethod
+    async def _import_chunk(rows: list, store_id: str, db: AsyncSession, errors: list):
+        names = {row.category for _, row in rows if row.category_id is None}
+        if names:
+            await db.execute(
+                pg_insert(MenuCategory)
+                .values([{"store_id": store_id, "name": name} for name in names])
+                .on_conflict_do_nothing(constraint="uq_store_category_name")
+            )
+        categories = await db.execute(select(MenuCategory.id, MenuCategory.name).where(MenuCategory.store_id == store_id))
+        by_name = {}
+        owned = set()
+        for category_id, name in categories:
+            by_name[name] = category_id
+            owned.add(category_id)
+        
+        # A menu is identified by category and name; a later row for the same menu wins.
+        menus = {}
+        for line, row in rows:
+            category_id = row.category_id if row.category_id is not None else by_name[row.category]
+            if category_id not in owned:
+                if len(errors) < MAX_IMPORT_ERRORS:
+                    errors.append({"row": line, "detail": "CATEGORY_NOT_FOUND"})
+                continue
+            menus[(category_id, row.name)] = {
+                **row.model_dump(exclude={"category"}, exclude_unset=True), "category_id": category_id
+            }
+        if not menus:
+            return 0, 0
+        
+        # Rows only overwrite the columns they give, so rows giving the same columns share a statement.
+        groups = {}
+        for menu in menus.values():
+            groups.setdefault(frozenset(menu), []).append(menu)
+        now = datetime.utcnow()
+        created = 0
+        for columns, group in groups.items():
+            stmt = pg_insert(Menu).values(group)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_menu_category_name",
+                set_={
+                    **{column: stmt.excluded[column] for column in columns if column not in ("category_id", "name")},
+                    "updated_at": now,
+                },
+            )
+            # xmax is 0 only for rows this statement inserted.
+            inserted = await db.scalars(stmt.returning(literal_column("xmax = 0")))
+            created += sum(inserted)
+        return created, len(menus) - created
@@ -1,23 +1,108 @@
-from sqlalchemy import select
+import csv
+import enum
+import io
+import json
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from src.models import OrderHistory, TableSession
-from datetime import date
+from src.core.database import AsyncSessionLocal
+from src.models import OrderHistory, OrderHistoryItem, Table, TableSession
+from fastapi import HTTPException, status
+from datetime import date, datetime
+from typing import AsyncGenerator, Optional
+
+EXPORT_CHUNK_ROWS = 1000
+
+EXPORT_COLUMNS = [
+    "order_history_id", "original_order_id", "table_number", "table_session_id", "status", "total_price",
+    "order_created_at", "archived_at", "menu_id", "menu_name", "quantity", "unit_price", "subtotal",
+]
+
+def _encode_cursor(history: OrderHistory) -> str:
+    return f"{history.archived_at.isoformat()},{history.id}"
+
+def _decode_cursor(cursor: str):
+    archived_at, _, history_id = cursor.rpartition(",")
+    try:
+        return datetime.fromisoformat(archived_at), int(history_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_CURSOR")
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if value is None or isinstance(value, (int, str)):
+        return value
+    return str(value)
 
 class OrderHistoryQueryService:
     @staticmethod
-    async def get_order_history(table_id: int, store_id: str, db: AsyncSession, 
-                                from_date: date = None, to_date: date = None):
-        query = select(OrderHistory).join(TableSession).where(
+    async def get_order_history(table_id: int, store_id: str, db: AsyncSession,
+                                from_date: date = None, to_date: date = None,
+                                limit: int = 50, cursor: Optional[str] = None):
+        query = select(OrderHistory).join(TableSession).join(Table).where(
             TableSession.table_id == table_id,
-            TableSession.is_active == False
+            TableSession.is_active == False,
+            Table.store_id == store_id
         ).options(selectinload(OrderHistory.order_history_items))
         
         if from_date:
             query = query.where(OrderHistory.archived_at >= from_date)
         if to_date:
             query = query.where(OrderHistory.archived_at <= to_date)
+        if cursor:
+            query = query.where(tuple_(OrderHistory.archived_at, OrderHistory.id) < _decode_cursor(cursor))
         
-        query = query.order_by(OrderHistory.archived_at.desc())
+        # Orders archived together share archived_at, so id breaks the tie.
+        query = query.order_by(OrderHistory.archived_at.desc(), OrderHistory.id.desc()).limit(limit + 1)
         result = await db.execute(query)
-        return result.scalars().all()
+        histories = result.scalars().all()
+        next_cursor = _encode_cursor(histories[limit - 1]) if len(histories) > limit else None
+        return histories[:limit], next_cursor
+    
+    @staticmethod
+    async def export_order_history(store_id: str, fmt: str, from_date: date = None, to_date: date = None,
+                                   session_factory=AsyncSessionLocal) -> AsyncGenerator[str, None]:
+        query = (
+            select(
+                OrderHistory.id.label("order_history_id"), OrderHistory.original_order_id, Table.table_number,
+                OrderHistory.table_session_id, OrderHistory.status, OrderHistory.total_price,
+                OrderHistory.order_created_at, OrderHistory.archived_at, OrderHistoryItem.menu_id,
+                OrderHistoryItem.menu_name, OrderHistoryItem.quantity, OrderHistoryItem.unit_price,
+                OrderHistoryItem.subtotal
+            )
+            .select_from(OrderHistory)
+            .join(TableSession, TableSession.id == OrderHistory.table_session_id)
+            .join(Table, Table.id == TableSession.table_id)
+            .outerjoin(OrderHistoryItem, OrderHistoryItem.order_history_id == OrderHistory.id)
+            .where(Table.store_id == store_id)
+            .order_by(OrderHistory.archived_at, OrderHistory.id, OrderHistoryItem.id)
+            .execution_options(yield_per=EXPORT_CHUNK_ROWS)
+        )
+        if from_date:
+            query = query.where(OrderHistory.archived_at >= from_date)
+        if to_date:
+            query = query.where(OrderHistory.archived_at <= to_date)
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(EXPORT_COLUMNS)
+        # Streaming responses outlive request dependencies, so the export owns its session.
+        async with session_factory() as db:
+            result = await db.stream(query)
+            async for rows in result.partitions():
+                for row in rows:
+                    values = [_export_value(value) for value in row]
+                    if fmt == "csv":
+                        writer.writerow(values)
+                    else:
+                        buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values)), ensure_ascii=False))
+                        buffer.write("\n")
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
@@ -1,8 +1,14 @@
-from sqlalchemy import select
+from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from src.models import Order, TableSession
+from src.models import Order, OrderItem, Table, TableSession
 from fastapi import HTTPException, status
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+# Timestamps are taken before commit, so a change can become visible slightly after a newer one;
+# delta syncs look back this far and clients upsert by order id.
+LIVE_ORDERS_CURSOR_OVERLAP = timedelta(seconds=5)
 
 class OrderQueryService:
     @staticmethod
@@ -23,3 +29,73 @@ class OrderQueryService:
         if not session:
             return []
         return await OrderQueryService.get_orders_by_session(session.id, db)
+    
+    @staticmethod
+    async def get_live_orders(store_id: str, db: AsyncSession, since: Optional[str] = None):
+        since_at = changed_after = None
+        if since:
+            try:
+                since_at = datetime.fromisoformat(since)
+            except ValueError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_CURSOR")
+            if since_at.tzinfo is not None:
+                since_at = since_at.astimezone(timezone.utc).replace(tzinfo=None)
+            changed_after = since_at - LIVE_ORDERS_CURSOR_OVERLAP
+        
+        item_join = OrderItem.order_id == Order.id
+        if changed_after is not None:
+            item_join = and_(item_join, Order.updated_at > changed_after)
+        result = await db.execute(
+            select(
+                Order.id, Order.table_session_id, TableSession.table_id, Order.status, Order.total_price,
+                Order.created_at, Order.updated_at,
+                OrderItem.id.label("item_id"), OrderItem.menu_id, OrderItem.menu_name, OrderItem.quantity,
+                OrderItem.unit_price, OrderItem.subtotal
+            )
+            .select_from(Order)
+            .join(TableSession, TableSession.id == Order.table_session_id)
+            .join(Table, Table.id == TableSession.table_id)
+            .outerjoin(OrderItem, item_join)
+            .where(Table.store_id == store_id, TableSession.is_active == True)
+            .order_by(Order.created_at.desc(), Order.id.desc(), OrderItem.id)
+        )
+        
+        orders = {}
+        cursor = since
+        latest = None
+        for row in result:
+            if latest is None or row.updated_at > latest:
+                latest = row.updated_at
+            if changed_after is not None and row.updated_at <= changed_after:
+                orders.setdefault(row.id, None)
+                continue
+            order = orders.get(row.id)
+            if order is None:
+                order = orders[row.id] = {
+                    "id": row.id,
+                    "table_session_id": row.table_session_id,
+                    "table_id": row.table_id,
+                    "status": row.status,
+                    "total_price": row.total_price,
+                    "created_at": row.created_at,
+                    "updated_at": row.updated_at,
+                    "order_items": [],
+                }
+            if row.item_id is not None:
+                order["order_items"].append({
+                    "id": row.item_id,
+                    "menu_id": row.menu_id,
+                    "menu_name": row.menu_name,
+                    "quantity": row.quantity,
+                    "unit_price": row.unit_price,
+                    "subtotal": row.subtotal,
+                })
+        if latest is not None and (since_at is None or latest > since_at):
+            cursor = latest.isoformat()
+        
+        # Unchanged orders are listed by id only, so clients can also drop orders that went away.
+        return {
+            "cursor": cursor,
+            "order_ids": list(orders),
+            "orders": [order for order in orders.values() if order is not None],
+        }
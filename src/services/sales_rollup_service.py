@@ -0,0 +1,109 @@
+from sqlalchemy import select, delete, func, cast, distinct, text, Date
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.config import settings
+from src.models import OrderHistory, OrderHistoryItem, OrderStatus, Table, TableSession, DailySales, DailyMenuSales
+from datetime import date
+
+# order_created_at is naive UTC; sales are booked to the store's local day.
+SALES_DAY = cast(func.timezone(settings.STORE_TIMEZONE, func.timezone("UTC", OrderHistory.order_created_at)), Date)
+
+def _archived_orders(*columns):
+    return (
+        select(*columns)
+        .select_from(OrderHistory)
+        .join(TableSession, TableSession.id == OrderHistory.table_session_id)
+        .join(Table, Table.id == TableSession.table_id)
+        .where(OrderHistory.status != OrderStatus.CANCELLED)
+    )
+
+def _daily_sales(*criteria):
+    return (
+        _archived_orders(Table.store_id, SALES_DAY, func.count(OrderHistory.id), func.sum(OrderHistory.total_price))
+        .where(*criteria)
+        .group_by(Table.store_id, SALES_DAY)
+        .order_by(Table.store_id, SALES_DAY)
+    )
+
+def _daily_menu_sales(*criteria):
+    # Items whose menu was deleted before a backfill have no menu_id; they only count toward daily totals.
+    return (
+        _archived_orders(Table.store_id, SALES_DAY, OrderHistoryItem.menu_id, func.max(OrderHistoryItem.menu_name),
+                         func.sum(OrderHistoryItem.quantity), func.sum(OrderHistoryItem.subtotal),
+                         func.count(distinct(OrderHistory.id)))
+        .join(OrderHistoryItem, OrderHistoryItem.order_history_id == OrderHistory.id)
+        .where(OrderHistoryItem.menu_id.isnot(None), *criteria)
+        .group_by(Table.store_id, SALES_DAY, OrderHistoryItem.menu_id)
+        .order_by(Table.store_id, SALES_DAY, OrderHistoryItem.menu_id)
+    )
+
+DAILY_SALES_COLUMNS = ["store_id", "day", "order_count", "revenue"]
+DAILY_MENU_SALES_COLUMNS = ["store_id", "day", "menu_id", "menu_name", "quantity", "revenue", "order_count"]
+
+class SalesRollupService:
+    @staticmethod
+    async def apply_session(session_id: int, db: AsyncSession):
+        # Rows are upserted in key order so concurrent completions cannot deadlock each other.
+        stmt = insert(DailySales).from_select(DAILY_SALES_COLUMNS, _daily_sales(OrderHistory.table_session_id == session_id))
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[DailySales.store_id, DailySales.day],
+            set_={
+                "order_count": DailySales.order_count + stmt.excluded.order_count,
+                "revenue": DailySales.revenue + stmt.excluded.revenue,
+            }
+        ))
+        
+        stmt = insert(DailyMenuSales).from_select(
+            DAILY_MENU_SALES_COLUMNS, _daily_menu_sales(OrderHistory.table_session_id == session_id)
+        )
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[DailyMenuSales.store_id, DailyMenuSales.day, DailyMenuSales.menu_id],
+            set_={
+                "menu_name": stmt.excluded.menu_name,
+                "quantity": DailyMenuSales.quantity + stmt.excluded.quantity,
+                "revenue": DailyMenuSales.revenue + stmt.excluded.revenue,
+                "order_count": DailyMenuSales.order_count + stmt.excluded.order_count,
+            }
+        ))
+    
+    @staticmethod
+    async def rebuild(db: AsyncSession, store_id: str = None):
+        criteria = [Table.store_id == store_id] if store_id else []
+        # Hold off session completions so none is counted twice or missed while rebuilding.
+        await db.execute(text("LOCK TABLE daily_sales, daily_menu_sales IN EXCLUSIVE MODE"))
+        for model in (DailySales, DailyMenuSales):
+            stmt = delete(model)
+            if store_id:
+                stmt = stmt.where(model.store_id == store_id)
+            await db.execute(stmt)
+        await db.execute(insert(DailySales).from_select(DAILY_SALES_COLUMNS, _daily_sales(*criteria)))
+        await db.execute(insert(DailyMenuSales).from_select(DAILY_MENU_SALES_COLUMNS, _daily_menu_sales(*criteria)))
+        await db.commit()
+    
+    @staticmethod
+    async def get_daily_sales(store_id: str, db: AsyncSession, from_date: date = None, to_date: date = None):
+        query = select(DailySales.day, DailySales.order_count, DailySales.revenue).where(DailySales.store_id == store_id)
+        if from_date:
+            query = query.where(DailySales.day >= from_date)
+        if to_date:
+            query = query.where(DailySales.day <= to_date)
+        result = await db.execute(query.order_by(DailySales.day))
+        return [dict(row._mapping) for row in result]
+    
+    @staticmethod
+    async def get_menu_sales(store_id: str, db: AsyncSession, from_date: date = None, to_date: date = None):
+        query = select(
+            DailyMenuSales.menu_id,
+            func.max(DailyMenuSales.menu_name).label("menu_name"),
+            func.sum(DailyMenuSales.quantity).label("quantity"),
+            func.sum(DailyMenuSales.revenue).label("revenue"),
+            func.sum(DailyMenuSales.order_count).label("order_count")
+        ).where(DailyMenuSales.store_id == store_id)
+        if from_date:
+            query = query.where(DailyMenuSales.day >= from_date)
+        if to_date:
+            query = query.where(DailyMenuSales.day <= to_date)
+        result = await db.execute(
+            query.group_by(DailyMenuSales.menu_id).order_by(func.sum(DailyMenuSales.revenue).desc(), DailyMenuSales.menu_id)
+        )
+        return [dict(row._mapping) for row in result]
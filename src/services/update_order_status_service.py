@@ -1,9 +1,10 @@
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.models import Order
-from src.infrastructure.event_bus import event_bus
+from src.models import Order, OutboxEvent, Table, TableSession
+from src.infrastructure.outbox_relay import outbox_relay
 from fastapi import HTTPException, status
 from datetime import datetime
+from typing import List, Optional
 
 VALID_TRANSITIONS = {
     "pending": ["preparing", "cancelled"],
@@ -13,30 +14,97 @@ VALID_TRANSITIONS = {
     "cancelled": []
 }
 
+PREDECESSORS = {
+    new_status: [old_status for old_status, allowed in VALID_TRANSITIONS.items() if new_status in allowed]
+    for new_status in VALID_TRANSITIONS
+}
+
+def _transition(store_id: str, new_status: str, updated_at: datetime, *criteria, from_status: Optional[str] = None):
+    allowed = PREDECESSORS[new_status]
+    if from_status is not None:
+        allowed = [old_status for old_status in allowed if old_status == from_status]
+    # The row lock makes a concurrent transition of the same order wait and re-check its status.
+    locked = (
+        select(Order.id, Order.status)
+        .join(TableSession, TableSession.id == Order.table_session_id)
+        .join(Table, Table.id == TableSession.table_id)
+        .where(Table.store_id == store_id, Order.status.in_(allowed), *criteria)
+        .with_for_update(of=Order)
+        .cte("locked")
+    )
+    return (
+        update(Order)
+        .where(Order.id == locked.c.id)
+        .values(status=new_status, updated_at=updated_at)
+        .returning(
+            Order.id, Order.table_session_id, Order.status, Order.total_price, Order.created_at, Order.updated_at,
+            locked.c.status.label("old_status")
+        )
+        .execution_options(synchronize_session=False)
+    )
+
 class UpdateOrderStatusService:
     @staticmethod
     async def update_order_status(order_id: int, new_status: str, store_id: str, db: AsyncSession):
-        result = await db.execute(select(Order).where(Order.id == order_id))
-        order = result.scalar_one_or_none()
-        if not order:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ORDER_NOT_FOUND")
-        
-        if new_status not in VALID_TRANSITIONS.get(order.status, []):
+        if new_status not in VALID_TRANSITIONS:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_STATUS_TRANSITION")
         
-        old_status = order.status
-        order.status = new_status
-        order.updated_at = datetime.utcnow()
-        await db.commit()
-        await db.refresh(order)
+        updated_at = datetime.utcnow()
+        result = await db.execute(_transition(store_id, new_status, updated_at, Order.id == order_id))
+        order = result.mappings().one_or_none()
+        if order is None:
+            exists = await db.scalar(
+                select(Order.id).join(TableSession).join(Table).where(Order.id == order_id, Table.store_id == store_id)
+            )
+            if exists is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ORDER_NOT_FOUND")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_STATUS_TRANSITION")
         
-        await event_bus.publish("OrderStatusChanged", {
+        db.add(OutboxEvent(event_type="OrderStatusChanged", payload={
             "event_type": "OrderStatusChanged",
-            "order_id": order.id,
+            "order_id": order["id"],
             "store_id": store_id,
-            "old_status": old_status,
+            "old_status": order["old_status"],
             "new_status": new_status,
-            "updated_at": order.updated_at.isoformat()
-        })
+            "updated_at": updated_at.isoformat()
+        }))
+        await db.commit()
+        outbox_relay.notify()
+        
+        return dict(order)
+    
+    @staticmethod
+    async def bulk_update_status(new_status: str, store_id: str, db: AsyncSession, order_ids: Optional[List[int]] = None,
+                                 table_id: Optional[int] = None, from_status: Optional[str] = None):
+        if not order_ids and table_id is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ORDER_FILTER_REQUIRED")
+        if new_status not in VALID_TRANSITIONS or (from_status is not None and from_status not in VALID_TRANSITIONS):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_STATUS_TRANSITION")
+        
+        criteria = []
+        if order_ids:
+            criteria.append(Order.id.in_(order_ids))
+        if table_id is not None:
+            criteria += [TableSession.table_id == table_id, TableSession.is_active == True]
+        updated_at = datetime.utcnow()
+        result = await db.execute(_transition(store_id, new_status, updated_at, *criteria, from_status=from_status))
+        orders = sorted(result.mappings().all(), key=lambda order: order["id"])
+        
+        if orders:
+            # One event for the whole batch, so SSE listeners re-render once.
+            db.add(OutboxEvent(event_type="OrderStatusesChanged", payload={
+                "event_type": "OrderStatusesChanged",
+                "store_id": store_id,
+                "new_status": new_status,
+                "orders": [{"order_id": order["id"], "old_status": order["old_status"]} for order in orders],
+                "updated_at": updated_at.isoformat()
+            }))
+        await db.commit()
+        if orders:
+            outbox_relay.notify()
         
-        return order
+        updated_ids = {order["id"] for order in orders}
+        return {
+            "orders": [dict(order) for order in orders],
+            "skipped_order_ids": [order_id for order_id in order_ids or [] if order_id not in updated_ids],
+        }
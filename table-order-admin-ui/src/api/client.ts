@@ -12,7 +12,20 @@ client.interceptors.request.use((config) => {
   if (token) {
     config.headers.Authorization = `Bearer ${token}`
   }
+  // Send the last write time so reads skip replicas that haven't applied it yet
+  const readAfter = sessionStorage.getItem('read_after')
+  if (readAfter) {
+    config.headers['X-Read-After'] = readAfter
+  }
   return config
 })
 
+client.interceptors.response.use((response) => {
+  const readAfter = response.headers['x-read-after']
+  if (readAfter) {
+    sessionStorage.setItem('read_after', readAfter)
+  }
+  return response
+})
+
 export default client
@@ -26,17 +26,20 @@ describe('TableAPI', () => {
     it('TC-A11-001: 주문 내역 조회 성공', async () => {
       server.use(
         http.get('http://localhost:8000/api/admin/tables/1/order-history', () => {
-          return HttpResponse.json([
-            {
-              id: 1,
-              table_id: 1,
-              status: 'served',
-              items: [],
-              total_amount: 15000,
-              created_at: '2026-02-09T10:00:00Z',
-              completed_at: '2026-02-09T11:00:00Z',
-            },
-          ])
+          return HttpResponse.json({
+            items: [
+              {
+                id: 1,
+                table_id: 1,
+                status: 'served',
+                items: [],
+                total_amount: 15000,
+                created_at: '2026-02-09T10:00:00Z',
+                completed_at: '2026-02-09T11:00:00Z',
+              },
+            ],
+            next_cursor: null,
+          })
         })
       )
 
@@ -45,5 +48,35 @@ describe('TableAPI', () => {
       expect(result).toHaveLength(1)
       expect(result[0].table_id).toBe(1)
     })
+
+    it('TC-A11-002: 다음 페이지 커서를 따라 전체 내역 조회', async () => {
+      const cursors: (string | null)[] = []
+      server.use(
+        http.get('http://localhost:8000/api/admin/tables/1/order-history', ({ request }) => {
+          const cursor = new URL(request.url).searchParams.get('cursor')
+          cursors.push(cursor)
+          const id = cursor ? 1 : 2
+          return HttpResponse.json({
+            items: [
+              {
+                id,
+                table_id: 1,
+                status: 'served',
+                items: [],
+                total_amount: 15000,
+                created_at: '2026-02-09T10:00:00Z',
+                completed_at: '2026-02-09T11:00:00Z',
+              },
+            ],
+            next_cursor: cursor ? null : '2026-02-09T11:00:00,2',
+          })
+        })
+      )
+
+      const result = await TableAPI.getOrderHistory(1)
+
+      expect(cursors).toEqual([null, '2026-02-09T11:00:00,2'])
+      expect(result.map((item) => item.id)).toEqual([2, 1])
+    })
   })
 })
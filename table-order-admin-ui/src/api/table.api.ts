@@ -1,5 +1,5 @@
 import client from './client'
-import type { CompleteSessionRequest, OrderHistoryItem } from '../types'
+import type { CompleteSessionRequest, OrderHistoryItem, OrderHistoryPage } from '../types'
 
 export const TableAPI = {
   async completeSession(tableId: number, data: CompleteSessionRequest): Promise<void> {
@@ -7,7 +7,15 @@ export const TableAPI = {
   },
 
   async getOrderHistory(tableId: number): Promise<OrderHistoryItem[]> {
-    const response = await client.get<OrderHistoryItem[]>(`/api/admin/tables/${tableId}/order-history`)
-    return response.data
+    const history: OrderHistoryItem[] = []
+    let cursor: string | null = null
+    do {
+      const response = await client.get<OrderHistoryPage>(`/api/admin/tables/${tableId}/order-history`, {
+        params: { limit: 500, ...(cursor ? { cursor } : {}) },
+      })
+      history.push(...response.data.items)
+      cursor = response.data.next_cursor
+    } while (cursor)
+    return history
   },
 }
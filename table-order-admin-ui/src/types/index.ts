@@ -97,3 +97,8 @@ export interface OrderHistoryItem {
   created_at: string
   completed_at: string | null
 }
+
+export interface OrderHistoryPage {
+  items: OrderHistoryItem[]
+  next_cursor: string | null
+}
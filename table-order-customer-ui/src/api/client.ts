@@ -16,6 +16,11 @@ apiClient.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    // Send the last write time so reads skip replicas that haven't applied it yet
+    const readAfter = sessionStorage.getItem('read_after');
+    if (readAfter) {
+      config.headers['X-Read-After'] = readAfter;
+    }
     return config;
   },
   (error) => {
@@ -23,9 +28,15 @@ apiClient.interceptors.request.use(
   }
 );
 
-// Response interceptor - Handle errors
+// Response interceptor - Remember the last write time and handle errors
 apiClient.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const readAfter = response.headers['x-read-after'];
+    if (readAfter) {
+      sessionStorage.setItem('read_after', readAfter);
+    }
+    return response;
+  },
   (error) => {
     if (error.response?.status === 401) {
       // Auto-logout on 401
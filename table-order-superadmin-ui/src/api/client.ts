@@ -10,11 +10,21 @@ client.interceptors.request.use((config) => {
   if (token) {
     config.headers.Authorization = `Bearer ${token}`
   }
+  const readAfter = sessionStorage.getItem('read_after')
+  if (readAfter) {
+    config.headers['X-Read-After'] = readAfter
+  }
   return config
 })
 
 client.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const readAfter = response.headers['x-read-after']
+    if (readAfter) {
+      sessionStorage.setItem('read_after', readAfter)
+    }
+    return response
+  },
   (error) => {
     if (error.response?.status === 401) {
       localStorage.removeItem('token')
@@ -0,0 +1,38 @@
+import asyncio
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from src.models import Store, Table, TableSession
+from src.services import authentication_service
+from src.services.authentication_service import AuthenticationService
+
+@pytest.mark.asyncio
+async def test_concurrent_table_logins_share_one_session(db_session, monkeypatch):
+    """Test logins racing to open a table's session all get the one active session"""
+    store = Store(name="Login Store")
+    db_session.add(store)
+    await db_session.flush()
+    table = Table(store_id=store.id, table_number="1", password_hash="x")
+    db_session.add(table)
+    await db_session.commit()
+    arrived, everyone = [], asyncio.Event()
+    
+    async def verify(password, password_hash):
+        # Hold every login until all have checked their password, so they look up the session together.
+        arrived.append(password)
+        if len(arrived) == 5:
+            everyone.set()
+        await everyone.wait()
+        return True
+    
+    monkeypatch.setattr(authentication_service.password_hasher, "verify", verify)
+    session_factory = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    
+    async def login():
+        async with session_factory() as db:
+            return await AuthenticationService.authenticate_table("1", "1234", store.id, db)
+    
+    results = await asyncio.gather(*[login() for _ in range(5)])
+    assert len({result["session_id"] for result in results}) == 1
+    active = select(func.count()).select_from(TableSession).where(TableSession.is_active == True)
+    assert await db_session.scalar(active) == 1
@@ -1,6 +1,7 @@
+import asyncio
 import pytest
 from src.models import Store, Admin, Menu, Order
-from src.core.security import hash_password, verify_password, create_jwt_token, decode_jwt_token
+from src.core.security import hash_password, verify_password, create_jwt_token, decode_jwt_token, PasswordHasher
 
 def test_password_hashing():
     """Test password hashing and verification"""
@@ -10,6 +11,19 @@ def test_password_hashing():
     assert verify_password(password, hashed)
     assert not verify_password("wrong", hashed)
 
+@pytest.mark.asyncio
+async def test_password_hasher_pool():
+    """Test password hashing on the bounded worker pool"""
+    hasher = PasswordHasher(max_workers=2)
+    hashed = await hasher.hash("test123")
+    results = await asyncio.gather(*[hasher.verify("test123", hashed) for _ in range(4)])
+    assert results == [True] * 4
+    assert not await hasher.verify("wrong", hashed)
+    stats = hasher.stats()
+    assert stats["calls"] == 6
+    assert stats["in_flight"] == 0
+    assert stats["queue_time_max_seconds"] >= 0
+
 def test_jwt_token():
     """Test JWT token creation and decoding"""
     payload = {"user_id": 123, "role": "admin"}
@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import event, func, select
+from src.models import Store, Table, TableSession, MenuCategory, Menu, Order, OrderItem, OrderHistory, OrderHistoryItem
+from src.services.complete_table_session_service import CompleteTableSessionService
+
+async def _table_with_orders(db_session, store, menu, table_number: str, order_count: int):
+    table = Table(store_id=store.id, table_number=table_number, password_hash="x")
+    db_session.add(table)
+    await db_session.flush()
+    session = TableSession(table_id=table.id, is_active=True)
+    db_session.add(session)
+    await db_session.flush()
+    orders = [Order(table_session_id=session.id, status="served", total_price=menu.price * 2) for _ in range(order_count)]
+    db_session.add_all(orders)
+    await db_session.flush()
+    db_session.add_all([
+        OrderItem(order_id=order.id, menu_id=menu.id, menu_name=menu.name, quantity=quantity,
+                  unit_price=menu.price, subtotal=menu.price * quantity)
+        for order in orders for quantity in (1, 1)
+    ])
+    await db_session.commit()
+    return table
+
+async def _complete_counting_statements(db_session, table, store):
+    statements = []
+    
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        result = await CompleteTableSessionService.complete_session(table.id, store.id, db_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return result, len(statements)
+
+@pytest.mark.asyncio
+async def test_complete_session_statement_count_is_constant(db_session):
+    """Test archiving a session issues the same number of statements for 1 order as for 50"""
+    store = Store(name="Archive Store")
+    db_session.add(store)
+    await db_session.flush()
+    category = MenuCategory(store_id=store.id, name="Main", display_order=0)
+    db_session.add(category)
+    await db_session.flush()
+    menu = Menu(category_id=category.id, name="Noodles", price=8000)
+    db_session.add(menu)
+    await db_session.commit()
+    small = await _table_with_orders(db_session, store, menu, "1", 1)
+    large = await _table_with_orders(db_session, store, menu, "2", 50)
+    
+    small_result, small_statements = await _complete_counting_statements(db_session, small, store)
+    large_result, large_statements = await _complete_counting_statements(db_session, large, store)
+    
+    assert (small_result["archived_orders_count"], large_result["archived_orders_count"]) == (1, 50)
+    assert small_statements == large_statements
+    assert await db_session.scalar(select(func.count()).select_from(OrderHistory)) == 51
+    assert await db_session.scalar(select(func.count()).select_from(OrderHistoryItem)) == 102
+    assert await db_session.scalar(select(func.count()).select_from(Order)) == 0
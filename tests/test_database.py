@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from src.core.database import create_engine, engine_options, pool_stats
+from tests.conftest import TEST_DATABASE_URL
+
+def test_engine_profile_defaults():
+    """Test the engine profile keeps SQL logging off and pools connections"""
+    options = engine_options()
+    assert options["echo"] is False
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"]["statement_cache_size"] > 0
+
+def test_pgbouncer_mode_disables_statement_caches():
+    """Test PgBouncer mode turns off prepared statement caching and uses unique names"""
+    connect_args = engine_options(pgbouncer=True)["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+@pytest.mark.asyncio
+async def test_pool_metrics_record_checkouts_and_starvation():
+    """Test pool stats count checkouts, overflow and timeouts when the pool is exhausted"""
+    engine = create_engine(TEST_DATABASE_URL, pool_size=1, max_overflow=1, pool_timeout=0.2)
+    try:
+        async with engine.connect() as first, engine.connect() as second:
+            await first.execute(text("SELECT 1"))
+            await second.execute(text("SELECT 1"))
+            assert pool_stats(engine)["checked_out"] == 2
+            assert pool_stats(engine)["overflow"] == 1
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect() as third:
+                    await third.execute(text("SELECT 1"))
+        
+        stats = pool_stats(engine)
+        assert stats["checkouts"] == 3
+        assert stats["timeouts"] == 1
+        assert stats["connects"] == 2
+        assert stats["checked_out"] == 0
+        assert stats["wait_seconds_max"] >= 0.2
+    finally:
+        await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_pgbouncer_mode_runs_queries():
+    """Test queries still work with statement caching disabled"""
+    engine = create_engine(TEST_DATABASE_URL, **engine_options(pgbouncer=True))
+    try:
+        async with engine.connect() as conn:
+            for value in range(3):
+                assert await conn.scalar(text("SELECT CAST(:value AS int)"), {"value": value}) == value
+    finally:
+        await engine.dispose()
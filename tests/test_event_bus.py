@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from src.infrastructure.event_bus import EventBus
+
+@pytest.mark.asyncio
+async def test_event_bus_delivers_in_order_per_store():
+    """Test events are consumed by the worker pool in publish order per store"""
+    bus = EventBus(queue_size=10, workers=3, batch_size=4)
+    received = []
+    
+    async def handler(payload):
+        await asyncio.sleep(0)
+        received.append((payload["store_id"], payload["n"]))
+    
+    bus.subscribe("OrderCreated", handler)
+    bus.start()
+    for n in range(20):
+        await bus.publish("OrderCreated", {"store_id": f"store-{n % 2}", "n": n})
+    await bus.stop()
+    
+    for store_id in ("store-0", "store-1"):
+        assert [n for s, n in received if s == store_id] == list(range(int(store_id[-1]), 20, 2))
+    assert bus.stats()["delivered"] == 20
+    assert bus.stats()["queue_depth"] == 0
+
+@pytest.mark.asyncio
+async def test_event_bus_isolates_failures_and_batches():
+    """Test a failing subscriber does not affect others and batch subscribers get lists"""
+    bus = EventBus(queue_size=10, workers=1, batch_size=10)
+    batches = []
+    
+    async def broken(payload):
+        raise RuntimeError("boom")
+    
+    async def batch_handler(payloads):
+        batches.append(len(payloads))
+    
+    bus.subscribe("OrderStatusChanged", broken)
+    bus.subscribe("OrderStatusChanged", batch_handler, batch=True)
+    bus.start()
+    for n in range(5):
+        await bus.publish("OrderStatusChanged", {"store_id": "s", "n": n})
+    await bus.stop()
+    
+    assert sum(batches) == 5
+    assert bus.stats()["failed"] == 5
+
+@pytest.mark.asyncio
+async def test_event_bus_dispatches_inline_when_not_started():
+    """Test publish delivers directly when no consumers are running"""
+    bus = EventBus()
+    received = []
+    
+    async def handler(payload):
+        received.append(payload)
+    
+    bus.subscribe("OrderCreated", handler)
+    await bus.publish("OrderCreated", {"store_id": "s"})
+    assert received == [{"store_id": "s"}]
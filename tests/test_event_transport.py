@@ -0,0 +1,123 @@
+import asyncio
+import uuid
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from src.infrastructure.event_bus import EventBus
+from src.core.config import settings
+from src.infrastructure.event_transport import EVENTS_MISSED, PostgresTransport, create_transport
+from tests.conftest import TEST_DATABASE_URL
+
+@pytest.mark.asyncio
+async def test_postgres_transport_fans_out_across_workers():
+    """Test an event published on one worker's bus reaches every worker over LISTEN/NOTIFY"""
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    channel = f"test_events_{uuid.uuid4().hex[:8]}"
+    buses = [EventBus(workers=1, transport=PostgresTransport(TEST_DATABASE_URL, channel, engine=engine)) for _ in range(2)]
+    received = [[], []]
+    
+    for bus, inbox in zip(buses, received):
+        async def handler(payload, inbox=inbox):
+            inbox.append(payload["order_id"])
+        bus.subscribe("OrderCreated", handler)
+        bus.start()
+    for bus in buses:
+        await asyncio.wait_for(bus.transport.wait_listening(), 5)
+    
+    for order_id in range(3):
+        await buses[0].publish("OrderCreated", {"store_id": "s", "order_id": order_id})
+    for _ in range(50):
+        if all(len(inbox) == 3 for inbox in received):
+            break
+        await asyncio.sleep(0.05)
+    
+    for bus in buses:
+        await bus.stop()
+    await engine.dispose()
+    assert received == [[0, 1, 2], [0, 1, 2]]
+    assert buses[0].stats()["sent"] == 3
+    assert buses[1].stats()["received"] == 3
+
+@pytest.mark.asyncio
+async def test_postgres_transport_delivers_oversized_events_locally():
+    """Test events over the NOTIFY size limit still reach the publishing worker"""
+    transport = PostgresTransport(TEST_DATABASE_URL, "unused")
+    delivered = []
+    
+    async def deliver(event_type, payload):
+        delivered.append(event_type)
+    
+    transport._deliver = deliver
+    await transport.send("OrderCreated", {"store_id": "s", "blob": "x" * 9000})
+    assert delivered == ["OrderCreated"]
+    assert transport.stats()["oversized"] == 1
+
+def test_postgres_transport_listens_on_direct_url(monkeypatch):
+    """Test LISTEN uses EVENT_LISTEN_DATABASE_URL and refuses a PgBouncer DATABASE_URL without one"""
+    monkeypatch.setattr(settings, "EVENT_TRANSPORT", "postgres")
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql+asyncpg://app:pw@pgbouncer:6432/tableorder")
+    monkeypatch.setattr(settings, "EVENT_LISTEN_DATABASE_URL", None)
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", False)
+    assert create_transport().dsn == "postgresql://app:pw@pgbouncer:6432/tableorder"
+    
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    with pytest.raises(RuntimeError, match="EVENT_LISTEN_DATABASE_URL"):
+        create_transport()
+    
+    monkeypatch.setattr(settings, "EVENT_LISTEN_DATABASE_URL", "postgresql+asyncpg://app:pw@db:5432/tableorder")
+    assert create_transport().dsn == "postgresql://app:pw@db:5432/tableorder"
+
+@pytest.mark.asyncio
+async def test_postgres_transport_sends_a_batch_in_one_statement():
+    """Test publish_many notifies a whole batch with one statement and it arrives in order"""
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    channel = f"test_events_{uuid.uuid4().hex[:8]}"
+    bus = EventBus(workers=1, transport=PostgresTransport(TEST_DATABASE_URL, channel, engine=engine))
+    received = []
+    
+    async def handler(payload):
+        received.append(payload["order_id"])
+    
+    bus.subscribe("OrderCreated", handler)
+    bus.start()
+    await asyncio.wait_for(bus.transport.wait_listening(), 5)
+    statements = []
+    
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    await bus.publish_many([("OrderCreated", {"store_id": "s", "order_id": order_id}) for order_id in range(20)])
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+    for _ in range(50):
+        if len(received) == 20:
+            break
+        await asyncio.sleep(0.05)
+    
+    await bus.stop()
+    await engine.dispose()
+    assert len([statement for statement in statements if "pg_notify" in statement]) == 1
+    assert received == list(range(20))
+    assert bus.stats()["sent"] == 20
+
+@pytest.mark.asyncio
+async def test_postgres_transport_drops_notifications_when_inbox_is_full():
+    """Test a full inbox drops and counts notifications, then tells subscribers events were missed"""
+    transport = PostgresTransport(TEST_DATABASE_URL, "unused", inbox_size=2)
+    for n in range(5):
+        transport._on_notify(None, 0, "unused", '{"event_type": "OrderCreated", "payload": {}}')
+    assert transport.stats()["inbox_depth"] == 2
+    assert transport.stats()["dropped"] == 3
+    
+    delivered = []
+    
+    async def deliver(event_type, payload):
+        delivered.append(event_type)
+    
+    transport._deliver = deliver
+    forward = asyncio.create_task(transport._forward())
+    await asyncio.sleep(0.01)
+    forward.cancel()
+    await asyncio.gather(forward, return_exceptions=True)
+    assert delivered == ["OrderCreated", "OrderCreated", EVENTS_MISSED]
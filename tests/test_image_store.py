@@ -0,0 +1,61 @@
+import io
+import os
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+from src.infrastructure.image_store import ImageStore
+
+def _png(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 80, 40)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def _upload(data: bytes, filename: str = "photo.png") -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+@pytest.mark.asyncio
+async def test_save_dedupes_and_builds_thumbnails(tmp_path):
+    """Test identical uploads share one content-addressed file with resized variants"""
+    store = ImageStore(directory=str(tmp_path), max_bytes=1 << 20, thumbnail_sizes=[64], max_workers=2)
+    data = _png(400, 200)
+    first = await store.save(_upload(data))
+    second = await store.save(_upload(data, "copy.PNG"))
+    
+    assert first == second
+    assert first.startswith("/uploads/menus/") and first.endswith(".png")
+    assert store.stats() == {"stored": 1, "deduplicated": 1}
+    thumbnail = store.thumbnail_paths(first)["64"]
+    with Image.open(tmp_path / os.path.basename(thumbnail)) as image:
+        assert image.size == (64, 32)
+    names = [os.path.basename(first), os.path.basename(thumbnail)]
+    assert sorted(os.listdir(tmp_path)) == sorted(names + [os.path.splitext(name)[0] + ".webp" for name in names])
+    
+    await store.delete(first)
+    assert os.listdir(tmp_path) == []
+
+@pytest.mark.asyncio
+async def test_save_rejects_oversized_and_invalid_uploads(tmp_path):
+    """Test the size limit and image validation leave no partial files behind"""
+    store = ImageStore(directory=str(tmp_path), max_bytes=1024, thumbnail_sizes=[64], max_workers=1)
+    with pytest.raises(HTTPException) as exc:
+        await store.save(_upload(os.urandom(4096)))
+    assert exc.value.status_code == 413
+    with pytest.raises(HTTPException) as exc:
+        await store.save(_upload(b"not an image"))
+    assert exc.value.detail == "INVALID_IMAGE"
+    with pytest.raises(HTTPException) as exc:
+        await store.save(_upload(_png(10, 10), "photo.exe"))
+    assert exc.value.detail == "INVALID_IMAGE_TYPE"
+    assert os.listdir(tmp_path) == []
+
+@pytest.mark.asyncio
+async def test_save_rejects_truncated_upload(tmp_path):
+    """Test an image that passes verification but fails to decode is a 400 and leaves nothing behind"""
+    store = ImageStore(directory=str(tmp_path), thumbnail_sizes=[64], max_workers=1)
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", (200, 200), os.urandom(200 * 200 * 3)).save(buffer, format="JPEG")
+    with pytest.raises(HTTPException) as exc:
+        await store.save(_upload(buffer.getvalue()[:len(buffer.getvalue()) // 2], "photo.jpg"))
+    assert exc.value.status_code == 400 and exc.value.detail == "INVALID_IMAGE"
+    assert os.listdir(tmp_path) == []
+    assert store.stats()["stored"] == 0
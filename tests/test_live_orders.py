@@ -0,0 +1,52 @@
+import pytest
+from datetime import datetime, timedelta
+from src.models import Store, Table, TableSession, MenuCategory, Menu, Order, OrderItem
+from src.services.order_query_service import OrderQueryService
+
+async def _seed(db_session):
+    store, other_store = Store(name="Live Store"), Store(name="Other Store")
+    db_session.add_all([store, other_store])
+    await db_session.flush()
+    tables = [Table(store_id=s.id, table_number=str(n), password_hash="x") for n, s in enumerate([store, store, other_store])]
+    category = MenuCategory(store_id=store.id, name="Main", display_order=0)
+    db_session.add_all(tables + [category])
+    await db_session.flush()
+    menu = Menu(category_id=category.id, name="Noodles", price=8000)
+    sessions = [TableSession(table_id=table.id, is_active=True) for table in tables]
+    sessions.append(TableSession(table_id=tables[0].id, is_active=False))
+    db_session.add_all(sessions + [menu])
+    await db_session.flush()
+    
+    old = datetime.utcnow() - timedelta(minutes=10)
+    orders = [Order(table_session_id=session.id, status="pending", total_price=16000, created_at=old, updated_at=old)
+              for session in sessions]
+    db_session.add_all(orders)
+    await db_session.flush()
+    db_session.add_all([OrderItem(order_id=order.id, menu_id=menu.id, menu_name="Noodles", quantity=2,
+                                  unit_price=8000, subtotal=16000) for order in orders])
+    await db_session.commit()
+    return store, orders, old
+
+@pytest.mark.asyncio
+async def test_live_orders_snapshot_and_delta(db_session):
+    """Test the store snapshot covers active sessions only and since= returns just the changes"""
+    store, orders, old = await _seed(db_session)
+    
+    snapshot = await OrderQueryService.get_live_orders(store.id, db_session)
+    assert sorted(snapshot["order_ids"]) == sorted([orders[0].id, orders[1].id])
+    assert all(len(order["order_items"]) == 1 for order in snapshot["orders"])
+    assert snapshot["cursor"] == old.isoformat()
+    
+    since = (old + timedelta(minutes=1)).isoformat()
+    delta = await OrderQueryService.get_live_orders(store.id, db_session, since=since)
+    assert delta["orders"] == []
+    assert sorted(delta["order_ids"]) == sorted(snapshot["order_ids"])
+    assert delta["cursor"] == since
+    
+    orders[1].status = "preparing"
+    orders[1].updated_at = datetime.utcnow()
+    await db_session.commit()
+    delta = await OrderQueryService.get_live_orders(store.id, db_session, since=since)
+    assert [order["id"] for order in delta["orders"]] == [orders[1].id]
+    assert delta["orders"][0]["order_items"][0]["menu_name"] == "Noodles"
+    assert delta["cursor"] == orders[1].updated_at.isoformat()
@@ -0,0 +1,159 @@
+import asyncio
+import io
+import json
+import os
+import pytest
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from src.infrastructure.menu_catalog import menu_catalog
+from src.models import Store, MenuCategory, Menu
+from PIL import Image
+from src.infrastructure.image_store import ImageStore
+from src.services import menu_service
+from src.services.menu_service import MenuService
+
+async def _seed(db_session):
+    store, other_store = Store(name="Menu Store"), Store(name="Other Store")
+    db_session.add_all([store, other_store])
+    await db_session.flush()
+    categories = [MenuCategory(store_id=store.id, name=name, display_order=i) for i, name in enumerate(["Main", "Drinks"])]
+    other_category = MenuCategory(store_id=other_store.id, name="Main")
+    db_session.add_all(categories + [other_category])
+    await db_session.commit()
+    return store, categories, other_category
+
+def _upload(text: str, filename: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(text.encode()), filename=filename)
+
+@pytest.mark.asyncio
+async def test_batch_create_update_and_reorder(db_session):
+    """Test batch menu changes run in one transaction each and invalidate the catalog once"""
+    store, categories, other_category = await _seed(db_session)
+    version = menu_catalog.version(store.id)
+    
+    created = await MenuService.create_menus(
+        [{"category_id": categories[0].id, "name": f"Menu {i}", "price": 1000 + i} for i in range(3)], store.id, db_session
+    )
+    assert [menu.name for menu in created] == ["Menu 0", "Menu 1", "Menu 2"]
+    assert menu_catalog.version(store.id) == version + 1
+    
+    updated = await MenuService.update_menus(
+        [{"id": created[0].id, "price": 5000}, {"id": created[1].id, "is_available": False}], store.id, db_session
+    )
+    assert [(float(menu.price), menu.is_available) for menu in updated] == [(5000, True), (1001, False)]
+    
+    await MenuService.reorder(store.id, db_session, category_ids=[categories[1].id, categories[0].id],
+                              menu_ids=[menu.id for menu in reversed(created)])
+    menus = await MenuService.get_menus_by_category(None, store.id, db_session)
+    assert [menu.name for menu in menus] == ["Menu 2", "Menu 1", "Menu 0"]
+    await db_session.refresh(categories[1])
+    assert categories[1].display_order == 0
+    assert menu_catalog.version(store.id) == version + 3
+    
+    with pytest.raises(HTTPException) as foreign:
+        await MenuService.create_menus([{"category_id": other_category.id, "name": "X", "price": 1}], store.id, db_session)
+    assert foreign.value.detail == "CATEGORY_NOT_FOUND"
+
+@pytest.mark.asyncio
+async def test_csv_import_upserts_in_chunks(db_session):
+    """Test CSV import validates rows, creates categories and upserts by category and name"""
+    store, categories, _ = await _seed(db_session)
+    version = menu_catalog.version(store.id)
+    csv_text = (
+        "category,name,price,description,is_available\n"
+        "Main,Bibimbap,9000,rice bowl,\n"
+        "Main,Bulgogi,12000,,false\n"
+        "Dessert,Bingsu,7000,,\n"
+        "Main,Broken,-5,,\n"
+        ",Orphan,1000,,\n"
+    )
+    summary = await MenuService.import_menus(_upload(csv_text, "menus.csv"), "csv", store.id, db_session, chunk_size=2)
+    assert (summary["created"], summary["updated"]) == (3, 0)
+    assert [error["row"] for error in summary["errors"]] == [4, 5]
+    assert menu_catalog.version(store.id) == version + 1
+    
+    ndjson = "\n".join(json.dumps(row) for row in [
+        {"category_id": categories[0].id, "name": "Bibimbap", "price": 9500},
+        {"category": "Drinks", "name": "Cola", "price": 2000},
+    ])
+    summary = await MenuService.import_menus(_upload(ndjson, "menus.ndjson"), "ndjson", store.id, db_session)
+    assert (summary["created"], summary["updated"], summary["errors"]) == (1, 1, [])
+    
+    result = await db_session.execute(select(Menu).where(Menu.name == "Bibimbap"))
+    bibimbap = result.scalar_one()
+    assert float(bibimbap.price) == 9500 and bibimbap.description == "rice bowl"
+    dessert = await db_session.scalar(select(MenuCategory).where(MenuCategory.store_id == store.id, MenuCategory.name == "Dessert"))
+    assert dessert is not None
+
+@pytest.mark.asyncio
+async def test_concurrent_imports_do_not_duplicate_menus(db_session):
+    """Test imports racing on the same menus upsert them instead of inserting duplicates"""
+    store, categories, _ = await _seed(db_session)
+    csv_text = "category,name,price\n" + "".join(f"Main,Menu {i},{1000 + i}\n" for i in range(20))
+    session_factory = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    
+    async def run_import():
+        async with session_factory() as db:
+            return await MenuService.import_menus(_upload(csv_text, "menus.csv"), "csv", store.id, db, chunk_size=5)
+    
+    summaries = await asyncio.gather(run_import(), run_import())
+    assert sum(summary["created"] for summary in summaries) == 20
+    assert sum(summary["updated"] for summary in summaries) == 20
+    count = await db_session.scalar(select(func.count()).select_from(Menu).where(Menu.category_id == categories[0].id))
+    assert count == 20
+    
+    with pytest.raises(HTTPException) as duplicate:
+        await MenuService.create_menus([{"category_id": categories[0].id, "name": "Menu 0", "price": 1}], store.id, db_session)
+    assert duplicate.value.status_code == 409 and duplicate.value.detail == "MENU_ALREADY_EXISTS"
+
+@pytest.mark.asyncio
+async def test_released_image_survives_concurrent_reuse(db_session, tmp_path, monkeypatch):
+    """Test removing a menu's last reference waits for a save reusing the same file to commit"""
+    store, categories, _ = await _seed(db_session)
+    images = ImageStore(directory=str(tmp_path), thumbnail_sizes=[64], max_workers=1)
+    monkeypatch.setattr(menu_service, "image_store", images)
+    buffer = io.BytesIO()
+    Image.new("RGB", (100, 100), (10, 120, 200)).save(buffer, format="PNG")
+    upload = UploadFile(file=io.BytesIO(buffer.getvalue()), filename="photo.png")
+    menu = await MenuService.create_menu(categories[0].id, "Bibimbap", 9000, store.id, db_session, image_file=upload)
+    
+    session_factory = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as other:
+        # Another request has deduplicated the same upload but not yet committed its menu.
+        await MenuService._lock_image(menu.image_path, other)
+        other.add(Menu(category_id=categories[0].id, name="Bulgogi", price=12000, image_path=menu.image_path))
+        await other.flush()
+        
+        delete = asyncio.ensure_future(MenuService.delete_menu(menu.id, store.id, db_session))
+        await asyncio.sleep(0.2)
+        assert not delete.done()
+        await other.commit()
+        await asyncio.wait_for(delete, 5)
+    assert os.path.basename(menu.image_path) in os.listdir(tmp_path)
+
+@pytest.mark.asyncio
+async def test_failed_menu_save_removes_its_new_image(db_session, tmp_path, monkeypatch):
+    """Test an image stored for a menu that fails to commit is removed again"""
+    store, categories, _ = await _seed(db_session)
+    images = ImageStore(directory=str(tmp_path), thumbnail_sizes=[64], max_workers=1)
+    monkeypatch.setattr(menu_service, "image_store", images)
+    
+    def upload(color):
+        buffer = io.BytesIO()
+        Image.new("RGB", (100, 100), color).save(buffer, format="PNG")
+        return UploadFile(file=io.BytesIO(buffer.getvalue()), filename="photo.png")
+    
+    menu = await MenuService.create_menu(categories[0].id, "Bibimbap", 9000, store.id, db_session, image_file=upload((1, 2, 3)))
+    store_id, menu_id, category_id = store.id, menu.id, categories[0].id
+    kept = sorted(os.listdir(tmp_path))
+    with pytest.raises(HTTPException) as duplicate:
+        await MenuService.create_menu(category_id, "Bibimbap", 9000, store_id, db_session, image_file=upload((4, 5, 6)))
+    assert duplicate.value.status_code == 409
+    assert sorted(os.listdir(tmp_path)) == kept
+    
+    await MenuService.create_menu(category_id, "Bulgogi", 12000, store_id, db_session)
+    with pytest.raises(HTTPException) as duplicate:
+        await MenuService.update_menu(menu_id, store_id, db_session, image_file=upload((7, 8, 9)), name="Bulgogi")
+    assert duplicate.value.status_code == 409
+    assert sorted(os.listdir(tmp_path)) == kept
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import pytest
+from src.infrastructure.menu_catalog import MenuCatalogCache
+
+MENUS = [
+    {"id": 1, "category_id": 10, "name": "김치찌개"},
+    {"id": 2, "category_id": 20, "name": "콜라"},
+    {"id": 3, "category_id": 10, "name": "된장찌개"},
+]
+
+@pytest.mark.asyncio
+async def test_catalog_snapshot_is_reused_until_invalidated():
+    """Test catalog is loaded once per version"""
+    cache = MenuCatalogCache()
+    calls = []
+    
+    async def loader():
+        calls.append(1)
+        return MENUS
+    
+    first = await cache.get("store-1", loader)
+    second = await cache.get("store-1", loader)
+    assert first is second
+    assert len(calls) == 1
+    
+    cache.invalidate("store-1")
+    third = await cache.get("store-1", loader)
+    assert third is not first
+    assert third.version == 1
+    assert len(calls) == 2
+
+@pytest.mark.asyncio
+async def test_catalog_groups_by_category():
+    """Test pre-serialized bodies per category"""
+    cache = MenuCatalogCache()
+    
+    async def loader():
+        return MENUS
+    
+    snapshot = await cache.get("store-1", loader)
+    assert [m["id"] for m in json.loads(snapshot.get(None).body)] == [1, 2, 3]
+    assert [m["id"] for m in json.loads(snapshot.get(10).body)] == [1, 3]
+    assert json.loads(snapshot.get(99).body) == []
+    assert snapshot.get(10).etag != snapshot.get(20).etag
+
+@pytest.mark.asyncio
+async def test_catalog_etag_matching():
+    """Test If-None-Match handling"""
+    cache = MenuCatalogCache()
+    
+    async def loader():
+        return MENUS
+    
+    entry = (await cache.get("store-1", loader)).get(None)
+    assert entry.matches(entry.etag)
+    assert entry.matches(f'"other", {entry.etag}')
+    assert entry.matches("*")
+    assert not entry.matches('"other"')
+    assert not entry.matches(None)
+
+@pytest.mark.asyncio
+async def test_catalog_not_cached_when_invalidated_during_load():
+    """Test a load racing with a mutation is not kept"""
+    cache = MenuCatalogCache()
+    release = asyncio.Event()
+    
+    async def slow_loader():
+        await release.wait()
+        return MENUS
+    
+    task = asyncio.create_task(cache.get("store-1", slow_loader))
+    await asyncio.sleep(0)
+    cache.invalidate("store-1")
+    release.set()
+    await task
+    
+    async def loader():
+        return []
+    
+    snapshot = await cache.get("store-1", loader)
+    assert json.loads(snapshot.get(None).body) == []
@@ -0,0 +1,73 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import text
+from src.core.database import create_engine
+from src.infrastructure.metrics import Metrics, MetricsMiddleware, setup_metrics
+from tests.conftest import TEST_DATABASE_URL
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_by_route_template():
+    """Test latency, SQL count and status are recorded per route template, not per URL"""
+    engine = create_engine(TEST_DATABASE_URL)
+    registry = Metrics()
+    registry.instrument_engine(engine)
+    registry.instrument_engine(engine)
+    test_app = FastAPI()
+    test_app.add_middleware(MetricsMiddleware, registry=registry)
+    
+    @test_app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+        return {"id": item_id}
+    
+    try:
+        async with AsyncClient(app=test_app, base_url="http://test") as client:
+            assert (await client.get("/items/1")).status_code == 200
+            assert (await client.get("/items/2")).status_code == 200
+            assert (await client.get("/nowhere/3")).status_code == 404
+    finally:
+        await engine.dispose()
+    
+    key = ("GET", "/items/{item_id}")
+    assert registry.latency[key].count == 2
+    assert registry.sql_statements[key].sum == 4
+    assert registry.sql_seconds[key].sum > 0
+    assert registry.responses[("GET", "/items/{item_id}", 200)] == 2
+    assert registry.responses[("GET", "unmatched", 404)] == 1
+    assert registry.in_progress == 0
+    
+    body = registry.render()
+    assert 'tableorder_http_request_sql_statements_bucket{method="GET",route="/items/{item_id}",le="2.0"} 2' in body
+    assert 'tableorder_http_request_duration_seconds_count{method="GET",route="/items/{item_id}"} 2' in body
+    assert 'tableorder_http_request_duration_seconds_bucket{method="GET",route="/items/{item_id}",le="+Inf"} 2' in body
+
+def test_component_stats_render_as_gauges():
+    """Test stats dicts are flattened into labelled gauges and non-numeric values are skipped"""
+    registry = Metrics()
+    registry.register("sse", lambda: {
+        "open_streams": 3, "open_streams_by_store": {"store-1": 2}, "replica_lag_seconds": [0.5, None],
+        "transport": "local", "running": True,
+    })
+    body = registry.render()
+    assert "# TYPE tableorder_sse_open_streams gauge\ntableorder_sse_open_streams 3\n" in body
+    assert 'tableorder_sse_open_streams_by_store{key="store-1"} 2' in body
+    assert 'tableorder_sse_replica_lag_seconds{index="0"} 0.5' in body
+    assert 'index="1"' not in body
+    assert "tableorder_sse_transport" not in body
+    assert "tableorder_sse_running 1" in body
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client):
+    """Test /metrics serves the Prometheus text format including component gauges"""
+    setup_metrics()
+    await client.get("/")
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'tableorder_http_responses_total{method="GET",route="/",status="200"}' in response.text
+    assert "tableorder_sse_open_streams " in response.text
+    assert "tableorder_db_pool_checked_out " in response.text
+    assert "tableorder_event_bus_queue_depth " in response.text
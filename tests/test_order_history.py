@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from src.models import Store, Table, TableSession, OrderHistory, OrderHistoryItem
+from src.services.order_history_query_service import OrderHistoryQueryService
+
+async def _seed(db_session):
+    store, other_store = Store(name="History Store"), Store(name="Other Store")
+    db_session.add_all([store, other_store])
+    await db_session.flush()
+    table = Table(store_id=store.id, table_number="1", password_hash="x")
+    other_table = Table(store_id=other_store.id, table_number="1", password_hash="x")
+    db_session.add_all([table, other_table])
+    await db_session.flush()
+    sessions = [TableSession(table_id=table.id, is_active=False) for _ in range(3)]
+    sessions.append(TableSession(table_id=other_table.id, is_active=False))
+    db_session.add_all(sessions)
+    await db_session.flush()
+    
+    archived_at = datetime(2026, 2, 9, 22, 0)
+    histories = []
+    for n, session in enumerate(sessions):
+        for _ in range(3):
+            histories.append(OrderHistory(table_session_id=session.id, original_order_id=len(histories) + 1, status="served",
+                                          total_price=8000, order_created_at=archived_at, archived_at=archived_at + timedelta(days=n)))
+    db_session.add_all(histories)
+    await db_session.flush()
+    db_session.add_all([OrderHistoryItem(order_history_id=history.id, menu_name="Noodles", quantity=1,
+                                         unit_price=8000, subtotal=8000) for history in histories])
+    await db_session.commit()
+    return store, table, histories[:9]
+
+@pytest.mark.asyncio
+async def test_order_history_keyset_pages(db_session):
+    """Test keyset pages walk the table's history newest first without gaps or repeats"""
+    store, table, histories = await _seed(db_session)
+    
+    seen, cursor = [], None
+    while True:
+        page, cursor = await OrderHistoryQueryService.get_order_history(table.id, store.id, db_session, limit=4, cursor=cursor)
+        seen += [history.id for history in page]
+        if cursor is None:
+            break
+    expected = sorted(histories, key=lambda history: (history.archived_at, history.id), reverse=True)
+    assert seen == [history.id for history in expected]
+    
+    page, _ = await OrderHistoryQueryService.get_order_history(table.id, "other-store", db_session)
+    assert page == []
+
+@pytest.mark.asyncio
+async def test_order_history_export_streams_ndjson_and_csv(db_session):
+    """Test the store export yields one flat row per item in archive order"""
+    store, table, histories = await _seed(db_session)
+    session_factory = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    
+    ndjson = "".join([chunk async for chunk in OrderHistoryQueryService.export_order_history(
+        store.id, "ndjson", session_factory=session_factory)])
+    rows = [json.loads(line) for line in ndjson.splitlines()]
+    assert [row["order_history_id"] for row in rows] == [history.id for history in histories]
+    assert rows[0]["status"] == "served" and rows[0]["total_price"] == "8000.00"
+    
+    text = "".join([chunk async for chunk in OrderHistoryQueryService.export_order_history(
+        store.id, "csv", from_date=datetime(2026, 2, 10), session_factory=session_factory)])
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert len(rows) == 6
+    assert rows[0]["menu_name"] == "Noodles" and rows[0]["status"] == "served"
+
+@pytest.mark.asyncio
+async def test_next_cursor_header_is_exposed_to_browsers(client):
+    """Test cross-origin admin clients can read the X-Next-Cursor header"""
+    response = await client.get("/", headers={"Origin": "http://admin.example"})
+    assert "X-Next-Cursor" in response.headers["access-control-expose-headers"]
@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from src.models import Store, Table, TableSession, Order, OrderStatus, OutboxEvent
+from src.services.update_order_status_service import UpdateOrderStatusService
+
+async def _seed(db_session, statuses):
+    store, other_store = Store(name="Kitchen Store"), Store(name="Other Store")
+    db_session.add_all([store, other_store])
+    await db_session.flush()
+    table, other_table = Table(store_id=store.id, table_number="7", password_hash="x"), Table(store_id=other_store.id, table_number="7", password_hash="x")
+    db_session.add_all([table, other_table])
+    await db_session.flush()
+    session, other_session = TableSession(table_id=table.id, is_active=True), TableSession(table_id=other_table.id, is_active=True)
+    db_session.add_all([session, other_session])
+    await db_session.flush()
+    orders = [Order(table_session_id=session.id, status=order_status, total_price=8000) for order_status in statuses]
+    other_order = Order(table_session_id=other_session.id, status="preparing", total_price=8000)
+    db_session.add_all(orders + [other_order])
+    await db_session.commit()
+    return store, table, orders, other_order
+
+async def _events(db_session, event_type):
+    result = await db_session.execute(select(OutboxEvent).where(OutboxEvent.event_type == event_type))
+    return result.scalars().all()
+
+@pytest.mark.asyncio
+async def test_status_transition_is_conditional(db_session):
+    """Test a transition updates only from an allowed status and scoped to the store"""
+    store, _, orders, other_order = await _seed(db_session, ["pending"])
+    
+    order = await UpdateOrderStatusService.update_order_status(orders[0].id, "preparing", store.id, db_session)
+    assert order["status"] == OrderStatus.PREPARING
+    [event] = await _events(db_session, "OrderStatusChanged")
+    assert event.payload["old_status"] == "pending" and event.payload["new_status"] == "preparing"
+    
+    with pytest.raises(HTTPException) as invalid:
+        await UpdateOrderStatusService.update_order_status(orders[0].id, "served", store.id, db_session)
+    assert invalid.value.detail == "INVALID_STATUS_TRANSITION"
+    with pytest.raises(HTTPException) as foreign:
+        await UpdateOrderStatusService.update_order_status(other_order.id, "ready", store.id, db_session)
+    assert foreign.value.detail == "ORDER_NOT_FOUND"
+
+@pytest.mark.asyncio
+async def test_concurrent_transitions_apply_once(db_session):
+    """Test two screens moving the same order at once cannot both succeed"""
+    store, _, orders, _ = await _seed(db_session, ["pending"])
+    sessions = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    
+    async def tap(new_status):
+        async with sessions() as db:
+            return await UpdateOrderStatusService.update_order_status(orders[0].id, new_status, store.id, db)
+    
+    results = await asyncio.gather(tap("preparing"), tap("preparing"), return_exceptions=True)
+    failures = [result for result in results if isinstance(result, HTTPException)]
+    assert len(failures) == 1 and failures[0].detail == "INVALID_STATUS_TRANSITION"
+    assert len(await _events(db_session, "OrderStatusChanged")) == 1
+
+@pytest.mark.asyncio
+async def test_bulk_transition_for_table_emits_one_event(db_session):
+    """Test moving every preparing order of a table to ready in one statement and one event"""
+    store, table, orders, other_order = await _seed(db_session, ["preparing", "preparing", "pending"])
+    
+    result = await UpdateOrderStatusService.bulk_update_status("ready", store.id, db_session, table_id=table.id)
+    assert [order["id"] for order in result["orders"]] == [orders[0].id, orders[1].id]
+    [event] = await _events(db_session, "OrderStatusesChanged")
+    assert [item["order_id"] for item in event.payload["orders"]] == [orders[0].id, orders[1].id]
+    
+    result = await UpdateOrderStatusService.bulk_update_status(
+        "cancelled", store.id, db_session, order_ids=[orders[0].id, orders[2].id, other_order.id], from_status="pending"
+    )
+    assert [order["id"] for order in result["orders"]] == [orders[2].id]
+    assert result["skipped_order_ids"] == [orders[0].id, other_order.id]
+    
+    with pytest.raises(HTTPException) as unfiltered:
+        await UpdateOrderStatusService.bulk_update_status("ready", store.id, db_session)
+    assert unfiltered.value.detail == "ORDER_FILTER_REQUIRED"
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from src.infrastructure.event_bus import EventBus
+from src.infrastructure.outbox_relay import OutboxRelay, OUTBOX_LOCK_KEY
+from src.models import OutboxEvent
+
+def _relay(db_session, batch_size: int):
+    bus = EventBus()
+    received = []
+    
+    async def handler(payload):
+        received.append(payload)
+    
+    bus.subscribe("OrderCreated", handler)
+    session_factory = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    return OutboxRelay(batch_size=batch_size, session_factory=session_factory, bus=bus), received
+
+@pytest.mark.asyncio
+async def test_relay_drains_outbox_in_batches(db_session):
+    """Test the relay publishes outbox rows in id order and deletes them"""
+    relay, received = _relay(db_session, batch_size=2)
+    db_session.add_all([OutboxEvent(event_type="OrderCreated", payload={"store_id": "s", "order_id": n}) for n in range(3)])
+    await db_session.commit()
+    
+    assert await relay.relay_once() == 2
+    assert await relay.relay_once() == 1
+    assert await relay.relay_once() == 0
+    assert [payload["order_id"] for payload in received] == [0, 1, 2]
+    event_ids = [payload["event_id"] for payload in received]
+    assert event_ids == sorted(set(event_ids))
+    assert await db_session.scalar(select(func.count()).select_from(OutboxEvent)) == 0
+
+@pytest.mark.asyncio
+async def test_relay_skips_while_another_worker_holds_the_lock(db_session):
+    """Test only one relay drains the outbox at a time"""
+    relay, received = _relay(db_session, batch_size=10)
+    db_session.add(OutboxEvent(event_type="OrderCreated", payload={"store_id": "s", "order_id": 1}))
+    await db_session.commit()
+    
+    await db_session.execute(select(func.pg_advisory_xact_lock(OUTBOX_LOCK_KEY)))
+    assert await relay.relay_once() == 0
+    await db_session.commit()
+    assert await relay.relay_once() == 1
+    assert [payload["order_id"] for payload in received] == [1]
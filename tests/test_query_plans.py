@@ -0,0 +1,177 @@
+import asyncio
+import json
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import NullPool
+from src.core.database import Base
+from src.core.security import hash_password
+from src.models import *
+from src.services.authentication_service import AuthenticationService
+from src.services.complete_table_session_service import CompleteTableSessionService
+from src.services.create_order_service import CreateOrderService
+from src.services.delete_order_service import DeleteOrderService
+from src.services.menu_service import MenuService
+from src.services.order_history_query_service import OrderHistoryQueryService
+from src.services.order_query_service import OrderQueryService
+from src.services.update_order_status_service import UpdateOrderStatusService
+from tests.conftest import TEST_DATABASE_URL
+
+LARGE_TABLES = {
+    "tables", "table_sessions", "menu_categories", "menus",
+    "orders", "order_items", "order_histories", "order_history_items",
+}
+
+STORES = 100
+TABLES_PER_STORE = 20
+STORE_ID = "store-7"
+
+SEED_SQL = [
+    "INSERT INTO stores (id, name, created_at, updated_at) "
+    "SELECT 'store-' || s, 'Store ' || s, now(), now() FROM generate_series(1, :stores) s",
+    "INSERT INTO menu_categories (store_id, name, display_order, created_at, updated_at) "
+    "SELECT 'store-' || s, 'Category ' || c, c, now(), now() FROM generate_series(1, :stores) s, generate_series(1, 5) c",
+    "INSERT INTO menus (category_id, name, price, is_available, display_order, created_at, updated_at) "
+    "SELECT mc.id, 'Menu ' || m, 1000 + m, true, m, now(), now() FROM menu_categories mc, generate_series(1, 20) m",
+    "INSERT INTO tables (store_id, table_number, password_hash, created_at, updated_at) "
+    "SELECT 'store-' || s, t::text, :password_hash, now(), now() "
+    "FROM generate_series(1, :stores) s, generate_series(1, :tables) t",
+    "INSERT INTO table_sessions (table_id, started_at, ended_at, is_active, created_at, updated_at) "
+    "SELECT t.id, now() - interval '1 day' * k, now() - interval '1 day' * k + interval '1 hour', false, now(), now() "
+    "FROM tables t, generate_series(1, 10) k",
+    "INSERT INTO table_sessions (table_id, started_at, is_active, created_at, updated_at) "
+    "SELECT t.id, now(), true, now(), now() FROM tables t",
+    "INSERT INTO orders (table_session_id, status, total_price, created_at, updated_at) "
+    "SELECT ts.id, 'PENDING', 2000, now() - interval '1 minute' * k, now() "
+    "FROM table_sessions ts, generate_series(1, 5) k WHERE ts.is_active",
+    "INSERT INTO order_items (order_id, menu_id, menu_name, quantity, unit_price, subtotal, created_at) "
+    "SELECT o.id, (SELECT min(id) FROM menus), 'Menu', 2, 1000, 2000, now() FROM orders o, generate_series(1, 3)",
+    "INSERT INTO order_histories (table_session_id, original_order_id, status, total_price, order_created_at, archived_at) "
+    "SELECT ts.id, ts.id * 10 + k, 'SERVED', 2000, ts.started_at, ts.ended_at "
+    "FROM table_sessions ts, generate_series(1, 3) k WHERE NOT ts.is_active",
+    "INSERT INTO order_history_items (order_history_id, menu_id, menu_name, quantity, unit_price, subtotal) "
+    "SELECT oh.id, NULL, 'Menu', 2, 1000, 2000 FROM order_histories oh, generate_series(1, 2)",
+]
+
+async def _seed():
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        params = {"stores": STORES, "tables": TABLES_PER_STORE, "password_hash": hash_password("1234")}
+        for statement in SEED_SQL:
+            await conn.execute(text(statement), params)
+        ids = (await conn.execute(text(
+            "SELECT t.id AS table_id, ts.id AS session_id, "
+            "(SELECT min(o.id) FROM orders o WHERE o.table_session_id = ts.id) AS order_id "
+            "FROM tables t JOIN table_sessions ts ON ts.table_id = t.id AND ts.is_active "
+            "WHERE t.store_id = :store_id ORDER BY t.id"
+        ), {"store_id": STORE_ID})).mappings().all()
+        menu_ids = (await conn.execute(text(
+            "SELECT m.id FROM menus m JOIN menu_categories mc ON mc.id = m.category_id "
+            "WHERE mc.store_id = :store_id ORDER BY m.id LIMIT 3"
+        ), {"store_id": STORE_ID})).scalars().all()
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+    await engine.dispose()
+    return {"tables": ids, "menu_ids": menu_ids}
+
+async def _drop():
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+@pytest.fixture(scope="module")
+def seeded():
+    data = asyncio.run(_seed())
+    yield data
+    asyncio.run(_drop())
+
+def _seq_scans(plan: dict):
+    if plan["Node Type"] == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+async def _seq_scanned_tables(call):
+    """Run a service call, then EXPLAIN every statement it sent with the same parameters"""
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    captured = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters[0] if executemany else parameters))
+    
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as db:
+        await call(db)
+    event.remove(engine.sync_engine, "before_cursor_execute", capture)
+    
+    found = []
+    async with engine.connect() as conn:
+        raw = (await conn.get_raw_connection()).driver_connection
+        for statement, parameters in captured:
+            plan = await raw.fetchval("EXPLAIN (FORMAT JSON) " + statement, *parameters)
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            found += [table for table in _seq_scans(plan[0]["Plan"]) if table in LARGE_TABLES]
+    await engine.dispose()
+    assert captured, "service call issued no SQL"
+    return found
+
+@pytest.mark.asyncio
+async def test_menu_queries_use_indexes(seeded):
+    async def call(db):
+        await MenuService.get_menus_by_category(None, STORE_ID, db)
+        await MenuService.get_menu_by_id(seeded["menu_ids"][0], STORE_ID, db)
+    assert await _seq_scanned_tables(call) == []
+
+@pytest.mark.asyncio
+async def test_table_login_uses_indexes(seeded):
+    async def call(db):
+        await AuthenticationService.authenticate_table("1", "1234", STORE_ID, db)
+    assert await _seq_scanned_tables(call) == []
+
+@pytest.mark.asyncio
+async def test_order_queries_use_indexes(seeded):
+    table = seeded["tables"][1]
+    async def call(db):
+        await OrderQueryService.get_orders_by_table(table["table_id"], STORE_ID, db)
+    assert await _seq_scanned_tables(call) == []
+
+@pytest.mark.asyncio
+async def test_live_orders_query_uses_indexes(seeded):
+    async def call(db):
+        await OrderQueryService.get_live_orders(STORE_ID, db)
+    assert await _seq_scanned_tables(call) == []
+
+@pytest.mark.asyncio
+async def test_order_history_query_uses_indexes(seeded):
+    table = seeded["tables"][2]
+    async def call(db):
+        await OrderHistoryQueryService.get_order_history(table["table_id"], STORE_ID, db)
+    assert await _seq_scanned_tables(call) == []
+
+@pytest.mark.asyncio
+async def test_create_order_uses_indexes(seeded):
+    table = seeded["tables"][3]
+    items = [{"menu_id": menu_id, "quantity": 1} for menu_id in seeded["menu_ids"]]
+    async def call(db):
+        await CreateOrderService.create_order(table["session_id"], items, db)
+    assert await _seq_scanned_tables(call) == []
+
+@pytest.mark.asyncio
+async def test_order_status_and_delete_use_indexes(seeded):
+    table = seeded["tables"][4]
+    async def call(db):
+        await UpdateOrderStatusService.update_order_status(table["order_id"], "preparing", STORE_ID, db)
+        await DeleteOrderService.delete_order(table["order_id"], STORE_ID, db)
+    assert await _seq_scanned_tables(call) == []
+
+@pytest.mark.asyncio
+async def test_complete_session_uses_indexes(seeded):
+    table = seeded["tables"][5]
+    async def call(db):
+        await CompleteTableSessionService.complete_session(table["table_id"], STORE_ID, db)
+    assert await _seq_scanned_tables(call) == []
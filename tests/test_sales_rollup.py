@@ -0,0 +1,88 @@
+import pytest
+from datetime import date, datetime
+from sqlalchemy import select
+from src.models import Store, Table, TableSession, MenuCategory, Menu, Order, OrderItem, DailySales, DailyMenuSales
+from src.services.complete_table_session_service import CompleteTableSessionService
+from src.services.sales_rollup_service import SalesRollupService
+
+async def _open_session_with_orders(db_session, table, menus, orders):
+    session = TableSession(table_id=table.id, is_active=True)
+    db_session.add(session)
+    await db_session.flush()
+    for status, created_at, lines in orders:
+        order = Order(table_session_id=session.id, status=status, created_at=created_at,
+                      total_price=sum(menus[i].price * quantity for i, quantity in lines))
+        db_session.add(order)
+        await db_session.flush()
+        db_session.add_all([OrderItem(order_id=order.id, menu_id=menus[i].id, menu_name=menus[i].name, quantity=quantity,
+                                      unit_price=menus[i].price, subtotal=menus[i].price * quantity) for i, quantity in lines])
+    await db_session.commit()
+
+async def _rollups(db_session):
+    daily = (await db_session.execute(select(DailySales.day, DailySales.order_count, DailySales.revenue)
+                                      .order_by(DailySales.day))).all()
+    menu = (await db_session.execute(select(DailyMenuSales.day, DailyMenuSales.menu_id, DailyMenuSales.quantity,
+                                            DailyMenuSales.order_count).order_by(DailyMenuSales.day, DailyMenuSales.menu_id))).all()
+    return daily, menu
+
+@pytest.mark.asyncio
+async def test_complete_session_maintains_rollups(db_session):
+    """Test completing sessions accumulates daily rollups that match a full rebuild"""
+    store = Store(name="Rollup Store")
+    db_session.add(store)
+    await db_session.flush()
+    table = Table(store_id=store.id, table_number="1", password_hash="x")
+    category = MenuCategory(store_id=store.id, name="Main", display_order=0)
+    db_session.add_all([table, category])
+    await db_session.flush()
+    menus = [Menu(category_id=category.id, name="Noodles", price=8000), Menu(category_id=category.id, name="Dumplings", price=5000)]
+    db_session.add_all(menus)
+    await db_session.commit()
+    
+    day1, day2 = datetime(2026, 2, 9, 12, 0), datetime(2026, 2, 10, 12, 0)
+    await _open_session_with_orders(db_session, table, menus, [
+        ("served", day1, [(0, 2), (1, 1)]), ("cancelled", day1, [(0, 5)]), ("served", day2, [(1, 2)]),
+    ])
+    await CompleteTableSessionService.complete_session(table.id, store.id, db_session)
+    await _open_session_with_orders(db_session, table, menus, [("served", day1, [(0, 1)])])
+    await CompleteTableSessionService.complete_session(table.id, store.id, db_session)
+    
+    daily, menu = await _rollups(db_session)
+    assert [(row.day.day, row.order_count, int(row.revenue)) for row in daily] == [(9, 2, 29000), (10, 1, 10000)]
+    assert [(row.day.day, row.quantity, row.order_count) for row in menu] == [(9, 3, 2), (9, 1, 1), (10, 2, 1)]
+    
+    await SalesRollupService.rebuild(db_session, store.id)
+    assert await _rollups(db_session) == (daily, menu)
+    
+    report = await SalesRollupService.get_menu_sales(store.id, db_session, from_date=day1.date(), to_date=day1.date())
+    assert [(row["menu_name"], row["quantity"], int(row["revenue"])) for row in report] == [("Noodles", 3, 24000), ("Dumplings", 1, 5000)]
+    assert len(await SalesRollupService.get_daily_sales(store.id, db_session, from_date=day2.date())) == 1
+
+@pytest.mark.asyncio
+async def test_rollups_use_the_store_local_day(db_session):
+    """Test orders are booked to the store's local day around local midnight, not the UTC day"""
+    store = Store(name="Late Store")
+    db_session.add(store)
+    await db_session.flush()
+    table = Table(store_id=store.id, table_number="1", password_hash="x")
+    category = MenuCategory(store_id=store.id, name="Main", display_order=0)
+    db_session.add_all([table, category])
+    await db_session.flush()
+    menus = [Menu(category_id=category.id, name="Noodles", price=8000)]
+    db_session.add_all(menus)
+    await db_session.commit()
+    
+    # 23:50 and 00:10 in Asia/Seoul, both on 2026-02-09 in UTC.
+    before_midnight, after_midnight = datetime(2026, 2, 9, 14, 50), datetime(2026, 2, 9, 15, 10)
+    await _open_session_with_orders(db_session, table, menus, [
+        ("served", before_midnight, [(0, 1)]), ("served", after_midnight, [(0, 2)]),
+    ])
+    await CompleteTableSessionService.complete_session(table.id, store.id, db_session)
+    
+    daily, menu = await _rollups(db_session)
+    assert [(row.day.isoformat(), row.order_count) for row in daily] == [("2026-02-09", 1), ("2026-02-10", 1)]
+    assert [(row.day.isoformat(), row.quantity) for row in menu] == [("2026-02-09", 1), ("2026-02-10", 2)]
+    await SalesRollupService.rebuild(db_session, store.id)
+    assert await _rollups(db_session) == (daily, menu)
+    report = await SalesRollupService.get_daily_sales(store.id, db_session, from_date=date(2026, 2, 10))
+    assert [(row["day"], int(row["revenue"])) for row in report] == [(date(2026, 2, 10), 16000)]
@@ -0,0 +1,44 @@
+from datetime import datetime
+from decimal import Decimal
+from fastapi.responses import ORJSONResponse
+from src.main import app
+from src.models import Admin, Menu, Order, OrderItem, OrderStatus
+from src.schemas import AdminResponse, MenuResponse, OrderResponse
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+def test_admin_response_omits_password_hash():
+    """Test admin responses never expose the password hash"""
+    admin = Admin(id=1, store_id="store-1", username="admin1", password_hash="hashed", role="store_admin",
+                  is_active=True, created_at=NOW, updated_at=NOW)
+    data = AdminResponse.model_validate(admin).model_dump()
+    assert data["username"] == "admin1"
+    assert "password_hash" not in data
+
+def test_menu_response_serializes_price_and_thumbnails():
+    """Test menu responses render prices as numbers and include thumbnail paths"""
+    menu = Menu(id=1, category_id=2, name="Noodles", description=None, price=Decimal("9.50"),
+                image_path="/uploads/menus/" + "a" * 64 + ".jpg", is_available=True, display_order=0,
+                created_at=NOW, updated_at=NOW)
+    data = MenuResponse.model_validate(menu).model_dump(mode="json")
+    assert data["price"] == 9.5
+    assert data["created_at"] == "2024-01-01T12:00:00"
+    assert data["thumbnail_paths"]["160"].endswith("_160.jpg")
+
+def test_order_response_nests_items():
+    """Test order responses include their items and the status value"""
+    order = Order(id=1, table_session_id=3, status=OrderStatus.PENDING, total_price=Decimal("19.00"),
+                  created_at=NOW, updated_at=NOW)
+    order.order_items = [OrderItem(id=5, order_id=1, menu_id=2, menu_name="Noodles", quantity=2,
+                                   unit_price=Decimal("9.50"), subtotal=Decimal("19.00"))]
+    data = OrderResponse.model_validate(order).model_dump(mode="json")
+    assert data["status"] == "pending"
+    assert data["order_items"][0]["subtotal"] == 19.0
+
+def test_routes_declare_response_models():
+    """Test JSON routes default to orjson and publish typed response schemas"""
+    live = next(route for route in app.routes if getattr(route, "path", None) == "/api/admin/orders/live")
+    assert live.response_class is ORJSONResponse
+    schemas = app.openapi()["components"]["schemas"]
+    assert {"MenuResponse", "OrderResponse", "AdminResponse", "LiveOrdersResponse"} <= set(schemas)
+    assert "password_hash" not in schemas["AdminResponse"]["properties"]
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from src.infrastructure.event_transport import LocalTransport
+from src.models import event_delivery_seq
+from src.infrastructure.sse_publisher import HEARTBEAT_FRAME, SSECapacityError, SSEClient, SSEPublisher
+
+async def _connect(publisher: SSEPublisher, store_id: str):
+    stream = publisher.stream(store_id)
+    reader = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    return stream, reader
+
+def _data(frame: str) -> dict:
+    return json.loads(frame.split("data: ", 1)[1])
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_only_same_store():
+    """Test events are delivered to listeners of the event's store only"""
+    publisher = SSEPublisher()
+    stream_a, reader_a = await _connect(publisher, "store-a")
+    stream_b, reader_b = await _connect(publisher, "store-b")
+    assert publisher.client_count("store-a") == 1
+    
+    await publisher.broadcast({"event_type": "OrderCreated", "order_id": 1, "store_id": "store-a", "event_id": 1})
+    frame = await asyncio.wait_for(reader_a, 1)
+    assert frame.startswith("id: 1\ndata: ") and frame.endswith("\n\n")
+    assert _data(frame)["order_id"] == 1
+    assert not reader_b.done()
+    
+    reader_b.cancel()
+    await asyncio.gather(reader_b, return_exceptions=True)
+    await stream_a.aclose()
+    await stream_b.aclose()
+    assert publisher.client_count("store-a") == 0
+
+def _order_ids(client: SSEClient):
+    return [json.loads(frame[len("data: "):])["order_id"] for _, frame in client._frames]
+
+def _frame(**event):
+    return f"data: {json.dumps(event)}\n\n"
+
+def test_slow_consumer_drop_oldest():
+    """Test a full buffer drops the oldest frame instead of growing"""
+    client = SSEClient("s", buffer_size=2, policy="drop_oldest")
+    for order_id in range(4):
+        client.offer(_frame(order_id=order_id))
+    assert _order_ids(client) == [2, 3]
+    assert client.dropped == 2
+
+def test_slow_consumer_coalesce_status_changes():
+    """Test status changes for the same order replace each other when full"""
+    client = SSEClient("s", buffer_size=2, policy="coalesce")
+    client.offer(_frame(order_id=1, new_status="preparing"), coalesce_key=1)
+    client.offer(_frame(order_id=2), coalesce_key=None)
+    client.offer(_frame(order_id=1, new_status="ready"), coalesce_key=1)
+    assert _order_ids(client) == [1, 2]
+    assert json.loads(client._frames[0][1][len("data: "):])["new_status"] == "ready"
+    client.offer(_frame(order_id=3), coalesce_key=None)
+    assert _order_ids(client) == [2, 3]
+
+@pytest.mark.asyncio
+async def test_slow_consumer_disconnect():
+    """Test the disconnect policy ends the stream of a client that falls behind"""
+    publisher = SSEPublisher(buffer_size=1, policy="disconnect")
+    stream = publisher.stream("s")
+    first = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    await publisher.broadcast({"event_type": "OrderCreated", "order_id": 0, "store_id": "s", "event_id": 1})
+    assert _data(await first)["order_id"] == 0
+    for order_id in range(1, 3):
+        await publisher.broadcast({"event_type": "OrderCreated", "order_id": order_id, "store_id": "s",
+                                   "event_id": order_id + 1})
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert publisher.disconnected_clients == 1
+    assert publisher.client_count("s") == 0
+
+async def _broadcast(publisher: SSEPublisher, event_ids, store_id: str = "s"):
+    for event_id in event_ids:
+        await publisher.broadcast({"event_type": "OrderCreated", "order_id": event_id, "store_id": store_id,
+                                   "event_id": event_id})
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_missed_events():
+    """Test a client reconnecting with Last-Event-ID receives only the events it missed"""
+    publisher = SSEPublisher(replay_size=5)
+    await _broadcast(publisher, range(1, 5))
+    await _broadcast(publisher, [5], store_id="other")
+    stream = publisher.stream("s", last_event_id="2")
+    frames = [await stream.__anext__() for _ in range(2)]
+    await stream.aclose()
+    assert [_data(frame)["order_id"] for frame in frames] == [3, 4]
+    assert frames[-1].startswith("id: 4\n")
+    assert publisher.replayed_events == 2
+
+@pytest.mark.asyncio
+async def test_reconnect_to_another_worker_replays():
+    """Test delivery ids are shared, so a reconnect to a different worker replays instead of resyncing"""
+    worker_a, worker_b = SSEPublisher(replay_size=5), SSEPublisher(replay_size=5)
+    worker_a.horizon = worker_b.horizon = 0
+    await _broadcast(worker_a, range(1, 5))
+    await _broadcast(worker_b, range(1, 4))
+    
+    # Worker B hasn't received event 4 yet, which the client already saw on worker A.
+    stream = worker_b.stream("s", last_event_id="4")
+    reader = asyncio.ensure_future(stream.__anext__())
+    await _broadcast(worker_b, [4, 5])
+    frame = await asyncio.wait_for(reader, 1)
+    await stream.aclose()
+    assert frame.startswith("id: 5\n")
+    assert worker_b.resyncs == 0
+
+@pytest.mark.asyncio
+async def test_reconnect_past_replay_buffer_resyncs():
+    """Test a gap larger than the replay buffer, one from before the worker started or a bad id resyncs"""
+    publisher = SSEPublisher(replay_size=2)
+    publisher.horizon = 2
+    await _broadcast(publisher, range(3, 8))
+    for last_event_id in ("4", "1", "3f2a9c1e-4"):
+        stream = publisher.stream("s", last_event_id=last_event_id)
+        frame = await stream.__anext__()
+        await stream.aclose()
+        assert frame == "id: 7\nevent: resync\ndata: {}\n\n"
+    assert publisher.resyncs == 3
+
+@pytest.mark.asyncio
+async def test_horizon_comes_from_the_delivery_sequence(db_session):
+    """Test a worker starts replaying from the last delivery id issued before it listened"""
+    issued = await db_session.scalar(select(event_delivery_seq.next_value()))
+    await db_session.commit()
+    publisher = SSEPublisher()
+    session_factory = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    await publisher.load_horizon(LocalTransport(), session_factory)
+    assert publisher.horizon == issued
+    assert publisher.latest_id == issued
+
+@pytest.mark.asyncio
+async def test_idle_stream_sends_heartbeat():
+    """Test an idle stream emits keep-alive comments"""
+    publisher = SSEPublisher(heartbeat=0.01)
+    stream = publisher.stream("s")
+    assert await asyncio.wait_for(stream.__anext__(), 1) == HEARTBEAT_FRAME
+    await stream.aclose()
+
+@pytest.mark.asyncio
+async def test_connection_caps_and_reaping():
+    """Test per-store and per-worker caps reject overflow until stuck clients are reaped"""
+    publisher = SSEPublisher(max_clients_per_store=2, max_clients=3, idle_timeout=60)
+    connections = [await _connect(publisher, store_id) for store_id in ("a", "a", "b")]
+    with pytest.raises(SSECapacityError):
+        publisher.stream("a")
+    with pytest.raises(SSECapacityError):
+        publisher.stream("c")
+    assert publisher.stats()["open_streams_by_store"] == {"a": 2, "b": 1}
+    assert publisher.rejected_clients == 2
+    
+    for client in publisher._clients["a"]:
+        client.last_seen -= 120
+    await publisher.broadcast({"event_type": "OrderCreated", "order_id": 1, "store_id": "a", "event_id": 1})
+    assert publisher.client_count("a") == 0
+    assert publisher.reaped_clients == 2
+    connections.append(await _connect(publisher, "c"))
+    assert publisher.stats()["open_streams"] == 2
+    for stream, reader in connections:
+        reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
+        await stream.aclose()
+    assert publisher.open_streams == 0
+
+@pytest.mark.asyncio
+async def test_unsent_stream_holds_no_slot():
+    """Test a stream whose response never starts does not count against the caps"""
+    publisher = SSEPublisher(max_clients_per_store=1)
+    await publisher.stream("a").aclose()
+    publisher.stream("a")
+    assert publisher.open_streams == 0
+    stream, reader = await _connect(publisher, "a")
+    assert publisher.client_count("a") == 1
+    reader.cancel()
+    await asyncio.gather(reader, return_exceptions=True)
+    await stream.aclose()
+
+@pytest.mark.asyncio
+async def test_concurrent_connects_respect_the_cap():
+    """Test streams opened concurrently each take their slot at the capacity check"""
+    publisher = SSEPublisher(max_clients_per_store=1, max_clients=1)
+    results = await asyncio.gather(*[_connect(publisher, "a") for _ in range(5)], return_exceptions=True)
+    connections = [result for result in results if not isinstance(result, SSECapacityError)]
+    assert len(connections) == 1
+    assert publisher.open_streams == 1
+    assert publisher.rejected_clients == 4
+    stream, reader = connections[0]
+    reader.cancel()
+    await asyncio.gather(reader, return_exceptions=True)
+    assert publisher.open_streams == 0
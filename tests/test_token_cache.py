@@ -0,0 +1,77 @@
+import time
+from datetime import datetime, timedelta
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from src.core.security import create_jwt_token, get_current_user
+from src.core.token_cache import VerifiedTokenCache, token_cache
+from src.infrastructure.cache_events import load_revocations
+from src.models import Admin, Store, Table, TableSession
+
+def test_token_cache_hit_and_lru_bound():
+    """Test cached claims are returned and the cache stays bounded"""
+    cache = VerifiedTokenCache(max_size=2, revocation_ttl=3600)
+    exp = time.time() + 60
+    for token in ("a", "b", "c"):
+        cache.put(token, {"sub": token, "exp": exp})
+    assert cache.get("a") is None
+    assert cache.get("c") == {"sub": "c", "exp": exp}
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_token_cache_respects_exp():
+    """Test expired claims are not served from the cache"""
+    cache = VerifiedTokenCache(max_size=10, revocation_ttl=3600)
+    cache.put("a", {"exp": time.time() - 1})
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+def test_revocation_only_affects_earlier_tokens():
+    """Test revoking a subject rejects tokens issued before the revocation"""
+    cache = VerifiedTokenCache(max_size=10, revocation_ttl=3600)
+    before = {"admin_id": 7, "iat": time.time()}
+    cache.revoke("admin_id", 7)
+    after = {"admin_id": 7, "iat": time.time() + 1}
+    assert cache.is_revoked(before)
+    assert not cache.is_revoked(after)
+    assert not cache.is_revoked({"admin_id": 8, "iat": 0})
+    assert cache.is_revoked({"session_id": 3}) is False
+
+@pytest.mark.asyncio
+async def test_get_current_user_uses_cache_and_revocation():
+    """Test get_current_user caches claims and honors revocation"""
+    token = create_jwt_token({"table_id": 1, "session_id": 991, "role": "table", "store_id": "s"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    first = await get_current_user(credentials)
+    hits = token_cache.hits
+    second = await get_current_user(credentials)
+    assert second == first
+    assert token_cache.hits == hits + 1
+    
+    token_cache.revoke("session_id", 991)
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(credentials)
+    assert exc.value.detail == "TOKEN_REVOKED"
+
+@pytest.mark.asyncio
+async def test_revocations_are_loaded_from_the_database(db_session):
+    """Test a worker that missed the notifications still rejects tokens of completed sessions and deactivated admins"""
+    store = Store(name="Revocation Store")
+    db_session.add(store)
+    await db_session.flush()
+    table = Table(store_id=store.id, table_number="1", password_hash="x")
+    db_session.add(table)
+    await db_session.flush()
+    issued = {"iat": time.time() - 1}
+    ended_at = datetime.utcnow()
+    session = TableSession(table_id=table.id, started_at=ended_at - timedelta(hours=1), ended_at=ended_at, is_active=False)
+    admin = Admin(store_id=store.id, username="gone", password_hash="x", role="store_admin", is_active=False)
+    db_session.add_all([session, admin])
+    await db_session.commit()
+    
+    await load_revocations(async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False))
+    assert token_cache.is_revoked({**issued, "session_id": session.id})
+    assert token_cache.is_revoked({**issued, "admin_id": admin.id})
+    assert not token_cache.is_revoked({"iat": time.time() + 1, "admin_id": admin.id})
@@ -0,0 +1,53 @@
+import io
+import pytest
+from httpx import AsyncClient
+from fastapi import FastAPI, UploadFile
+from PIL import Image
+from src.infrastructure.image_store import ImageStore
+from src.infrastructure.upload_files import UploadFiles, IMMUTABLE_CACHE_CONTROL
+
+async def _client(tmp_path, **kwargs):
+    store = ImageStore(directory=str(tmp_path / "menus"), thumbnail_sizes=[64], max_workers=1)
+    (tmp_path / "menus").mkdir()
+    buffer = io.BytesIO()
+    Image.new("RGB", (300, 300), (10, 120, 60)).save(buffer, format="JPEG")
+    image_path = await store.save(UploadFile(file=io.BytesIO(buffer.getvalue()), filename="photo.jpg"))
+    (tmp_path / "menus" / "legacy.jpg").write_bytes(b"legacy")
+    
+    app = FastAPI()
+    app.mount("/uploads", UploadFiles(directory=str(tmp_path), **kwargs), name="uploads")
+    return AsyncClient(app=app, base_url="http://test"), image_path
+
+@pytest.mark.asyncio
+async def test_hashed_uploads_are_immutable_and_negotiate_webp(tmp_path):
+    """Test hashed images get immutable caching, strong ETags, 304s and WebP by Accept"""
+    client, image_path = await _client(tmp_path)
+    async with client:
+        response = await client.get(image_path)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/jpeg"
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers["vary"] == "Accept"
+        etag = response.headers["etag"]
+        assert not etag.startswith("W/")
+        
+        revalidated = await client.get(image_path, headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        
+        webp = await client.get(image_path, headers={"Accept": "image/avif,image/webp,*/*"})
+        assert webp.headers["content-type"] == "image/webp"
+        assert webp.headers["etag"] != etag
+        
+        legacy = await client.get("/uploads/menus/legacy.jpg")
+        assert legacy.status_code == 200
+        assert "immutable" not in legacy.headers.get("cache-control", "")
+
+@pytest.mark.asyncio
+async def test_accel_redirect_hands_file_to_proxy(tmp_path):
+    """Test X-Accel-Redirect mode returns headers only and lets the proxy send the file"""
+    client, image_path = await _client(tmp_path, accel_redirect_prefix="/protected-uploads/")
+    async with client:
+        response = await client.get(image_path)
+    assert response.content == b""
+    assert response.headers["x-accel-redirect"] == image_path.replace("/uploads/", "/protected-uploads/")
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL